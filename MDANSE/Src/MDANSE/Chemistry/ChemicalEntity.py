@@ -2452,10 +2452,14 @@ class ChemicalSystem(_ChemicalEntity):
 
         self.rdkit_mol = Chem.RWMol()
 
+        self._substructure_cache = {}
+
+        self._selection_arrays = {}
+
     def __repr__(self):
         contents = []
         for key, value in self.__dict__.items():
-            if key == "rdkit_mol":
+            if key in ("rdkit_mol", "_substructure_cache", "_selection_arrays"):
                 continue
             contents.append(f'{key[1:] if key[0] == "_" else key}={repr(value)}')
 
@@ -2527,8 +2531,13 @@ class ChemicalSystem(_ChemicalEntity):
 
         self._atoms = None
 
+        self._substructure_cache = {}
+
+        self._selection_arrays = {}
+
     def has_substructure_match(self, smarts: str) -> bool:
-        """Check if there is a substructure match.
+        """Check if there is a substructure match. The result is
+        memoised until the chemical system is modified.
 
         Parameters
         ----------
@@ -2540,7 +2549,12 @@ class ChemicalSystem(_ChemicalEntity):
         bool
             True if the there is a substructure match.
         """
-        return self.rdkit_mol.HasSubstructMatch(Chem.MolFromSmarts(smarts))
+        key = ("has_match", smarts)
+        if key not in self._substructure_cache:
+            self._substructure_cache[key] = self.rdkit_mol.HasSubstructMatch(
+                Chem.MolFromSmarts(smarts)
+            )
+        return self._substructure_cache[key]
 
     def get_substructure_matches(
         self, smarts: str, maxmatches: int = 1000000
@@ -2562,13 +2576,82 @@ class ChemicalSystem(_ChemicalEntity):
         set[int]
             An set of matched atom indices.
         """
-        substruct_set = set()
-        matches = self.rdkit_mol.GetSubstructMatches(
-            Chem.MolFromSmarts(smarts), maxMatches=maxmatches
-        )
-        for match in matches:
-            substruct_set.update(match)
-        return substruct_set
+        key = ("matches", smarts, maxmatches)
+        if key not in self._substructure_cache:
+            substruct_set = set()
+            matches = self.rdkit_mol.GetSubstructMatches(
+                Chem.MolFromSmarts(smarts), maxMatches=maxmatches
+            )
+            for match in matches:
+                substruct_set.update(match)
+            self._substructure_cache[key] = frozenset(substruct_set)
+        return set(self._substructure_cache[key])
+
+    def _selection_array(self, name: str) -> np.ndarray:
+        """Builds, or retrieves from the cache, one of the per-atom
+        arrays used by the array-based atom selectors.
+
+        Parameters
+        ----------
+        name : str
+            One of "atomic_numbers", "names", "full_names" or "bonds".
+
+        Returns
+        -------
+        np.ndarray
+            The requested array, indexed by atom index.
+        """
+        if name in self._selection_arrays:
+            return self._selection_arrays[name]
+
+        if name == "atomic_numbers":
+            # taken from the rdkit molecule so that the array-based
+            # selectors agree with the SMARTS-based ones
+            array = np.array(
+                [atm.GetAtomicNum() for atm in self.rdkit_mol.GetAtoms()],
+                dtype=np.int32,
+            )
+        elif name == "bonds":
+            array = np.array(
+                [
+                    (bond.GetBeginAtomIdx(), bond.GetEndAtomIdx())
+                    for bond in self.rdkit_mol.GetBonds()
+                ],
+                dtype=np.int64,
+            ).reshape(-1, 2)
+        elif name in ("names", "full_names"):
+            atom_list = self.atom_list
+            array = np.empty(len(atom_list), dtype=object)
+            indexes = [at.index for at in atom_list]
+            if name == "names":
+                array[indexes] = [at.name for at in atom_list]
+            else:
+                array[indexes] = [at.full_name for at in atom_list]
+        else:
+            raise KeyError(f"Unknown selection array {name}.")
+
+        self._selection_arrays[name] = array
+        return array
+
+    @property
+    def atomic_numbers(self) -> np.ndarray:
+        """The atomic number of each atom, indexed by atom index."""
+        return self._selection_array("atomic_numbers")
+
+    @property
+    def atom_names(self) -> np.ndarray:
+        """The name of each atom, indexed by atom index."""
+        return self._selection_array("names")
+
+    @property
+    def atom_full_names(self) -> np.ndarray:
+        """The full name of each atom, indexed by atom index."""
+        return self._selection_array("full_names")
+
+    @property
+    def bond_indices(self) -> np.ndarray:
+        """An (n_bonds, 2) array of the bonded atom index pairs."""
+        return self._selection_array("bonds")
 
     @property
     def atom_list(self) -> list[Atom]:
@@ -2766,6 +2849,10 @@ class ChemicalSystem(_ChemicalEntity):
                 continue
             h5_contents[entity_type] = v[:]
 
+        # Everything has been read, the file given by the caller is left open.
+        if close_file:
+            h5_file.close()
+
         for i, (entity_type, entity_index) in enumerate(skeleton):
             entity_index = int(entity_index)
             entity_type = entity_type.decode("utf-8")
@@ -2773,7 +2860,6 @@ class ChemicalSystem(_ChemicalEntity):
             try:
                 entity_class = h5_classes[entity_type]
             except KeyError:
-                h5_file.close()
                 raise CorruptedFileError(
                     f"Could not create a chemical entity of type {entity_type}. The entity listed"
                     f" in the chemical system contents (located at /chemical_system/contents in "
@@ -2811,8 +2897,6 @@ class ChemicalSystem(_ChemicalEntity):
                     f"{entity_index}] is corrupted.\nThe provided data is: "
                     f"{h5_contents[entity_type][entity_index]}\nThe original error is: {e}"
                 )
-            finally:
-                h5_file.close()
 
             try:
                 ce = entity_class.build(h5_contents, *arguments)
@@ -2873,9 +2957,6 @@ class ChemicalSystem(_ChemicalEntity):
 
         self._bonds = list(bonds)
 
-        if close_file:
-            h5_file.close()
-
         self._h5_file = None
 
     @property
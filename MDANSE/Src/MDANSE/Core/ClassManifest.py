@@ -0,0 +1,199 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+from typing import Iterable, Union
+
+from MDANSE.Core.Platform import PLATFORM, PlatformError
+from MDANSE.MLogging import LOG
+
+# The class attributes which are read from the source code when they
+# are defined as literals.
+LITERAL_ATTRIBUTES = ("label", "category", "enabled", "ancestor")
+
+MANIFEST_VERSION = 1
+
+
+def _base_name(node: ast.expr) -> Union[str, None]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _scan_class(node: ast.ClassDef) -> dict:
+    entry = {"bases": [name for name in map(_base_name, node.bases) if name]}
+    settings = {}
+    for statement in node.body:
+        if not isinstance(statement, ast.Assign) or len(statement.targets) != 1:
+            continue
+        target = statement.targets[0]
+        if isinstance(target, ast.Name) and target.id in LITERAL_ATTRIBUTES:
+            try:
+                value = ast.literal_eval(statement.value)
+            except (ValueError, TypeError, SyntaxError, RecursionError):
+                continue
+            if isinstance(value, tuple):
+                value = list(value)
+            entry[target.id] = value
+        elif (
+            isinstance(target, ast.Subscript)
+            and isinstance(target.value, ast.Name)
+            and target.value.id == "settings"
+            and isinstance(target.slice, ast.Constant)
+            and isinstance(statement.value, ast.Tuple)
+            and statement.value.elts
+            and isinstance(statement.value.elts[0], ast.Constant)
+        ):
+            settings[target.slice.value] = statement.value.elts[0].value
+    if settings:
+        entry["settings"] = settings
+    return entry
+
+
+def _module_files(package_names: Iterable[str]) -> list[tuple[str, str]]:
+    files = []
+    for package_name in package_names:
+        spec = importlib.util.find_spec(package_name)
+        if spec is None or not spec.submodule_search_locations:
+            continue
+        for directory in spec.submodule_search_locations:
+            for filename in sorted(os.listdir(directory)):
+                stem, ext = os.path.splitext(filename)
+                if ext != ".py" or stem == "__init__":
+                    continue
+                files.append(
+                    (f"{package_name}.{stem}", os.path.join(directory, filename))
+                )
+    return files
+
+
+def scan_subclasses(root_class_name: str, package_names: Iterable[str]) -> dict:
+    """Finds the classes derived from a root class by parsing the
+    modules of the given packages, without importing them.
+
+    Parameters
+    ----------
+    root_class_name : str
+        The name of the class whose subclasses are searched for.
+    package_names : Iterable[str]
+        The fully qualified names of the packages to scan.
+
+    Returns
+    -------
+    dict
+        A {class name: entry} dictionary, where each entry contains the
+        "module" defining the class, the name of its "parent" class and
+        the label, category, enabled, ancestor and settings attributes
+        when they are defined as literals in the class body. Settings are
+        given as a {name: configurator name} dictionary.
+    """
+    classes = {}
+    for module_name, filename in _module_files(package_names):
+        with open(filename, encoding="utf-8") as source:
+            try:
+                tree = ast.parse(source.read(), filename)
+            except SyntaxError as e:
+                LOG.error(f"Could not parse {filename}: {e}")
+                continue
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                entry = _scan_class(node)
+                entry["module"] = module_name
+                classes[node.name] = entry
+
+    def parent_of(name: str) -> Union[str, None]:
+        for base in classes[name]["bases"]:
+            if base == root_class_name or base in classes:
+                return base
+        return None
+
+    manifest = {}
+    for name in classes:
+        parent, seen = parent_of(name), {name}
+        ancestor = parent
+        while (
+            ancestor != root_class_name and ancestor in classes and ancestor not in seen
+        ):
+            seen.add(ancestor)
+            ancestor = parent_of(ancestor)
+        if ancestor != root_class_name or name == root_class_name:
+            continue
+        entry = {k: v for k, v in classes[name].items() if k != "bases"}
+        entry["parent"] = parent
+        manifest[name] = entry
+    return manifest
+
+
+def load_manifest(root_class_name: str, package_names: Iterable[str]) -> dict:
+    """Returns the output of scan_subclasses, stored in the MDANSE cache
+    directory so that the modules are only parsed again after one of
+    them has been modified.
+
+    Parameters
+    ----------
+    root_class_name : str
+        The name of the class whose subclasses are searched for.
+    package_names : Iterable[str]
+        The fully qualified names of the packages to scan.
+
+    Returns
+    -------
+    dict
+        A {class name: entry} dictionary, see scan_subclasses.
+    """
+    package_names = list(package_names)
+    hasher = hashlib.sha1(str(MANIFEST_VERSION).encode("utf-8"))
+    for module_name, filename in [(__name__, __file__)] + _module_files(package_names):
+        stat = os.stat(filename)
+        hasher.update(f"{module_name}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    fingerprint = hasher.hexdigest()
+
+    # the cache is only an optimisation: if the cache directory cannot be
+    # created or written, e.g. if it is read-only, the modules are parsed
+    # at every import
+    try:
+        directory = PLATFORM.cache_directory()
+    except (PlatformError, OSError):
+        return scan_subclasses(root_class_name, package_names)
+    filename = os.path.join(directory, f"{root_class_name}_manifest.json")
+    try:
+        with open(filename, encoding="utf-8") as cache_file:
+            cached = json.load(cache_file)
+        if cached["fingerprint"] == fingerprint:
+            return cached["classes"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    manifest = scan_subclasses(root_class_name, package_names)
+    # written to a temporary file first, so that another process never
+    # reads an incomplete manifest
+    temporary = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "w", encoding="utf-8") as cache_file:
+            json.dump({"fingerprint": fingerprint, "classes": manifest}, cache_file)
+        os.replace(temporary, filename)
+    except OSError as e:
+        LOG.debug(f"Could not write the class manifest {filename}: {e}")
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+    return manifest
@@ -319,6 +319,21 @@ class Platform(object, metaclass=abc.ABCMeta):
 
         return path
 
+    def cache_directory(self):
+        """
+        Returns the path of the directory where MDANSE stores data that can be recomputed at any time (e.g. the
+        topology cache of the trajectories).
+
+        :return: the path of the directory where the MDANSE cache files are stored
+        :rtype: str
+        """
+
+        path = os.path.join(self.application_directory(), "cache")
+
+        self.create_directory(path)
+
+        return path
+
     def username(self):
         """
         Returns the name of the user that run MDANSE.
@@ -16,7 +16,10 @@
 
 from typing import TypeVar
 import difflib
+import importlib
+import sys
 
+from MDANSE.MLogging import LOG
 
 Self = TypeVar("Self", bound="SubclassFactory")
 # The Self TypeVar is a typing hint indicating that
@@ -29,6 +32,23 @@ Self = TypeVar("Self", bound="SubclassFactory")
 # ourselves.
 
 
+def import_subclass_module(module_name: str, class_name: str):
+    """Imports the module of a lazily registered subclass. If the module
+    is named after the class, the attribute of its package is the class,
+    as the jobs and converters packages defined it before their classes
+    were registered lazily.
+
+    Arguments:
+        module_name (str) -- the fully qualified name of the module
+        class_name (str) -- the name of the class defined in the module
+    """
+    module = importlib.import_module(module_name)
+    package_name, _, stem = module_name.rpartition(".")
+    if stem == class_name and hasattr(module, class_name) and package_name:
+        setattr(sys.modules[package_name], stem, getattr(module, class_name))
+    return module
+
+
 def single_search(parent_class: type, name: str, case_sensitive: bool = False):
     """Finds a subclass of a parent class in the
     by searching the _registered_subclasses dictionary.
@@ -89,11 +109,11 @@ def recursive_keys(parent_class: type) -> list:
         A list of class names (str)
     """
     try:
-        results = parent_class.subclasses()
+        results = list(parent_class._registered_subclasses.keys())
     except:
         return []
     else:
-        for child in parent_class.subclasses():
+        for child in parent_class._registered_subclasses.keys():
             results += recursive_keys(parent_class._registered_subclasses[child])
         return results
 
@@ -115,12 +135,12 @@ def recursive_dict(parent_class: type) -> dict:
     try:
         results = {
             ckey: parent_class._registered_subclasses[ckey]
-            for ckey in parent_class.subclasses()
+            for ckey in parent_class._registered_subclasses.keys()
         }
     except:
         return {}
     else:
-        for child in parent_class.subclasses():
+        for child in parent_class._registered_subclasses.keys():
             newdict = recursive_dict(parent_class._registered_subclasses[child])
             results = {**results, **newdict}
         return results
@@ -135,6 +155,9 @@ class SubclassFactory(type):
         super().__init__(name, base, dct)
         # Add the registry attribute to the each new child class.
         cls._registered_subclasses = {}
+        # Subclasses which are known, but whose module has not been
+        # imported yet (see register_lazy_subclasses).
+        cls._lazy_subclasses = {}
 
         @classmethod
         def __init_subclass__(cls, **kwargs):
@@ -166,6 +189,8 @@ class SubclassFactory(type):
             specific_class = cls._registered_subclasses[name]
         except KeyError:
             specific_class = recursive_search(cls, name)
+        if specific_class is None:
+            specific_class = cls.load_subclass(name)
         if specific_class is None:
             subclasses = [i.lower() for i in cls.indirect_subclasses()]
             closest = difflib.get_close_matches(name.lower(), subclasses)
@@ -175,6 +200,88 @@ class SubclassFactory(type):
             raise ValueError(err_str)
         return specific_class(*args, **kwargs)
 
+    def register_lazy_subclasses(cls, entries: dict):
+        """Makes subclasses known to the factory without importing
+        the modules in which they are defined. A module is imported
+        only when one of its classes is created or requested with
+        indirect_subclass_dictionary.
+
+        Arguments:
+            entries (dict) -- a {class_name: entry} dictionary, where
+                each entry is a dictionary containing at least the
+                "module" defining the class and the name of its
+                "parent" class (see MDANSE.Core.ClassManifest)
+        """
+        cls._lazy_subclasses.update(entries)
+
+    def lazy_entries(cls) -> dict:
+        """Returns the entries registered with register_lazy_subclasses
+        for the subclasses of this class, whether their module has been
+        imported yet or not.
+
+        Returns:
+            dict(str:dict) -- the entries of the subclasses of this class
+        """
+        entries = {}
+        for klass in reversed(cls.__mro__):
+            entries.update(getattr(klass, "_lazy_subclasses", {}))
+
+        results = {}
+        for name, entry in entries.items():
+            parent, seen = entry["parent"], {name}
+            while parent != cls.__name__ and parent in entries and parent not in seen:
+                seen.add(parent)
+                parent = entries[parent]["parent"]
+            if parent == cls.__name__:
+                results[name] = entry
+        return results
+
+    def load_subclass(cls, name: str):
+        """Imports the module of a subclass registered with
+        register_lazy_subclasses and returns the subclass.
+
+        Arguments:
+            name (str) -- name of the subclass, not case sensitive
+
+        Returns:
+            A class (type) or None
+        """
+        for lazy_name, entry in cls.lazy_entries().items():
+            if lazy_name.lower() == name.lower():
+                try:
+                    import_subclass_module(entry["module"], lazy_name)
+                except ImportError as e:
+                    LOG.error(f"Could not import {entry['module']}: {e}")
+                    return None
+                return recursive_search(cls, lazy_name)
+        return None
+
+    def subclass_attribute(cls, name: str, attribute: str, default=None):
+        """Returns a class attribute of a subclass, e.g. its category,
+        without importing its module: the attributes of the subclasses
+        which are not imported yet are read from the entries registered
+        with register_lazy_subclasses, or from their parent classes.
+
+        Arguments:
+            name (str) -- name of the subclass
+            attribute (str) -- name of the class attribute
+            default -- the value returned if no class defines the attribute
+
+        Returns:
+            The value of the attribute
+        """
+        entries = cls.lazy_entries()
+        while True:
+            specific_class = recursive_search(cls, name)
+            if specific_class is not None:
+                return getattr(specific_class, attribute, default)
+            entry = entries.get(name)
+            if entry is None:
+                return getattr(cls, attribute, default)
+            if attribute in entry:
+                return entry[attribute]
+            name = entry["parent"]
+
     def subclasses(cls):
         """Returns a list of class names that are derived
         from this class.
@@ -182,7 +289,11 @@ class SubclassFactory(type):
         Returns:
             list(str) -- a list of the subclasses of this class
         """
-        return list(cls._registered_subclasses.keys())
+        results = list(cls._registered_subclasses.keys())
+        for name, entry in cls.lazy_entries().items():
+            if entry["parent"] == cls.__name__ and name not in results:
+                results.append(name)
+        return results
 
     def indirect_subclasses(cls):
         """Returns an extended list of class names that are derived
@@ -191,13 +302,23 @@ class SubclassFactory(type):
         Returns:
             list(str) -- a list of the subclasses of this class
         """
-        return recursive_keys(cls)
+        results = recursive_keys(cls)
+        for name in cls.lazy_entries():
+            if name not in results:
+                results.append(name)
+        return results
 
     def indirect_subclass_dictionary(cls):
         """Returns a {name(str): class(type)} dictionary of classes derived
         from this class, including subclasses of subclasses.
+        All the modules of the subclasses are imported.
 
         Returns:
             dict(str:type) -- a dictionary of the subclasses of this class
         """
+        for name, entry in cls.lazy_entries().items():
+            try:
+                import_subclass_module(entry["module"], name)
+            except ImportError as e:
+                LOG.error(f"Could not import {entry['module']}: {e}")
         return recursive_dict(cls)
@@ -14,6 +14,7 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 from typing import Union
+import numpy as np
 from MDANSE.Chemistry.ChemicalEntity import ChemicalSystem
 from MDANSE.Chemistry import ATOMS_DATABASE
 
@@ -48,11 +49,12 @@ def select_element(
     Union[set[int], bool]
         The atom indices of the matched atoms.
     """
-    pattern = f"[#{ATOMS_DATABASE.get_atom_property(symbol, 'atomic_number')}]"
+    num = ATOMS_DATABASE.get_atom_property(symbol, "atomic_number")
+    matches = system.atomic_numbers == num
     if check_exists:
-        return system.has_substructure_match(pattern)
+        return bool(np.any(matches))
     else:
-        return system.get_substructure_matches(pattern)
+        return set(np.nonzero(matches)[0].tolist())
 
 
 def select_dummy(
@@ -100,13 +102,11 @@ def select_atom_name(
     Union[set[int], bool]
         All atom indices or a bool if checking match.
     """
+    matches = system.atom_names == name
     if check_exists:
-        for atm in system.atom_list:
-            if atm.name == name:
-                return True
-        return False
+        return bool(np.any(matches))
     else:
-        return set([at.index for at in system.atom_list if at.name == name])
+        return set(np.nonzero(matches)[0].tolist())
 
 
 def select_atom_fullname(
@@ -128,13 +128,11 @@ def select_atom_fullname(
     Union[set[int], bool]
         All atom indices or a bool if checking match.
     """
+    matches = system.atom_full_names == fullname
     if check_exists:
-        for atm in system.atom_list:
-            if atm.full_name == fullname:
-                return True
-        return False
+        return bool(np.any(matches))
     else:
-        return set([at.index for at in system.atom_list if at.full_name == fullname])
+        return set(np.nonzero(matches)[0].tolist())
 
 
 def select_hs_on_element(
@@ -157,12 +155,18 @@ def select_hs_on_element(
         The atom indices of the matched atoms.
     """
     num = ATOMS_DATABASE.get_atom_property(symbol, "atomic_number")
+    atomic_numbers = system.atomic_numbers
+    bonds = system.bond_indices
+    # consider both directions of each bond, i.e. X-H and H-X
+    xs = np.concatenate([bonds[:, 0], bonds[:, 1]])
+    hs = np.concatenate([bonds[:, 1], bonds[:, 0]])
+    xh_bonds = (atomic_numbers[xs] == num) & (atomic_numbers[hs] == 1)
     if check_exists:
-        return system.has_substructure_match(f"[#{num}]~[H]")
+        return bool(np.any(xh_bonds))
     else:
-        xh_matches = system.get_substructure_matches(f"[#{num}]~[H]")
-        x_matches = system.get_substructure_matches(f"[#{num}]")
-        return xh_matches - x_matches
+        # atoms of the element itself are never selected, consistent
+        # with the [#num]~[H] minus [#num] SMARTS selection
+        return set(hs[xh_bonds & (atomic_numbers[hs] != num)].tolist())
 
 
 def select_hs_on_heteroatom(
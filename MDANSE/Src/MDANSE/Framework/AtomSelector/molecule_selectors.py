@@ -14,6 +14,7 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 from typing import Union
+import numpy as np
 from MDANSE.Chemistry.ChemicalEntity import ChemicalSystem
 
 
@@ -39,8 +40,18 @@ def select_water(
     Union[set[int], bool]
         The atom indices of the matched atoms or a bool if checking match.
     """
-    pattern = "[#8X2;H2](~[H])~[H]"
+    atomic_numbers = system.atomic_numbers
+    bonds = system.bond_indices
+    ends = np.concatenate([bonds[:, 0], bonds[:, 1]])
+    others = np.concatenate([bonds[:, 1], bonds[:, 0]])
+    n_atoms = len(atomic_numbers)
+    degree = np.bincount(ends, minlength=n_atoms)
+    n_hs = np.bincount(ends[atomic_numbers[others] == 1], minlength=n_atoms)
+    # array equivalent of the [#8X2;H2](~[H])~[H] SMARTS pattern
+    oxygens = (atomic_numbers == 8) & (degree == 2) & (n_hs == 2)
     if check_exists:
-        return system.has_substructure_match(pattern)
+        return bool(np.any(oxygens))
     else:
-        return system.get_substructure_matches(pattern)
+        water = set(np.nonzero(oxygens)[0].tolist())
+        water.update(others[oxygens[ends]].tolist())
+        return water
@@ -90,10 +90,11 @@ class Selector:
             The chemical system to apply the selection to.
         """
         self.system = system
-        self.all_idxs = set([at.index for at in system.atom_list])
+        atom_list = system.atom_list
+        self.all_idxs = set([at.index for at in atom_list])
         self.settings = copy.deepcopy(self._default)
 
-        symbols = set([at.symbol for at in system.atom_list])
+        symbols = set([at.symbol for at in atom_list])
         # all possible values for the system
         self._kwarg_vals = {
             "element": symbols,
@@ -104,8 +105,8 @@ class Selector:
                     if select_hs_on_element(system, symbol, check_exists=True)
                 ]
             ),
-            "name": set([at.name for at in system.atom_list]),
-            "fullname": set([at.full_name for at in system.atom_list]),
+            "name": set(system.atom_names),
+            "fullname": set(system.atom_full_names),
             "index": self.all_idxs,
         }
 
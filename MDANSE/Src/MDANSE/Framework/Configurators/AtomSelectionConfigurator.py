@@ -13,10 +13,12 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
-import operator
+import numpy as np
+
 from MDANSE.Chemistry import ATOMS_DATABASE
 from MDANSE.Framework.Configurators.IConfigurator import IConfigurator
 from MDANSE.Framework.AtomSelector import Selector
+from MDANSE.MolecularDynamics.TopologyCache import cache_key
 
 
 class AtomSelectionConfigurator(IConfigurator):
@@ -49,36 +51,37 @@ class AtomSelectionConfigurator(IConfigurator):
             self.error_status = "Invalid input value."
             return
 
-        selector = Selector(trajConfig["instance"].chemical_system)
-        if not selector.check_valid_json_settings(value):
-            self.error_status = "Invalid JSON string."
-            return
-
-        self["value"] = value
+        trajectory = trajConfig["instance"]
+        cache = trajectory.topology_cache
+        cache_entry = cache_key("selection", value)
 
-        selector.load_from_json(value)
-        indexes = selector.get_idxs()
+        indexes = cache.get(cache_entry)
+        if indexes is None:
+            selector = Selector(trajectory.chemical_system)
+            if not selector.check_valid_json_settings(value):
+                self.error_status = "Invalid JSON string."
+                return
+            selector.load_from_json(value)
+            indexes = np.array(sorted(selector.get_idxs()), dtype=np.int64)
+            cache.put(cache_entry, indexes)
 
-        self["flatten_indexes"] = sorted(list(indexes))
+        self["value"] = value
 
-        trajConfig = self._configurable[self._dependencies["trajectory"]]
+        self["flatten_indexes"] = indexes.tolist()
 
-        atoms = sorted(
-            trajConfig["instance"].chemical_system.atom_list,
-            key=operator.attrgetter("index"),
-        )
-        selectedAtoms = [atoms[idx] for idx in self["flatten_indexes"]]
+        symbols = cache.atom_symbols(trajectory.chemical_system)
 
         self["selection_length"] = len(self["flatten_indexes"])
         self["indexes"] = [[idx] for idx in self["flatten_indexes"]]
 
-        self["elements"] = [[at.symbol] for at in selectedAtoms]
-        self["names"] = [at.symbol for at in selectedAtoms]
+        self["names"] = symbols[indexes].tolist()
+        self["elements"] = [[name] for name in self["names"]]
         self["unique_names"] = sorted(set(self["names"]))
-        self["masses"] = [
-            [ATOMS_DATABASE.get_atom_property(n, "atomic_weight")]
-            for n in self["names"]
-        ]
+        masses = {
+            name: ATOMS_DATABASE.get_atom_property(name, "atomic_weight")
+            for name in self["unique_names"]
+        }
+        self["masses"] = [[masses[n]] for n in self["names"]]
         if self["selection_length"] == 0:
             self.error_status = "The atom selection is empty."
             return
@@ -20,6 +20,7 @@ import collections
 from MDANSE.Framework.Configurators.SingleChoiceConfigurator import (
     SingleChoiceConfigurator,
 )
+from MDANSE.MolecularDynamics.TopologyCache import cache_key
 from MDANSE.MolecularDynamics.TrajectoryUtils import sorted_atoms
 
 LEVELS = collections.OrderedDict()
@@ -112,31 +113,44 @@ class GroupingLevelConfigurator(SingleChoiceConfigurator):
         trajConfig = self._configurable[self._dependencies["trajectory"]]
         atomSelectionConfig = self._configurable[self._dependencies["atom_selection"]]
 
-        allAtoms = sorted_atoms(trajConfig["instance"].chemical_system.atom_list)
-
-        groups = collections.OrderedDict()
+        trajectory = trajConfig["instance"]
+        cache = trajectory.topology_cache
+        cache_entry = cache_key("grouping", value, atomSelectionConfig["value"])
+
+        group_indexes = cache.get(cache_entry)
+        if group_indexes is None:
+            allAtoms = sorted_atoms(trajectory.chemical_system.atom_list)
+
+            groups = collections.OrderedDict()
+            for i in range(atomSelectionConfig["selection_length"]):
+                idx = atomSelectionConfig["indexes"][i][0]
+                at = allAtoms[idx]
+                lvl = LEVELS[value][
+                    at.top_level_chemical_entity.__class__.__name__.lower()
+                ]
+                parent = self.find_parent(at, lvl)
+                groups.setdefault(parent, []).append(idx)
+            group_indexes = list(groups.values())
+            cache.put(cache_entry, group_indexes)
+
+        atom_data = {}
         for i in range(atomSelectionConfig["selection_length"]):
-            idx = atomSelectionConfig["indexes"][i][0]
-            el = atomSelectionConfig["elements"][i][0]
-            mass = atomSelectionConfig["masses"][i][0]
-            at = allAtoms[idx]
-            lvl = LEVELS[value][at.top_level_chemical_entity.__class__.__name__.lower()]
-            parent = self.find_parent(at, lvl)
-            d = groups.setdefault(parent, {})
-            d.setdefault("indexes", []).append(idx)
-            d.setdefault("elements", []).append(el)
-            d.setdefault("masses", []).append(mass)
+            atom_data[atomSelectionConfig["indexes"][i][0]] = (
+                atomSelectionConfig["elements"][i][0],
+                atomSelectionConfig["masses"][i][0],
+            )
 
         indexes = []
         elements = []
         masses = []
         names = []
         group_indices = []
-        for i, v in enumerate(groups.values()):
+        for i, group in enumerate(group_indexes):
+            group = [int(idx) for idx in group]
             names.append("group_%d" % i)
-            elements.append(v["elements"])
-            indexes.append(v["indexes"])
-            masses.append(v["masses"])
+            elements.append([atom_data[idx][0] for idx in group])
+            indexes.append(group)
+            masses.append([atom_data[idx][1] for idx in group])
             group_indices.append(i)
 
         atomSelectionConfig["indexes"] = indexes
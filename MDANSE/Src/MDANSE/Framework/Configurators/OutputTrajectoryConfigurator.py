@@ -54,11 +54,22 @@ class OutputTrajectoryConfigurator(IConfigurator):
         self._format = "MDTFormat"
         self._dtype = np.float64
         self._compression = "none"
+        self._precision = 1e-4
 
     def configure(self, value: tuple):
+        """
+        Configures the output trajectory.
+
+        :param value: the root name of the output file, the number of bits
+            of the floating point numbers, the storage profile (see
+            TrajectoryWriter.storage_profiles), the log level and,
+            optionally, the precision in nm of the coordinates stored
+            with the scale_offset profile.
+        :type value: tuple
+        """
         self._original_input = value
 
-        root, dtype, compression, logs = value
+        root, dtype, compression, logs, *precision = value
 
         if logs not in self.log_options:
             self.error_status = "log level option not recognised"
@@ -83,11 +94,25 @@ class OutputTrajectoryConfigurator(IConfigurator):
         else:
             self._dtype = np.float64
 
-        if compression in TrajectoryWriter.allowed_compression:
+        if compression in TrajectoryWriter.storage_profiles:
             self._compression = compression
         else:
             self._compression = None
 
+        if precision:
+            try:
+                self._precision = float(precision[0])
+            except (TypeError, ValueError):
+                self.error_status = "the precision must be a number"
+                return
+            if self._precision <= 0.0:
+                self.error_status = "the precision must be positive"
+                return
+
+        if self._compression == "scale_offset" and self._dtype == np.float16:
+            self.error_status = "the scale_offset profile needs 32 or 64-bit floats"
+            return
+
         self["root"] = root
         self["format"] = self._format
         self["extension"] = IFormat.create(self._format).extension
@@ -97,6 +122,7 @@ class OutputTrajectoryConfigurator(IConfigurator):
         self["file"] = temp_name
         self["dtype"] = self._dtype
         self["compression"] = self._compression
+        self["precision"] = self._precision
         self["log_level"] = logs
         if logs == "no logs":
             self["write_logs"] = False
@@ -24,6 +24,9 @@ class RunningModeConfigurator(IConfigurator):
 
     MDANSE currently support single-core or multicore (SMP) running modes. In the latter case, you have to
     specify the number of slots used for running the analysis.
+
+    A third element set to True, e.g. ("multicore", 4, True), profiles the steps of the job in every
+    process running them (see MDANSE.Framework.JobProfiler).
     """
 
     availablesModes = ["single-core", "multicore"]
@@ -35,8 +38,9 @@ class RunningModeConfigurator(IConfigurator):
         Configure the running mode.
      
         :param value: the running mode specification. It can be *'single-core'* or a 2-tuple whose first element \
-        must be *'multicore'* and 2nd element the number of slots allocated for running the analysis.
-        :type value: *'single-core'* or 2-tuple
+        must be *'multicore'* and 2nd element the number of slots allocated for running the analysis. An optional \
+        3rd element set to True enables the profiling of the steps.
+        :type value: *'single-core'* or 2-tuple or 3-tuple
         """
         self._original_input = value
 
@@ -71,6 +75,10 @@ class RunningModeConfigurator(IConfigurator):
         self["mode"] = mode
 
         self["slots"] = slots
+
+        self["profile"] = (
+            not isinstance(value, str) and len(value) > 2 and bool(value[2])
+        )
         self.error_status = "OK"
 
     def get_information(self):
@@ -82,6 +90,8 @@ class RunningModeConfigurator(IConfigurator):
         """
         try:
             info = "Run in %s mode (%d slots)\n" % (self["mode"], self["slots"])
+            if self["profile"]:
+                info += "The steps are profiled\n"
         except KeyError:
             info = "Running mode has not been configured"
 
@@ -18,6 +18,7 @@ import numpy as np
 
 from MDANSE.Core.Error import Error
 from MDANSE.Framework.AtomMapping import AtomLabel
+from MDANSE.IO.IOUtils import parse_columns
 from .FileWithAtomDataConfigurator import FileWithAtomDataConfigurator
 
 
@@ -125,14 +126,10 @@ class XYZFileConfigurator(FileWithAtomDataConfigurator):
             next(self["instance"])
             self._lastline += 1
 
-        templines = []
-        for _ in range(self._frame_lines):
-            templines.append(
-                [float(x) for x in self["instance"].readline().split()[1:]]
-            )
-            self._lastline += 1
+        block = "".join(self["instance"].readline() for _ in range(self._frame_lines))
+        self._lastline += self._frame_lines
 
-        config = np.array(templines, dtype=np.float64)
+        config = parse_columns(block, self._frame_lines, columns=slice(1, None))
 
         return config
 
@@ -126,6 +126,7 @@ class ASE(Converter):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
             initial_charges=self._initial_charges,
         )
 
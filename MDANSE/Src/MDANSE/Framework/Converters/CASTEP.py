@@ -102,6 +102,7 @@ class CASTEP(Converter):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
         )
 
     def run_step(self, index):
@@ -207,6 +207,7 @@ class CP2K(Converter):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
         )
 
         data_to_be_written = ["configuration", "time"]
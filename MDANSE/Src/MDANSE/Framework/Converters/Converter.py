@@ -28,10 +28,53 @@ class Converter(IJob, metaclass=SubclassFactory):
 
     ancestor = ["empty_data"]
 
+    # the converters which can run in multicore mode implement read_step,
+    # which reads and converts a frame into a picklable object without
+    # writing it, and write_step, which writes it to the output trajectory:
+    # the frames are then read by the worker processes and written in order
+    # by the main process, the only one which can write the output file
+    supports_parallel_read = False
+
+    def __getstate__(self):
+        d = super().__getstate__()
+        # the output trajectory is only written by the main process
+        d.pop("_trajectory", None)
+        return d
+
     @abstractmethod
     def run_step(self, index):
         pass
 
+    def _read_step_in_worker(self, index: int):
+        return index, self.read_step(index)
+
+    def _run_multicore(self):
+        if not self.supports_parallel_read:
+            LOG.warning(
+                f"{self.__class__.__name__} cannot read frames in parallel, "
+                "running on a single core"
+            )
+            self._run_singlecore()
+            return
+
+        # the frames arrive in any order and are written in order
+        pending = {}
+        next_index = 0
+
+        def write_in_order(index, frame):
+            nonlocal next_index
+            pending[index] = frame
+            while next_index in pending:
+                self.write_step(next_index, pending.pop(next_index))
+                next_index += 1
+
+        IJob._run_multicore(
+            self, step=self._read_step_in_worker, collect=write_in_order
+        )
+        LOG.info(f"Wrote {next_index} frames read by the worker processes")
+
+    _runner = dict(IJob._runner, multicore=_run_multicore)
+
     def write_metadata(self, output_file):
         string_dt = h5py.special_dtype(vlen=str)
         meta = output_file.create_group("metadata")
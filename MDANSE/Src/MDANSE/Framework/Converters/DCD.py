@@ -14,7 +14,9 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 import collections
+import os
 import struct
+from typing import Union
 
 import numpy as np
 
@@ -23,7 +25,11 @@ from MDANSE.Framework.Converters.Converter import Converter
 from MDANSE.Framework.Units import measure
 from MDANSE.IO.MinimalPDBReader import MinimalPDBReader
 from MDANSE.Mathematics.Geometry import get_basis_vectors_from_cell_parameters
-from MDANSE.MolecularDynamics.Configuration import PeriodicRealConfiguration
+from MDANSE.MLogging import LOG
+from MDANSE.MolecularDynamics.Configuration import (
+    PeriodicRealConfiguration,
+    RealConfiguration,
+)
 from MDANSE.MolecularDynamics.Trajectory import (
     resolve_undefined_molecules_name,
     TrajectoryWriter,
@@ -151,6 +157,9 @@ class DCDFile(FortranBinaryFile, dict):
 
         self.read_header()
 
+        self._frames = self.map_frames()
+        self._current_frame = 0
+
     def read_header(self):
         # Read a block
         data = self.next_record()
@@ -214,51 +223,127 @@ class DCDFile(FortranBinaryFile, dict):
         # Read the number of atoms.
         self["natoms"] = struct.unpack(self.byteOrder.encode() + b"I", data)[0]
 
-    def read_step(self):
+    def frame_dtype(self) -> np.dtype:
         """
-        Reads a frame of the DCD file.
+        Returns
+        -------
+        np.dtype
+            The structured type of a frame, including the markers of
+            the Fortran records.
         """
+        marker = self.byteOrder + "i4"
+        fields = []
+        if self["has_pbc_data"]:
+            fields += [
+                ("cell_head", marker),
+                ("cell", self.byteOrder + "f8", (6,)),
+                ("cell_tail", marker),
+            ]
+        axes = ["x", "y", "z", "w"] if self["has_4d"] else ["x", "y", "z"]
+        for axis in axes:
+            fields += [
+                (f"{axis}_head", marker),
+                (axis, self.byteOrder + "f4", (self["natoms"],)),
+                (f"{axis}_tail", marker),
+            ]
+        return np.dtype(fields)
+
+    def map_frames(self) -> np.memmap:
+        """Maps the frames of the file, which all have the same size, to
+        an array of structured records. The record markers of the first
+        and last frames are checked against the expected record sizes.
+
+        Returns
+        -------
+        np.memmap
+            The frames of the file.
+        """
+        dtype = self.frame_dtype()
+        start = self.file.tell()
+        n_frames = (os.path.getsize(self["filename"]) - start) // dtype.itemsize
+        if n_frames < self["n_frames"]:
+            LOG.warning(
+                f"{self['filename']} contains {n_frames} frames, "
+                f"not {self['n_frames']} as stated in its header"
+            )
+        elif self["n_frames"] > 0:
+            n_frames = self["n_frames"]
+        self["nset"] = self["n_frames"] = n_frames
+        if n_frames == 0:
+            return np.zeros(0, dtype=dtype)
+
+        frames = np.memmap(
+            self["filename"], dtype=dtype, mode="r", offset=start, shape=(n_frames,)
+        )
+        expected = {"cell": 48, "x": 4 * self["natoms"]}
+        for name in frames.dtype.names:
+            if name.endswith("_head") or name.endswith("_tail"):
+                size = expected.get(name[:-5], 4 * self["natoms"])
+                if frames[0][name] != size or frames[-1][name] != size:
+                    raise DCDFileError(
+                        f"Unexpected record size in {self['filename']}: "
+                        "frames of varying size are not supported"
+                    )
+        return frames
+
+    def read_frames(self, start: int, stop: int):
+        """Reads consecutive frames of the DCD file.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first frame.
+        stop : int
+            The index after the last frame.
+
+        Returns
+        -------
+        tuple[np.ndarray or None, np.ndarray]
+            The cell parameters (a, b, c in nm, alpha, beta, gamma in
+            radians) of shape (n_frames, 6), or None if the file has no
+            cell, and the coordinates in nm of shape (n_frames, natoms, 3).
+        """
+        block = self._frames[start:stop]
 
         if self["has_pbc_data"]:
-            unitCell = np.array(self.get_record("6d"), dtype=np.float64)
-            unitCell = unitCell[[0, 2, 5, 1, 3, 4]]
+            unitCells = block["cell"][:, [0, 2, 5, 1, 3, 4]].astype(np.float64)
             # The unit cell is converted from ang to nm
-            unitCell[0:3] *= measure(1.0, "ang").toval("nm")
+            unitCells[:, 0:3] *= measure(1.0, "ang").toval("nm")
             # This file was generated by CHARMM, or by NAMD > 2.5, with the angle
             # cosines of the periodic cell angles written to the DCD file.
             # This formulation improves rounding behavior for orthogonal cells
             # so that the angles end up at precisely 90 degrees, unlike acos().
             # See https://github.com/MDAnalysis/mdanalysis/wiki/FileFormats for info
-            if np.all(abs(unitCell[3:]) <= 1):
-                unitCell[3:] = PI_2 - np.arcsin(unitCell[3:])
-            else:
-                # assume the angles are stored in degrees (NAMD <= 2.5)
-                unitCell[3:] = np.deg2rad(unitCell[3:])
-
+            angles = unitCells[:, 3:]
+            cosines = np.all(abs(angles) <= 1, axis=1)
+            # otherwise, assume the angles are stored in degrees (NAMD <= 2.5)
+            angles[cosines] = PI_2 - np.arcsin(angles[cosines])
+            angles[~cosines] = np.deg2rad(angles[~cosines])
         else:
-            unitCell = None
+            unitCells = None
 
-        fmt = "%df" % self["natoms"]
-        config = np.empty((self["natoms"], 3), dtype=np.float64)
-        config[:, 0] = np.array(self.get_record(fmt), dtype=np.float64)
-        config[:, 1] = np.array(self.get_record(fmt), dtype=np.float64)
-        config[:, 2] = np.array(self.get_record(fmt), dtype=np.float64)
-        config *= measure(1.0, "ang").toval("nm")
+        config = np.stack([block["x"], block["y"], block["z"]], axis=-1)
+        config = config.astype(np.float64) * measure(1.0, "ang").toval("nm")
 
-        if self["has_4d"]:
-            self.skip_record()
+        return unitCells, config
 
-        return unitCell, config
+    def read_step(self):
+        """
+        Reads a frame of the DCD file.
+        """
+        if self._current_frame >= len(self._frames):
+            raise EndOfFile()
+        unitCells, config = self.read_frames(
+            self._current_frame, self._current_frame + 1
+        )
+        self._current_frame += 1
+        if unitCells is None:
+            return None, config[0]
+        return unitCells[0], config[0]
 
     def skip_step(self):
         """Skips a frame of the DCD file."""
-        nrecords = 3
-        if self["has_pbc_data"]:
-            nrecords += 1
-        if self["has_4d"]:
-            nrecords += 1
-        for _ in range(nrecords):
-            self["binary"].skip_record()
+        self._current_frame += 1
 
     def __iter__(self):
         return self
@@ -308,6 +393,12 @@ class DCD(Converter):
             "label": "MDANSE trajectory (filename, format)",
         },
     )
+    settings["running_mode"] = ("RunningModeConfigurator", {})
+
+    supports_parallel_read = True
+
+    # the number of bytes of coordinates decoded at once in single-core mode
+    block_size = 2**25
 
     def initialize(self):
         """
@@ -335,8 +426,12 @@ class DCD(Converter):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
         )
 
+        self._block_start = 0
+        self._block = []
+
     def run_step(self, index):
         """
         Runs a single step of the job.\n
@@ -347,17 +442,42 @@ class DCD(Converter):
             #. index (int): The index of the step.
         """
 
-        # The x, y and z values of the current frame.
-        unit_cell, config = self.configuration["dcd_file"]["instance"].read_step()
-        unit_cell = get_basis_vectors_from_cell_parameters(unit_cell)
-        unit_cell = UnitCell(unit_cell)
+        # the frames are decoded by blocks, which are then written one by one
+        if not self._block_start <= index < self._block_start + len(self._block):
+            dcd_file = self.configuration["dcd_file"]["instance"]
+            n_frames = max(1, self.block_size // (24 * dcd_file["natoms"]))
+            stop = min(index + n_frames, self.numberOfSteps)
+            unit_cells, configs = dcd_file.read_frames(index, stop)
+            if unit_cells is None:
+                unit_cells = [None] * len(configs)
+            self._block = list(zip(unit_cells, configs))
+            self._block_start = index
+
+        self.write_step(index, self._block[index - self._block_start])
+
+        return index, None
 
-        conf = PeriodicRealConfiguration(
-            self._trajectory._chemical_system, config, unit_cell
+    def read_step(self, index: int):
+        unit_cells, configs = self.configuration["dcd_file"]["instance"].read_frames(
+            index, index + 1
         )
+        return (None if unit_cells is None else unit_cells[0]), configs[0]
 
-        if self.configuration["fold"]["value"]:
-            conf.fold_coordinates()
+    def write_step(self, index: int, frame) -> None:
+        unit_cell, config = frame
+
+        if unit_cell is None:
+            conf = RealConfiguration(self._trajectory._chemical_system, config)
+        else:
+            unit_cell = get_basis_vectors_from_cell_parameters(unit_cell)
+            unit_cell = UnitCell(unit_cell)
+
+            conf = PeriodicRealConfiguration(
+                self._trajectory._chemical_system, config, unit_cell
+            )
+
+            if self.configuration["fold"]["value"]:
+                conf.fold_coordinates()
 
         self._trajectory._chemical_system.configuration = conf
 
@@ -369,8 +489,6 @@ class DCD(Converter):
             time, units={"time": "ps", "unit_cell": "nm", "coordinates": "nm"}
         )
 
-        return index, None
-
     def combine(self, index, x):
         """
         Combines returned results of run_step.\n
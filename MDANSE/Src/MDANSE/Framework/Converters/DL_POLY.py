@@ -303,6 +303,7 @@ class DL_POLY(Converter):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
             initial_charges=self._fieldFile.get_atom_charges(),
         )
 
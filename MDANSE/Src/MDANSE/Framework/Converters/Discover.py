@@ -339,6 +339,7 @@ class Discover(Converter):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
             initial_charges=self.configuration["xtd_file"].get_atom_charges(),
         )
 
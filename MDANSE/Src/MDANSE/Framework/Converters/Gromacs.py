@@ -15,6 +15,7 @@
 #
 
 import collections
+import os
 
 import numpy as np
 
@@ -67,6 +68,18 @@ class Gromacs(Converter):
             "label": "MDANSE trajectory (filename, format)",
         },
     )
+    settings["running_mode"] = ("RunningModeConfigurator", {})
+
+    supports_parallel_read = True
+
+    # the number of bytes of coordinates decoded at once in single-core mode
+    block_size = 2**25
+
+    def __getstate__(self):
+        d = super().__getstate__()
+        # the XDR file cannot be pickled, workers open their own
+        d["_xdr_file"] = None
+        return d
 
     def initialize(self):
         """
@@ -78,15 +91,12 @@ class Gromacs(Converter):
 
         # Create XTC or TRR object depending on which kind of trajectory was loaded
         if self.configuration["xtc_file"]["filename"][-4:] == ".xtc":
-            self._xdr_file = xtc.XTCTrajectoryFile(
-                self.configuration["xtc_file"]["filename"], "r"
-            )
             self._xtc = True
+            self._xdr_file = self.open_xdr_file()
+            self._read_velocities = self._read_forces = False
         elif self.configuration["xtc_file"]["filename"][-4:] == ".trr":
-            self._xdr_file = trr.TRRTrajectoryFile(
-                self.configuration["xtc_file"]["filename"], "r"
-            )
             self._xtc = False
+            self._xdr_file = self.open_xdr_file()
 
             # Extract information about whether velocities and forces are present in the TRR file
             try:
@@ -117,8 +127,12 @@ class Gromacs(Converter):
                 "but %s was provided." % self.configuration["xtc_file"]["filename"][-4:]
             )
 
+        # The byte offsets of the frames, which allow the frames to be read
+        # in any order, are found once and given to the worker processes.
+        self._offsets = self._xdr_file.offsets
+
         # The number of steps of the analysis.
-        self.numberOfSteps = len(self._xdr_file)
+        self.numberOfSteps = len(self._offsets)
 
         # Create all chemical entities from the PDB file.
         pdb_reader = MinimalPDBReader(self.configuration["pdb_file"]["filename"])
@@ -131,41 +145,109 @@ class Gromacs(Converter):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
         )
 
-    def run_step(self, index):
-        """Runs a single step of the job.
+        self._block_start = 0
+        self._block = []
 
-        @param index: the index of the step.
-        @type index: int.
+    def open_xdr_file(self):
+        """Opens the XTC or TRR file for reading.
 
-        @note: the argument index is the index of the loop note the index of the frame.
+        Returns
+        -------
+        xtc.XTCTrajectoryFile or trr.TRRTrajectoryFile
+            The opened trajectory file. Its frame offsets are set if they
+            have already been found.
         """
+        filename = self.configuration["xtc_file"]["filename"]
+        if self._xtc:
+            xdr_file = xtc.XTCTrajectoryFile(filename, "r")
+        else:
+            xdr_file = trr.TRRTrajectoryFile(filename, "r")
+        offsets = getattr(self, "_offsets", None)
+        if offsets is not None:
+            xdr_file.offsets = offsets
+        self._xdr_pid = os.getpid()
+        return xdr_file
+
+    def read_frames(self, start: int, stop: int) -> list:
+        """Decodes consecutive frames of the XTC or TRR file.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first frame.
+        stop : int
+            The index after the last frame.
+
+        Returns
+        -------
+        list
+            The (time, coordinates, box, variables) frames, where variables
+            holds the velocities and gradients found in a TRR file.
+        """
+        if self._xdr_file is None or self._xdr_pid != os.getpid():
+            # the file position must not be shared with a worker process
+            self._xdr_file = self.open_xdr_file()
+        if self._xdr_file.tell() != start:
+            self._xdr_file.seek(start)
 
-        variables = {}
-
-        # The x, y and z values of the current frame.
+        n_frames = stop - start
         if self._xtc:
-            coords, times, steps, box = self._xdr_file.read(1)
+            coords, times, _, boxes, _ = self._xdr_file._read(n_frames, None, 1)
         else:
-            coords, times, steps, box, __, velocities, forces = self._xdr_file._read(
-                1,
+            coords, times, _, boxes, _, velocities, forces = self._xdr_file._read(
+                n_frames,
                 None,
                 get_velocities=self._read_velocities,
                 get_forces=self._read_forces,
             )
 
+        frames = []
+        for n in range(len(coords)):
+            variables = {}
             if self._read_velocities:
-                variables["velocities"] = velocities[0, :, :].astype(float)
+                variables["velocities"] = velocities[n].astype(float)
             if self._read_forces:
-                variables["gradients"] = forces[0, :, :].astype(float)
+                variables["gradients"] = forces[n].astype(float)
+            frames.append((times[n], coords[n], boxes[n], variables))
+        return frames
 
-        coords = np.squeeze(coords)
+    def run_step(self, index):
+        """Runs a single step of the job.
+
+        @param index: the index of the step.
+        @type index: int.
+
+        @note: the argument index is the index of the loop note the index of the frame.
+        """
+
+        # the frames are decoded by blocks, which are then written one by one
+        if not self._block_start <= index < self._block_start + len(self._block):
+            n_frames = max(
+                1,
+                self.block_size
+                // (12 * self._trajectory.chemical_system.number_of_atoms),
+            )
+            stop = min(index + n_frames, self.numberOfSteps)
+            self._block = self.read_frames(index, stop)
+            self._block_start = index
+
+        self.write_step(index, self._block[index - self._block_start])
+
+        return index, None
+
+    def read_step(self, index: int):
+        return self.read_frames(index, index + 1)[0]
+
+    def write_step(self, index: int, frame) -> None:
+        time, coords, box, variables = frame
 
         conf = PeriodicRealConfiguration(
             self._trajectory.chemical_system,
             coords,
-            UnitCell(box[0, :, :]),
+            UnitCell(box),
             **variables,
         )
 
@@ -174,13 +256,8 @@ class Gromacs(Converter):
 
         self._trajectory.chemical_system.configuration = conf
 
-        # The current time.
-        time = times[0]
-
         self._trajectory.dump_configuration(time)
 
-        return index, None
-
     def combine(self, index, x):
         """
         @param index: the index of the step.
@@ -136,6 +136,7 @@ class ImprovedASE(Converter):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
         )
 
         self._nameToIndex = dict(
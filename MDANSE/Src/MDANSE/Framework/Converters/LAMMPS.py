@@ -14,6 +14,12 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 import collections
+import io
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Union
+
 import numpy as np
 
 import h5py
@@ -22,6 +28,8 @@ from MDANSE.Chemistry.ChemicalEntity import Atom, AtomCluster, ChemicalSystem
 from MDANSE.Core.Error import Error
 from MDANSE.Framework.Converters.Converter import Converter
 from MDANSE.Framework.Units import measure
+from MDANSE.IO.FrameIndex import FrameIndex
+from MDANSE.IO.IOUtils import parse_columns
 from MDANSE.Mathematics.Graph import Graph
 from MDANSE.MolecularDynamics.Configuration import (
     PeriodicBoxConfiguration,
@@ -32,7 +40,6 @@ from MDANSE.MolecularDynamics.UnitCell import UnitCell
 from MDANSE.Framework.AtomMapping import get_element_from_mapping
 from MDANSE.MLogging import LOG
 
-
 ELECTRON_CHARGE = 1.6021765e-19
 
 
@@ -40,7 +47,7 @@ class LAMMPSTrajectoryFileError(Error):
     pass
 
 
-class LAMMPSReader:
+class LAMMPSReader(ABC):
 
     def __init__(self, *args, **kwargs):
         self._units = kwargs.get("lammps_units", "real")
@@ -48,15 +55,151 @@ class LAMMPSReader:
         self._fold = kwargs.get("fold_coordinates", False)
         self.set_units(self._units)
         self._file = None
+        self._frame_index = None
+        self._lines_per_frame = None
 
     def close(self):
         try:
             self._file.close()
         except:
             LOG.error(f"Could not close file: {self._file}")
+        if self._frame_index is not None:
+            self._frame_index.close()
+
+    def __getstate__(self):
+        d = self.__dict__.copy()
+        d["_file"] = None
+        d.pop("_trajectory", None)
+        return d
 
     def set_output(self, output_trajectory):
         self._trajectory = output_trajectory
+        self._chemical_system = output_trajectory.chemical_system
+
+    @abstractmethod
+    def read_step(self, index: int) -> Union[dict, None]:
+        """Reads a frame of the trajectory, without writing anything,
+        so that it can run in a worker process.
+
+        Parameters
+        ----------
+        index : int
+            The index of the frame.
+
+        Returns
+        -------
+        dict or None
+            The frame, as returned by make_frame, or None if the frame
+            could not be read.
+        """
+
+    def make_frame(
+        self,
+        time: float,
+        coords: np.ndarray,
+        unit_cell: UnitCell,
+        charges: Union[np.ndarray, None] = None,
+    ) -> dict:
+        """Converts the coordinates read from the file to real
+        coordinates in nm, folding them into the box if requested.
+
+        Parameters
+        ----------
+        time : float
+            The time of the frame in ps.
+        coords : np.ndarray
+            The coordinates in the units of the file, or fractional.
+        unit_cell : UnitCell
+            The unit cell in nm.
+        charges : np.ndarray or None
+            The charges of the atoms, if they are given for each frame.
+
+        Returns
+        -------
+        dict
+            The time, coordinates, unit_cell and charges of the frame.
+        """
+        if self._fractionalCoordinates:
+            conf = PeriodicBoxConfiguration(self._chemical_system, coords, unit_cell)
+            realConf = conf.to_real_configuration()
+        else:
+            coords *= measure(1.0, self._length_unit).toval("nm")
+            realConf = PeriodicRealConfiguration(
+                self._chemical_system, coords, unit_cell
+            )
+
+        if self._fold:
+            # The whole configuration is folded in to the simulation box.
+            realConf.fold_coordinates()
+
+        return {
+            "time": time,
+            "coordinates": realConf["coordinates"],
+            "unit_cell": unit_cell,
+            "charges": charges,
+        }
+
+    def write_step(self, index: int, frame: Union[dict, None]) -> None:
+        """Writes a frame returned by read_step to the output trajectory.
+
+        Parameters
+        ----------
+        index : int
+            The index of the frame.
+        frame : dict or None
+            The frame. Nothing is written if it is None.
+        """
+        if frame is None:
+            return
+
+        self._chemical_system.configuration = PeriodicRealConfiguration(
+            self._chemical_system, frame["coordinates"], frame["unit_cell"]
+        )
+
+        # the charges are written first, since their dataset cannot be
+        # created once the frames have been flushed in SWMR mode
+        if frame["charges"] is not None:
+            self._trajectory.write_charges(frame["charges"], index)
+
+        # A snapshot is created out of the current configuration.
+        self._trajectory.dump_configuration(
+            frame["time"], units={"time": "ps", "unit_cell": "nm", "coordinates": "nm"}
+        )
+
+    def complete_frames(self) -> int:
+        """Finds the frames which have been added to the trajectory file
+        since it was last indexed, e.g. by a simulation which is still
+        running. The last frame is left out until it has as many lines
+        as the first one, since it may still be being written.
+
+        Returns
+        -------
+        int
+            The number of frames which can be read.
+        """
+        if self._frame_index is None:
+            raise LAMMPSTrajectoryFileError(
+                f"{self.__class__.__name__} cannot follow a growing trajectory"
+            )
+        n_frames = self._frame_index.update()
+        if n_frames == 0:
+            return 0
+        if self._lines_per_frame is None:
+            # the first frame has been read when the converter was initialised
+            self._lines_per_frame = self._frame_index.read_frame(0).count(b"\n")
+        last_frame = self._frame_index.read_frame(n_frames - 1)
+        if last_frame.count(b"\n") < self._lines_per_frame:
+            n_frames -= 1
+        return n_frames
+
+    def run_step(self, index: int):
+        """Reads a frame and writes it to the output trajectory.
+
+        @param index: the index of the step.
+        @type index: int.
+        """
+        self.write_step(index, self.read_step(index))
+        return index, None
 
     def set_units(self, lammps_units):
         self._energy_unit = ""
@@ -122,18 +265,29 @@ class LAMMPScustom(LAMMPSReader):
         super().__init__(*args, **kwargs)
 
     def get_time_steps(self, filename: str) -> int:
-        number_of_steps = 0
-        self.open_file(filename)
-        if number_of_steps == 0:
-            for line in self._file:
-                if line.startswith("ITEM: TIMESTEP"):
-                    number_of_steps += 1
-        self.close()
-        return number_of_steps
+        return len(self.index_frames(filename))
+
+    def index_frames(self, filename: str) -> FrameIndex:
+        """Finds the byte offsets of the frames of the trajectory, which
+        are reused for as long as the same file is read.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the LAMMPS custom dump.
+
+        Returns
+        -------
+        FrameIndex
+            The index of the frames of the file.
+        """
+        if self._frame_index is None or self._frame_index._filename != filename:
+            self._frame_index = FrameIndex(filename, marker=b"ITEM: TIMESTEP")
+        return self._frame_index
 
     def open_file(self, filename: str):
         self._file = open(filename, "r")
-        self._start = 0
+        self.index_frames(filename)
 
     def parse_first_step(self, aliases, config):
 
@@ -263,7 +417,17 @@ class LAMMPScustom(LAMMPSReader):
                         obj = AtomCluster(name, atList)
 
                     chemicalSystem.add_chemical_entity(obj)
-                self._last = comp + self._nAtoms + 1
+
+                # maps the rank of the atoms in the file to their index
+                # in the chemical system
+                name_to_index = {
+                    atom.name: atom.index for atom in chemicalSystem.atom_list
+                }
+                self._rankToIndex = np.full(
+                    max(self._rankToName) + 1, -1, dtype=np.int64
+                )
+                for rank, name in self._rankToName.items():
+                    self._rankToIndex[rank] = name_to_index[name]
 
                 break
 
@@ -273,22 +437,20 @@ class LAMMPScustom(LAMMPSReader):
                 continue
         return chemicalSystem
 
-    def run_step(self, index):
-        """Runs a single step of the job.
-
-        @param index: the index of the step.
-        @type index: int.
-
-        @note: the argument index is the index of the loop note the index of the frame.
-        """
+    def read_step(self, index: int) -> Union[dict, None]:
+        if index >= len(self._frame_index):
+            return None
+        # the frame is read at its offset, so that any frame can be read
+        # without reading the previous ones
+        stream = io.StringIO(self._frame_index.read_frame(index).decode("utf-8"))
 
         for _ in range(self._itemsPosition["TIMESTEP"][0]):
-            line = self._file.readline()
+            line = stream.readline()
             if not line:
-                return index, None
+                return None
 
         time = (
-            float(self._file.readline())
+            float(stream.readline())
             * self._timestep
             * measure(1.0, self._time_unit).toval("ps")
         )
@@ -296,10 +458,10 @@ class LAMMPScustom(LAMMPSReader):
         for _ in range(
             self._itemsPosition["TIMESTEP"][1], self._itemsPosition["BOX BOUNDS"][0]
         ):
-            self._file.readline()
+            stream.readline()
 
         unitCell = np.zeros((9), dtype=np.float64)
-        temp = [float(v) for v in self._file.readline().split()]
+        temp = [float(v) for v in stream.readline().split()]
         if len(temp) == 2:
             xlo, xhi = temp
             xy = 0.0
@@ -308,7 +470,7 @@ class LAMMPScustom(LAMMPSReader):
         else:
             raise LAMMPSTrajectoryFileError("Bad format for A vector components")
 
-        temp = [float(v) for v in self._file.readline().split()]
+        temp = [float(v) for v in stream.readline().split()]
         if len(temp) == 2:
             ylo, yhi = temp
             xz = 0.0
@@ -317,7 +479,7 @@ class LAMMPScustom(LAMMPSReader):
         else:
             raise LAMMPSTrajectoryFileError("Bad format for B vector components")
 
-        temp = [float(v) for v in self._file.readline().split()]
+        temp = [float(v) for v in stream.readline().split()]
         if len(temp) == 2:
             zlo, zhi = temp
             yz = 0.0
@@ -346,62 +508,31 @@ class LAMMPScustom(LAMMPSReader):
         for _ in range(
             self._itemsPosition["BOX BOUNDS"][1], self._itemsPosition["ATOMS"][0]
         ):
-            self._file.readline()
+            stream.readline()
 
-        coords = np.empty(
-            (self._trajectory.chemical_system.number_of_atoms, 3), dtype=np.float64
-        )
+        coords = np.empty((self._chemical_system.number_of_atoms, 3), dtype=np.float64)
 
         if self._charge is not None:
-            charges = np.empty(
-                self._trajectory.chemical_system.number_of_atoms, dtype=np.float64
-            )
-
-        for i, _ in enumerate(
-            range(self._itemsPosition["ATOMS"][0], self._itemsPosition["ATOMS"][1])
-        ):
-            temp = self._file.readline().split()
-            try:
-                temp_index = int(temp[0])
-            except ValueError:
-                idx = i
-            else:
-                idx = self._nameToIndex[self._rankToName[temp_index - 1]]
-            coords[idx, :] = np.array(
-                [temp[self._x], temp[self._y], temp[self._z]], dtype=np.float64
-            )
-            if self._charge is not None:
-                charges[idx] = float(temp[self._charge])
+            charges = np.empty(self._chemical_system.number_of_atoms, dtype=np.float64)
 
-        if self._fractionalCoordinates:
-            conf = PeriodicBoxConfiguration(
-                self._trajectory.chemical_system, coords, unitCell
-            )
-            realConf = conf.to_real_configuration()
+        # the rest of the frame is the ATOMS block, which is parsed at once
+        fields = parse_columns(stream.read(), self._nAtoms, dtype=None)
+        try:
+            ranks = fields[:, 0].astype(np.int64) - 1
+        except ValueError:
+            order = np.arange(self._nAtoms)
         else:
-            coords *= measure(1.0, self._length_unit).toval("nm")
-            realConf = PeriodicRealConfiguration(
-                self._trajectory.chemical_system, coords, unitCell
-            )
-
-        if self._fold:
-            # The whole configuration is folded in to the simulation box.
-            realConf.fold_coordinates()
-
-        self._trajectory.chemical_system.configuration = realConf
-
-        # A snapshot is created out of the current configuration.
-        self._trajectory.dump_configuration(
-            time, units={"time": "ps", "unit_cell": "nm", "coordinates": "nm"}
-        )
+            order = self._rankToIndex[ranks]
+        coords[order] = fields[:, [self._x, self._y, self._z]].astype(np.float64)
         if self._charge is not None:
-            self._trajectory.write_charges(
-                charges * self._charge_conversion_factor, index
-            )
+            charges[order] = fields[:, self._charge].astype(np.float64)
 
-        self._start += self._last
+        if self._charge is not None:
+            charges *= self._charge_conversion_factor
+        else:
+            charges = None
 
-        return index, self._start
+        return self.make_frame(time, coords, unitCell, charges)
 
 
 class LAMMPSxyz(LAMMPSReader):
@@ -411,42 +542,48 @@ class LAMMPSxyz(LAMMPSReader):
         self._full_cell = None
 
     def get_time_steps(self, filename: str) -> int:
-        number_of_steps = 0
-        self.open_file(filename)
-        if number_of_steps == 0:
-            for line in self._file:
-                if len(line.split()) == 1:
-                    number_of_steps += 1
-        self.close()
-        return number_of_steps
+        return len(self.index_frames(filename))
+
+    def index_frames(self, filename: str) -> FrameIndex:
+        """Finds the byte offsets of the frames of the trajectory, which
+        are reused for as long as the same file is read. All the frames
+        are assumed to have the number of atoms given in the first line.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the LAMMPS xyz dump.
+
+        Returns
+        -------
+        FrameIndex
+            The index of the frames of the file.
+        """
+        if self._frame_index is None or self._frame_index._filename != filename:
+            with open(filename, "r") as source:
+                number_of_atoms = int(source.readline())
+            self._frame_index = FrameIndex(
+                filename, lines_per_frame=number_of_atoms + 2
+            )
+        return self._frame_index
 
     def open_file(self, filename: str):
         self._file = open(filename, "r")
+        self.index_frames(filename)
 
-    def read_any_step(self):
+    def read_any_step(self, stream=None):
 
-        line = self._file.readline()
+        if stream is None:
+            stream = self._file
+        line = stream.readline()
         number_of_atoms = int(line)
-        line = self._file.readline()
+        line = stream.readline()
         timestep = int(line.split()[-1])
 
-        positions = np.empty((number_of_atoms, 3))
-        atom_types = np.empty(number_of_atoms, dtype=int)
-
-        for at_num in range(number_of_atoms):
-
-            line = self._file.readline()
-
-            if not line:
-                break
-
-            toks = line.split()
-
-            if len(toks) == 4:
-                atom_id = int(toks[0])
-                atom_pos = [float(x) for x in toks[1:]]
-                positions[at_num] = atom_pos
-                atom_types[at_num] = atom_id
+        block = "".join(stream.readline() for _ in range(number_of_atoms))
+        fields = parse_columns(block, number_of_atoms, dtype=None)
+        atom_types = fields[:, 0].astype(int)
+        positions = fields[:, 1:4].astype(np.float64)
 
         return timestep, atom_types, positions
 
@@ -526,46 +663,19 @@ class LAMMPSxyz(LAMMPSReader):
 
         return chemicalSystem
 
-    def run_step(self, index):
-        """Runs a single step of the job.
-
-        @param index: the index of the step.
-        @type index: int.
-
-        @note: the argument index is the index of the loop note the index of the frame.
-        """
-
+    def read_step(self, index: int) -> Union[dict, None]:
+        if index >= len(self._frame_index):
+            return None
+        stream = io.StringIO(self._frame_index.read_frame(index).decode("utf-8"))
         try:
-            timestep, _, positions = self.read_any_step()
+            timestep, _, positions = self.read_any_step(stream)
         except ValueError:
-            return
+            return None
 
         unitCell = UnitCell(self._full_cell)
         time = timestep * self._timestep * measure(1.0, self._time_unit).toval("ps")
 
-        if self._fractionalCoordinates:
-            conf = PeriodicBoxConfiguration(
-                self._trajectory.chemical_system, positions, unitCell
-            )
-            realConf = conf.to_real_configuration()
-        else:
-            positions *= measure(1.0, self._length_unit).toval("nm")
-            realConf = PeriodicRealConfiguration(
-                self._trajectory.chemical_system, positions, unitCell
-            )
-
-        if self._fold:
-            # The whole configuration is folded in to the simulation box.
-            realConf.fold_coordinates()
-
-        self._trajectory.chemical_system.configuration = realConf
-
-        # A snapshot is created out of the current configuration.
-        self._trajectory.dump_configuration(
-            time, units={"time": "ps", "unit_cell": "nm", "coordinates": "nm"}
-        )
-
-        return index, 0
+        return self.make_frame(time, positions, unitCell)
 
 
 class LAMMPSh5md(LAMMPSReader):
@@ -584,6 +694,8 @@ class LAMMPSh5md(LAMMPSReader):
 
     def open_file(self, filename: str):
         self._file = h5py.File(filename, "r")
+        self._filename = filename
+        self._pid = os.getpid()
 
     def parse_first_step(self, aliases, config):
 
@@ -659,14 +771,11 @@ class LAMMPSh5md(LAMMPSReader):
 
         return chemicalSystem
 
-    def run_step(self, index):
-        """Runs a single step of the job.
-
-        @param index: the index of the step.
-        @type index: int.
-
-        @note: the argument index is the index of the loop note the index of the frame.
-        """
+    def read_step(self, index: int) -> Union[dict, None]:
+        if self._pid != os.getpid():
+            # HDF5 files must not be shared with a worker process
+            self._file = h5py.File(self._filename, "r")
+            self._pid = os.getpid()
 
         positions = self._file["/particles/all/position/value"][index]
         timestep = self._file["/particles/all/position/step"][index]
@@ -674,38 +783,16 @@ class LAMMPSh5md(LAMMPSReader):
         unitCell = UnitCell(self._full_cell)
         time = timestep * self._timestep * measure(1.0, self._time_unit).toval("ps")
 
-        if self._fractionalCoordinates:
-            conf = PeriodicBoxConfiguration(
-                self._trajectory.chemical_system, positions, unitCell
-            )
-            realConf = conf.to_real_configuration()
-        else:
-            positions *= measure(1.0, self._length_unit).toval("nm")
-            realConf = PeriodicRealConfiguration(
-                self._trajectory.chemical_system, positions, unitCell
-            )
-
-        if self._fold:
-            # The whole configuration is folded in to the simulation box.
-            realConf.fold_coordinates()
-
-        self._trajectory.chemical_system.configuration = realConf
-
-        # A snapshot is created out of the current configuration.
-        self._trajectory.dump_configuration(
-            time, units={"time": "ps", "unit_cell": "nm", "coordinates": "nm"}
-        )
+        charges = None
         if self._charges_fixed is None:
             try:
-                charge = self._file["/particles/all/charge/value"][index]
+                charges = self._file["/particles/all/charge/value"][index]
             except:
                 pass
             else:
-                self._trajectory.write_charges(
-                    charge * self._charge_conversion_factor, index
-                )
+                charges = charges * self._charge_conversion_factor
 
-        return index, 0
+        return self.make_frame(time, positions, unitCell, charges)
 
 
 class LAMMPS(Converter):
@@ -784,6 +871,20 @@ class LAMMPS(Converter):
             "label": "MDANSE trajectory (filename, format)",
         },
     )
+    settings["follow_timeout"] = (
+        "FloatConfigurator",
+        {
+            "label": "Wait for new frames of a running simulation (s, 0 to convert the file as it is)",
+            "default": 0.0,
+            "mini": 0.0,
+        },
+    )
+    settings["running_mode"] = ("RunningModeConfigurator", {})
+
+    supports_parallel_read = True
+
+    # the time between two checks for new frames in follow mode, in seconds
+    follow_poll_interval = 1.0
 
     def initialize(self):
         """
@@ -791,6 +892,8 @@ class LAMMPS(Converter):
         """
         super().initialize()
 
+        self._follow = self.configuration["follow_timeout"]["value"] > 0.0
+
         self._atomicAliases = self.configuration["atom_aliases"]["value"]
 
         # The number of steps of the analysis.
@@ -801,6 +904,11 @@ class LAMMPS(Converter):
         self._lammps_units = self.configuration["lammps_units"]["value"]
         self._lammps_format = self.configuration["trajectory_format"]["value"]
 
+        if self._follow and self._lammps_format == "h5md":
+            raise LAMMPSTrajectoryFileError(
+                "Only custom and xyz LAMMPS trajectories can be followed"
+            )
+
         self._reader = self.create_reader(self._lammps_format)
 
         self._reader.set_units(self._lammps_units)
@@ -810,6 +918,8 @@ class LAMMPS(Converter):
             self.numberOfSteps = self._reader.get_time_steps(
                 self.configuration["trajectory_file"]["value"]
             )
+            if self._follow:
+                self.numberOfSteps = max(1, self._reader.complete_frames())
 
         charges_single_cell = (
             np.array(self._lammpsConfig["charges"])
@@ -829,14 +939,11 @@ class LAMMPS(Converter):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
             initial_charges=charges,
+            swmr=self._follow,
         )
 
-        self._reader._nameToIndex = dict(
-            [(at.name, at.index) for at in self._trajectory.chemical_system.atom_list]
-        )
-
-        self._start = 0
         self._reader.open_file(self.configuration["trajectory_file"]["value"])
         self._reader.set_output(self._trajectory)
 
@@ -871,11 +978,70 @@ class LAMMPS(Converter):
         @note: the argument index is the index of the loop note the index of the frame.
         """
 
-        val1, val2 = self._reader.run_step(index)
+        return self._reader.run_step(index)
 
-        self._start = val2
+    def read_step(self, index: int) -> Union[dict, None]:
+        return self._reader.read_step(index)
+
+    def _run_follow(self):
+        """Converts the frames of a trajectory which is still being
+        written, until no frame has been added for follow_timeout seconds
+        or n_steps frames have been converted. The output trajectory is
+        written in SWMR mode and flushed whenever the converter waits for
+        new frames, so that it can be analysed while it grows.
+        """
+        timeout = self.configuration["follow_timeout"]["value"]
+        n_steps = self.configuration["n_steps"]["value"]
+        LOG.info(f"Following the trajectory for new frames, timeout {timeout} s")
+        index = 0
+        last_frame_time = time.monotonic()
+        while not n_steps or index < n_steps:
+            n_frames = self._reader.complete_frames()
+            if n_steps:
+                n_frames = min(n_frames, n_steps)
+            if index < n_frames:
+                if self._status is not None and not n_steps:
+                    # the progress is that of the frames written so far
+                    self._status.set_number_of_steps(n_frames)
+                for index in range(index, n_frames):
+                    if self._status is not None:
+                        if hasattr(self._status, "_pause_event"):
+                            self._status._pause_event.wait()
+                    idx, result = self.run_step(index)
+                    if self._status is not None:
+                        self._status.update()
+                    self.combine(idx, result)
+                index = n_frames
+                last_frame_time = time.monotonic()
+                continue
+            self._trajectory.flush()
+            idle_time = time.monotonic() - last_frame_time
+            if idle_time >= timeout:
+                break
+            time.sleep(min(self.follow_poll_interval, timeout - idle_time))
+        self.numberOfSteps = index
+        LOG.info(f"Converted {index} frames of the followed trajectory")
+
+    def _run_singlecore(self):
+        if self._follow:
+            self._run_follow()
+        else:
+            Converter._run_singlecore(self)
+
+    def _run_multicore(self):
+        if self._follow:
+            LOG.warning("A followed trajectory is converted on a single core")
+            self._run_follow()
+        else:
+            Converter._run_multicore(self)
+
+    _runner = dict(
+        Converter._runner,
+        **{"single-core": _run_singlecore, "multicore": _run_multicore},
+    )
 
-        return val1, None
+    def write_step(self, index: int, frame: Union[dict, None]) -> None:
+        self._reader.write_step(index, frame)
 
     def combine(self, index, x):
         """
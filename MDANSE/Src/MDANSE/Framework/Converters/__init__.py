@@ -13,29 +13,16 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
-import glob
-import importlib
-import os
+# The converters are registered as jobs by MDANSE.Framework.Jobs and
+# their modules are only imported when they are used.
 
-from MDANSE.MLogging import LOG
 
-current_path, _ = os.path.split(__file__)
+def __getattr__(name: str):
+    # "from MDANSE.Framework.Converters import <Name>" imports the converter
+    # module
+    from MDANSE.Framework.Jobs.IJob import IJob
 
-modnames = []
-fnames = glob.glob(current_path + "/*.py")
-for fname in fnames:
-    _, newname = os.path.split(fname)
-    newname = newname.split(".py")[0]
-    modnames.append(newname)
-globdict = globals()
-
-for name in modnames:
-    if name in ["__init__"]:
-        continue
-    try:
-        tempmod = importlib.import_module("." + name, "MDANSE.Framework.Converters")
-    except ModuleNotFoundError:
-        LOG.error(f"Could not find {name} in MDANSE.Framework.Converters")
-    tempobject = getattr(tempmod, name)
-    globdict[name] = tempobject
-    del tempmod  # optionally delete the reference to the parent module
+    entry = IJob.lazy_entries().get(name)
+    if entry is None or entry["module"] != f"{__name__}.{name}":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return IJob.load_subclass(name)
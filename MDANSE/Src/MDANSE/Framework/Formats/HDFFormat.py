@@ -64,6 +64,10 @@ class HDFFormat(IFormat):
         extension : str
             The extension of the file.
         """
+        from MDANSE.Framework.OutputVariables.IOutputVariable import (
+            OutputVariableDataset,
+        )
+
         string_dt = h5py.special_dtype(vlen=str)
 
         filename = os.path.splitext(filename)[0]
@@ -107,6 +111,12 @@ class HDFFormat(IFormat):
         for var in list(data.values()):
             varName = str(var.varname).strip().replace("/", "|")
 
+            if isinstance(var, OutputVariableDataset):
+                # the chunks are copied by HDF5 without reading the whole
+                # variable, and the attributes are copied with them
+                outputFile.copy(var.dataset, varName)
+                continue
+
             dset = outputFile.create_dataset(varName, data=var, shape=var.shape)
 
             # All the attributes stored in the OutputVariable instance are written to the HDF file.
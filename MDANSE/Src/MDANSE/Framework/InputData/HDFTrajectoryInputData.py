@@ -15,6 +15,8 @@
 #
 import json
 
+import numpy as np
+
 from MDANSE.Framework.InputData.IInputData import InputDataError
 from MDANSE.Framework.InputData.InputFileData import InputFileData
 from MDANSE.MolecularDynamics.Trajectory import Trajectory
@@ -44,17 +46,16 @@ class HDFTrajectoryInputData(InputFileData):
 
     def info(self):
         val = []
-        try:
-            time_axis = self._data.time()
-        except:
-            timeline = "No time information!\n"
-        else:
-            if len(time_axis) < 1:
-                timeline = "N/A\n"
-            elif len(time_axis) < 5:
-                timeline = f"{time_axis}\n"
+        summary = self._data.summary
+        if summary is not None and summary.get("time_step_is_regular", False):
+            # the time axis does not need to be read
+            first, step = summary["time_first"], summary["time_step"]
+            if summary["n_frames"] < 5:
+                timeline = f"{first + step * np.arange(summary['n_frames'])}\n"
             else:
-                timeline = f"[{time_axis[0]}, {time_axis[1]}, ..., {time_axis[-1]}]\n"
+                timeline = f"[{first}, {first + step}, ..., {summary['time_last']}]\n"
+        else:
+            timeline = self._read_timeline()
 
         val.append("Path:")
         val.append("%s\n" % self._name)
@@ -70,6 +71,19 @@ class HDFTrajectoryInputData(InputFileData):
             val.append("No unit cell information\n")
         val.append("Frame times (1st, 2nd, ..., last) in ps:")
         val.append(timeline)
+        if summary is not None:
+            if "volume_min" in summary:
+                val.append("Unit cell volume (min, mean, max) in nm^3:")
+                val.append(
+                    "{:.6g}, {:.6g}, {:.6g}\n".format(
+                        summary["volume_min"],
+                        summary["volume_mean"],
+                        summary["volume_max"],
+                    )
+                )
+            if "max_span" in summary:
+                val.append("Largest span of the coordinates (x, y, z) in nm:")
+                val.append(f"{summary['max_span']}\n")
         val.append("Variables:")
         for k in self._data.variables():
             v = self._data.variable(k)
@@ -100,6 +114,18 @@ class HDFTrajectoryInputData(InputFileData):
 
         return val
 
+    def _read_timeline(self) -> str:
+        try:
+            time_axis = self._data.time()
+        except:
+            return "No time information!\n"
+        if len(time_axis) < 1:
+            return "N/A\n"
+        elif len(time_axis) < 5:
+            return f"{time_axis}\n"
+        else:
+            return f"[{time_axis[0]}, {time_axis[1]}, ..., {time_axis[-1]}]\n"
+
     def check_metadata(self):
         meta_dict = {}
 
@@ -0,0 +1,197 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import hashlib
+import json
+import os
+from typing import Any, Callable, Sequence, Union
+
+import h5py
+import numpy as np
+
+from MDANSE import PLATFORM
+from MDANSE.Framework.ResultCache import evict_least_recently_used, file_fingerprint
+from MDANSE.MLogging import LOG
+
+
+def _hash_part(hasher, part: Any) -> None:
+    if isinstance(part, np.ndarray):
+        hasher.update(str((part.shape, part.dtype.str)).encode("utf-8"))
+        hasher.update(np.ascontiguousarray(part).tobytes())
+    elif isinstance(part, (list, tuple)):
+        hasher.update(f"[{len(part)}".encode("utf-8"))
+        for item in part:
+            _hash_part(hasher, item)
+    else:
+        hasher.update(json.dumps(part, sort_keys=True).encode("utf-8"))
+    hasher.update(b"\0")
+
+
+class IntermediateStore:
+    """Stores the quantities computed from the frames of a trajectory
+    which several jobs need, e.g. the Fourier components rho(q,t) of the
+    atomic densities, in HDF5 files of the MDANSE cache directory. A job
+    run on the same trajectory, frames and q vectors as an earlier job
+    then reads them instead of computing them again, so that e.g.
+    changing the weights or the instrument resolution only repeats the
+    correlations.
+
+    Every entry is a file of named arrays, found by a hash of the
+    fingerprint of the trajectory (see file_fingerprint), of the frames
+    and of the parts given by the job, e.g. the q vectors and the atom
+    indexes. Each entry is written to a temporary file which then
+    replaces the entry, so that the steps of a multicore job can write
+    their entries at the same time. The store is only an optimisation:
+    any error while reading or writing it is logged and otherwise
+    ignored.
+
+    Attributes
+    ----------
+    enabled : bool
+        Set to True to read and write the store. The store is disabled by
+        default. The intermediate_store option of IJob.run, e.g.
+        --intermediate-store on the command line of a job script, replaces
+        it for one job.
+    max_size : int
+        The largest size of the store, in bytes. The least recently used
+        entries are deleted by evict, which the jobs call once in their
+        finalize.
+    """
+
+    enabled = False
+
+    max_size = 2**34
+
+    def __init__(
+        self,
+        trajectory_filename: str,
+        frames: Sequence[int],
+        directory: str = None,
+        enabled: bool = None,
+    ):
+        """
+        Parameters
+        ----------
+        trajectory_filename : str
+            The path of the trajectory.
+        frames : Sequence[int]
+            The indexes of the frames of the trajectory used by the job.
+        directory : str, optional
+            The directory in which the entries are stored, by default the
+            intermediate directory of the MDANSE cache directory.
+        enabled : bool, optional
+            If False, the store is neither read nor written, by default
+            the enabled class attribute.
+        """
+        self._directory = directory
+        self._base_key = None
+        if enabled is None:
+            enabled = self.enabled
+        if not enabled:
+            return
+        if self._directory is None:
+            self._directory = os.path.join(PLATFORM.cache_directory(), "intermediate")
+        PLATFORM.create_directory(self._directory)
+        try:
+            fingerprint = file_fingerprint(trajectory_filename)
+        except OSError as e:
+            LOG.debug(f"The intermediate store is not used: {e}")
+            return
+        self._base_key = [fingerprint, np.asarray(frames, dtype=np.int64)]
+
+    def filename(self, category: str, parts: Sequence[Any]) -> str:
+        """
+        Parameters
+        ----------
+        category : str
+            The kind of quantity, e.g. "rho".
+        parts : Sequence[Any]
+            The arrays and JSON-serialisable values which define the entry
+            for the trajectory and frames of the store.
+
+        Returns
+        -------
+        str
+            The path of the file of the entry.
+        """
+        hasher = hashlib.sha256()
+        _hash_part(hasher, [category] + self._base_key + list(parts))
+        return os.path.join(self._directory, f"{category}_{hasher.hexdigest()}.h5")
+
+    def _read(self, filename: str) -> Union[dict[str, np.ndarray], None]:
+        try:
+            with h5py.File(filename, "r") as h5_file:
+                data = {name: dset[:] for name, dset in h5_file.items()}
+        except (OSError, KeyError) as e:
+            LOG.debug(f"Could not read {filename} from the intermediate store: {e}")
+            return None
+        # the modification time orders the entries for the eviction
+        os.utime(filename)
+        return data
+
+    def _write(self, filename: str, data: dict[str, np.ndarray]) -> None:
+        temporary = f"{filename}.{os.getpid()}.tmp"
+        try:
+            with h5py.File(temporary, "w") as h5_file:
+                for name, values in data.items():
+                    h5_file.create_dataset(name, data=values)
+            os.replace(temporary, filename)
+        except (OSError, ValueError) as e:
+            LOG.debug(f"Could not write {filename} to the intermediate store: {e}")
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def evict(self) -> None:
+        """Deletes the least recently used entries until the store is
+        not larger than max_size. It scans the whole store, so it is
+        called once per job rather than after every entry."""
+        if self._base_key is None:
+            return
+        evict_least_recently_used(self._directory, ".h5", self.max_size)
+
+    def get(
+        self,
+        category: str,
+        parts: Sequence[Any],
+        compute: Callable[[], dict[str, np.ndarray]],
+    ) -> dict[str, np.ndarray]:
+        """Returns an entry of the store, after computing and storing it
+        if it is missing.
+
+        Parameters
+        ----------
+        category : str
+            The kind of quantity, e.g. "rho".
+        parts : Sequence[Any]
+            The arrays and JSON-serialisable values which define the entry
+            for the trajectory and frames of the store.
+        compute : Callable[[], dict[str, np.ndarray]]
+            The function computing the arrays of the entry.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            The arrays of the entry, by name.
+        """
+        if self._base_key is None:
+            return compute()
+        filename = self.filename(category, parts)
+        if os.path.exists(filename):
+            data = self._read(filename)
+            if data is not None:
+                return data
+        data = compute()
+        self._write(filename, data)
+        return data
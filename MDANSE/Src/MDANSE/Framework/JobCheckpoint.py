@@ -0,0 +1,200 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import os
+import time
+from typing import Any, Union
+
+import h5py
+import numpy as np
+
+from MDANSE.Core.Error import Error
+from MDANSE.Framework.OutputVariables.IOutputVariable import OutputVariableDataset
+from MDANSE.MLogging import LOG
+
+
+class JobCheckpointError(Error):
+    pass
+
+
+def _write_value(group: h5py.Group, name: str, value: Any) -> None:
+    if isinstance(value, dict):
+        subgroup = group.create_group(name)
+        for key, item in value.items():
+            _write_value(subgroup, str(key), item)
+    else:
+        group.create_dataset(name, data=np.asarray(value))
+
+
+def _read_value(item: Union[h5py.Group, h5py.Dataset]) -> Any:
+    if isinstance(item, h5py.Group):
+        return {key: _read_value(sub_item) for key, sub_item in item.items()}
+    value = item[()]
+    return value.item() if np.ndim(value) == 0 else value
+
+
+class JobCheckpoint:
+    """The state of a job which has completed some of its steps, stored
+    in an HDF5 file so that a job which has been killed can be resumed
+    without running these steps again.
+
+    The state is the set of completed steps, the output variables and
+    the accumulators of the job which are not output variables. It is
+    written to a temporary file which then replaces the checkpoint, so
+    that a job killed while writing leaves the previous checkpoint.
+    """
+
+    def __init__(self, filename: str, job_name: str, n_steps: int, parameters: str):
+        """
+        Parameters
+        ----------
+        filename : str
+            The path of the checkpoint file.
+        job_name : str
+            The name of the job class.
+        n_steps : int
+            The number of steps of the job.
+        parameters : str
+            The parameters of the job, which must be the same when the
+            job is resumed.
+        """
+        self._filename = filename
+        self._job_name = job_name
+        self._parameters = parameters
+        self._done = np.zeros(n_steps, dtype=bool)
+        self._last_save = time.monotonic()
+
+    @property
+    def filename(self) -> str:
+        """The path of the checkpoint file."""
+        return self._filename
+
+    @property
+    def n_done(self) -> int:
+        """The number of completed steps."""
+        return int(self._done.sum())
+
+    def pending_steps(self) -> list[int]:
+        """
+        Returns
+        -------
+        list[int]
+            The indices of the steps which have not been completed.
+        """
+        return np.flatnonzero(~self._done).tolist()
+
+    def mark_done(self, index: int) -> None:
+        """Records that a step has been completed.
+
+        Parameters
+        ----------
+        index : int
+            The index of the step.
+        """
+        self._done[index] = True
+
+    def is_due(self, interval: float) -> bool:
+        """
+        Parameters
+        ----------
+        interval : float
+            The time between two checkpoints, in seconds.
+
+        Returns
+        -------
+        bool
+            True if the checkpoint was last saved more than interval
+            seconds ago.
+        """
+        return time.monotonic() - self._last_save >= interval
+
+    def save(self, output_data: dict[str, np.ndarray], attributes: dict[str, Any]):
+        """Writes the checkpoint.
+
+        Parameters
+        ----------
+        output_data : dict[str, np.ndarray]
+            The output variables of the job.
+        attributes : dict[str, Any]
+            The accumulators of the job which are not output variables:
+            arrays, numbers, or dictionaries of them.
+        """
+        temporary = self._filename + ".tmp"
+        with h5py.File(temporary, "w") as h5_file:
+            h5_file.attrs["job"] = self._job_name
+            h5_file.attrs["parameters"] = self._parameters
+            h5_file.create_dataset("done", data=self._done)
+            grp = h5_file.create_group("output_data")
+            for name, value in output_data.items():
+                if isinstance(value, OutputVariableDataset):
+                    # copied chunk by chunk rather than read in memory
+                    grp.copy(value.dataset, name)
+                else:
+                    grp.create_dataset(name, data=np.asarray(value))
+            grp = h5_file.create_group("attributes")
+            for name, value in attributes.items():
+                _write_value(grp, name, value)
+        os.replace(temporary, self._filename)
+        self._last_save = time.monotonic()
+        LOG.debug(
+            f"Checkpoint of {self._job_name} saved in {self._filename} "
+            f"after {self.n_done} of {len(self._done)} steps"
+        )
+
+    def load(self) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+        """Reads the checkpoint of an earlier run of the same job.
+
+        Returns
+        -------
+        tuple[dict[str, np.ndarray], dict[str, Any]]
+            The output variables and the accumulators, as passed to save.
+
+        Raises
+        ------
+        JobCheckpointError
+            If the checkpoint was written by another job, with other
+            parameters or for another number of steps.
+        """
+        with h5py.File(self._filename, "r") as h5_file:
+            if h5_file.attrs["job"] != self._job_name:
+                raise JobCheckpointError(
+                    f"{self._filename} is a checkpoint of {h5_file.attrs['job']}, "
+                    f"not of {self._job_name}"
+                )
+            if h5_file.attrs["parameters"] != self._parameters:
+                raise JobCheckpointError(
+                    f"{self._filename} was written by a job with other parameters"
+                )
+            done = h5_file["done"][:]
+            if len(done) != len(self._done):
+                raise JobCheckpointError(
+                    f"{self._filename} was written by a job of {len(done)} steps, "
+                    f"not {len(self._done)}"
+                )
+            output_data = {
+                name: dset[()] for name, dset in h5_file["output_data"].items()
+            }
+            attributes = {
+                name: _read_value(item) for name, item in h5_file["attributes"].items()
+            }
+        self._done = done
+        self._last_save = time.monotonic()
+        return output_data, attributes
+
+    def remove(self) -> None:
+        """Deletes the checkpoint once the job has been completed."""
+        for filename in (self._filename, self._filename + ".tmp"):
+            if os.path.exists(filename):
+                os.remove(filename)
@@ -0,0 +1,167 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import cProfile
+import glob
+import io
+import os
+import pstats
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from MDANSE import PLATFORM
+from MDANSE.MLogging import LOG
+
+
+class JobProfiler:
+    """Profiles the steps of a job with cProfile, in the main process for
+    a single-core run and in every worker process for a multicore run.
+
+    Every process writes the statistics of its steps and their durations
+    in the <root>.profile directory. They are then merged in <root>.pstats,
+    which can be read with pstats or snakeviz, and summarised in
+    <root>.profile.txt: the functions with the largest cumulative times
+    and a histogram of the durations of the steps.
+
+    Attributes
+    ----------
+    n_functions : int
+        The number of functions listed in the summary.
+    """
+
+    n_functions = 30
+
+    def __init__(self, root: str):
+        """
+        Parameters
+        ----------
+        root : str
+            The root of the names of the output files of the job.
+        """
+        self._root = root
+        self._directory = root + ".profile"
+        PLATFORM.create_directory(self._directory)
+        for filename in glob.glob(os.path.join(self._directory, "*")):
+            os.remove(filename)
+        self._profile = None
+        self._durations = []
+
+    @property
+    def summary_filename(self) -> str:
+        """The path of the summary of the profile."""
+        return self._root + ".profile.txt"
+
+    @property
+    def stats_filename(self) -> str:
+        """The path of the merged statistics of all the processes."""
+        return self._root + ".pstats"
+
+    def start_process(self) -> None:
+        """Starts the profile of the current process. It must be called by
+        every worker process, which otherwise inherits the profile of the
+        main process."""
+        self._profile = cProfile.Profile()
+        self._durations = []
+
+    def run_step(self, step: Callable[[int], Any], index: int) -> Any:
+        """Runs a step of the job under the profiler.
+
+        Parameters
+        ----------
+        step : Callable[[int], Any]
+            The function running the step, e.g. the run_step of the job.
+        index : int
+            The index of the step.
+
+        Returns
+        -------
+        Any
+            The result of the step.
+        """
+        start = time.perf_counter()
+        self._profile.enable()
+        try:
+            return step(index)
+        finally:
+            self._profile.disable()
+            self._durations.append(time.perf_counter() - start)
+
+    def save_process(self, name: str) -> None:
+        """Writes the statistics and the step durations of the current
+        process.
+
+        Parameters
+        ----------
+        name : str
+            The name of the process.
+        """
+        if not self._durations:
+            return
+        filename = os.path.join(self._directory, name)
+        self._profile.dump_stats(filename + ".pstats")
+        np.save(filename + ".steps.npy", np.array(self._durations))
+
+    def merge(self) -> str:
+        """Merges the statistics of all the processes and writes the
+        summary.
+
+        Returns
+        -------
+        str
+            The summary.
+        """
+        stats_files = sorted(glob.glob(os.path.join(self._directory, "*.pstats")))
+        if not stats_files:
+            LOG.warning("No step of the job was profiled")
+            return ""
+        durations = np.concatenate(
+            [
+                np.load(filename)
+                for filename in sorted(
+                    glob.glob(os.path.join(self._directory, "*.steps.npy"))
+                )
+            ]
+        )
+
+        output = io.StringIO()
+        stats = pstats.Stats(*stats_files, stream=output)
+        stats.dump_stats(self.stats_filename)
+        output.write(
+            f"Profile of {len(durations)} steps run by {len(stats_files)} "
+            f"process(es)\n\n"
+        )
+        stats.sort_stats("cumulative").print_stats(self.n_functions)
+
+        output.write("Duration of the steps (s)\n")
+        output.write(
+            f"  mean {durations.mean():.4g}  median {np.median(durations):.4g}  "
+            f"min {durations.min():.4g}  max {durations.max():.4g}\n"
+        )
+        counts, edges = np.histogram(durations, bins=min(10, len(durations)))
+        width = max(1, counts.max())
+        for count, low, high in zip(counts, edges[:-1], edges[1:]):
+            bar = "#" * int(round(40 * count / width))
+            output.write(f"  {low:10.4g} - {high:10.4g} {count:6d} {bar}\n")
+
+        summary = output.getvalue()
+        with open(self.summary_filename, "w") as summary_file:
+            summary_file.write(summary)
+        LOG.info(
+            f"Profile of the job written in {self.stats_filename} and "
+            f"{self.summary_filename}"
+        )
+        return summary
@@ -92,6 +92,7 @@ class CenterOfMassesTrajectory(IJob):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
         )
 
         self._grouped_atoms = group_atoms(
@@ -80,6 +80,7 @@ class CroppedTrajectory(IJob):
             self._selectedAtoms,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
             initial_charges=[
                 self.configuration["trajectory"]["instance"].charges(0)[ind]
                 for ind in indexes
@@ -44,6 +44,8 @@ class DensityProfile(IJob):
 
     ancestor = ["hdf_trajectory", "molecular_viewer"]
 
+    checkpoint_attributes = ("_extent",)
+
     settings = collections.OrderedDict()
     settings["trajectory"] = ("HDFTrajectoryConfigurator", {})
     settings["frames"] = (
@@ -21,7 +21,6 @@ import numpy as np
 
 from MDANSE.Extensions import van_hove
 from MDANSE.Framework.Jobs.IJob import IJob, JobError
-from MDANSE.MolecularDynamics.TrajectoryUtils import atom_index_to_molecule_index
 
 
 class DistanceHistogram(IJob):
@@ -38,6 +37,8 @@ class DistanceHistogram(IJob):
         "Structure",
     )
 
+    checkpoint_attributes = ("averageDensity", "hIntra", "hInter", "_concentrations")
+
     settings = collections.OrderedDict()
     settings["trajectory"] = ("HDFTrajectoryConfigurator", {})
     settings["frames"] = (
@@ -102,11 +103,10 @@ class DistanceHistogram(IJob):
             dtype=np.int32,
         )
 
-        lut = atom_index_to_molecule_index(
-            self.configuration["trajectory"]["instance"].chemical_system
-        )
+        trajectory = self.configuration["trajectory"]["instance"]
+        lut = trajectory.topology_cache.molecule_indexes(trajectory.chemical_system)
 
-        self.indexToMolecule = np.array([lut[i] for i in self._indexes], dtype=np.int32)
+        self.indexToMolecule = lut[self._indexes].astype(np.int32)
 
         nElements = len(self.selectedElements)
 
@@ -146,6 +146,23 @@ class DistanceHistogram(IJob):
             "Be careful adding the simulation box, as the wrong dimensions can render the results meaningless."
         )
 
+    def estimate_resources(self):
+        """Every step histograms the distances between all the pairs of
+        atoms of one frame.
+        """
+        n_atoms, n_frames = self._estimate_sizes()
+        n_total = self.configuration["trajectory"][
+            "instance"
+        ].chemical_system.number_of_atoms
+        n_elements = len(self.configuration["atom_selection"]["unique_names"])
+        n_r = len(self.configuration["r_values"]["mid_points"])
+        return self._resource_estimate(
+            memory=16 * n_elements**2 * n_r,
+            step_memory=16 * n_elements**2 * n_r + 48 * n_total,
+            bytes_read=24 * n_total * n_frames,
+            flops=10 * n_atoms**2 * n_frames,
+        )
+
     def run_step(self, index):
         """
         Runs a single step of the job.\n
@@ -21,7 +21,9 @@ import numpy as np
 from scipy.signal import correlate
 
 from MDANSE.Core.Error import Error
+from MDANSE.Framework.IntermediateStore import IntermediateStore
 from MDANSE.Framework.Jobs.IJob import IJob
+from MDANSE.Framework.OutputVariables.IOutputVariable import row_blocks
 from MDANSE.Mathematics.Arithmetic import weight
 from MDANSE.Mathematics.Signal import get_spectrum
 
@@ -147,6 +149,18 @@ class DynamicCoherentStructureFactor(IJob):
         )
         self._indexesPerElement = self.configuration["atom_selection"].get_indexes()
 
+        # rho(q,t) is shared with the other jobs run on the same frames,
+        # q vectors and elements
+        self._rhoElements = [
+            (element, np.array(idxs))
+            for element, idxs in sorted(self._indexesPerElement.items())
+        ]
+        self._intermediateStore = IntermediateStore(
+            self.configuration["trajectory"]["filename"],
+            self.configuration["frames"]["value"],
+            enabled=self._use_intermediate_store,
+        )
+
         for pair in self._elementsPairs:
             self._outputData.add(
                 "f(q,t)_%s%s" % pair,
@@ -154,6 +168,7 @@ class DynamicCoherentStructureFactor(IJob):
                 (nQShells, self._nFrames),
                 axis="q|time",
                 units="au",
+                out_of_core=True,
             )
             self._outputData.add(
                 "s(q,f)_%s%s" % pair,
@@ -163,6 +178,7 @@ class DynamicCoherentStructureFactor(IJob):
                 units="nm2/ps",
                 main_result=True,
                 partial_result=True,
+                out_of_core=True,
             )
 
         self._outputData.add(
@@ -171,6 +187,7 @@ class DynamicCoherentStructureFactor(IJob):
             (nQShells, self._nFrames),
             axis="q|time",
             units="au",
+            out_of_core=True,
         )
         self._outputData.add(
             "s(q,f)_total",
@@ -179,6 +196,37 @@ class DynamicCoherentStructureFactor(IJob):
             axis="q|omega",
             units="nm2/ps",
             main_result=True,
+            out_of_core=True,
+        )
+
+    def estimate_resources(self):
+        """Every step computes the rho(q,t) arrays of the elements, of
+        n_frames x n_q complex64 numbers each, from all the frames, and
+        correlates them for every pair of elements.
+        """
+        n_atoms, n_frames = self._estimate_sizes()
+        n_total = self.configuration["trajectory"][
+            "instance"
+        ].chemical_system.number_of_atoms
+        n_q = [
+            shell["q_vectors"].shape[1]
+            for shell in self.configuration["q_vectors"]["value"].values()
+        ]
+        n_elements = len(self.configuration["atom_selection"]["unique_names"])
+        n_pairs = n_elements * (n_elements + 1) // 2
+        n_times = self.configuration["frames"]["n_frames"]
+        n_configs = self.configuration["frames"]["n_configs"]
+        n_omegas = self.configuration["instrument_resolution"]["n_omegas"]
+        n_shells = self.configuration["q_vectors"]["n_shells"]
+        max_q = max(n_q, default=0)
+        return self._resource_estimate(
+            memory=8 * (n_pairs + 1) * n_shells * (n_times + n_omegas),
+            step_memory=8 * n_elements * n_frames * max_q + 16 * n_atoms * max_q,
+            bytes_read=24 * n_total * n_frames * len(n_q),
+            flops=sum(
+                50 * n_frames * n_atoms * q + 8 * n_pairs * n_times * n_configs * q
+                for q in n_q
+            ),
         )
 
     def run_step(self, index):
@@ -198,32 +246,46 @@ class DynamicCoherentStructureFactor(IJob):
             return index, None
 
         else:
-            traj = self.configuration["trajectory"]["instance"]
+            qVectors = self.configuration["q_vectors"]["value"][shell]["q_vectors"]
 
-            nQVectors = self.configuration["q_vectors"]["value"][shell][
-                "q_vectors"
-            ].shape[1]
+            rho = self._intermediateStore.get(
+                "rho",
+                [qVectors, self._rhoElements],
+                lambda: self._compute_rho(qVectors),
+            )
 
-            rho = {}
-            for element in self.configuration["atom_selection"]["unique_names"]:
-                rho[element] = np.zeros(
-                    (self.configuration["frames"]["number"], nQVectors),
-                    dtype=np.complex64,
-                )
+            return index, rho
 
-            # loop over the trajectory time steps
-            for i, frame in enumerate(self.configuration["frames"]["value"]):
-                qVectors = self.configuration["q_vectors"]["value"][shell]["q_vectors"]
+    def _compute_rho(self, qVectors):
+        """
+        Computes the Fourier components of the density of each element.\n
+        :Parameters:
+            #. qVectors (np.array): The q vectors of a shell.
+        :Returns:
+            #. rho (dict): The rho(q,t) array of each element.
+        """
+        traj = self.configuration["trajectory"]["instance"]
 
-                coords = traj.configuration(frame)["coordinates"]
+        nQVectors = qVectors.shape[1]
 
-                for element, idxs in self._indexesPerElement.items():
-                    selectedCoordinates = np.take(coords, idxs, axis=0)
-                    rho[element][i, :] = np.sum(
-                        np.exp(1j * np.dot(selectedCoordinates, qVectors)), axis=0
-                    )
+        rho = {}
+        for element in self.configuration["atom_selection"]["unique_names"]:
+            rho[element] = np.zeros(
+                (self.configuration["frames"]["number"], nQVectors),
+                dtype=np.complex64,
+            )
 
-            return index, rho
+        # loop over the trajectory time steps
+        for i, frame in enumerate(self.configuration["frames"]["value"]):
+            coords = traj.configuration(frame)["coordinates"]
+
+            for element, idxs in self._indexesPerElement.items():
+                selectedCoordinates = np.take(coords, idxs, axis=0)
+                rho[element][i, :] = np.sum(
+                    np.exp(1j * np.dot(selectedCoordinates, qVectors)), axis=0
+                )
+
+        return rho
 
     def combine(self, index, x):
         """
@@ -248,35 +310,38 @@ class DynamicCoherentStructureFactor(IJob):
         Finalizes the calculations (e.g. averaging the total term, output files creations ...)
         """
 
+        self._intermediateStore.evict()
+
         nAtomsPerElement = self.configuration["atom_selection"].get_natoms()
-        for pair in self._elementsPairs:
-            ni = nAtomsPerElement[pair[0]]
-            nj = nAtomsPerElement[pair[1]]
-            self._outputData["f(q,t)_%s%s" % pair][:] /= np.sqrt(ni * nj)
-            self._outputData["s(q,f)_%s%s" % pair][:] = get_spectrum(
-                self._outputData["f(q,t)_%s%s" % pair],
-                self.configuration["instrument_resolution"]["time_window"],
-                self.configuration["instrument_resolution"]["time_step"],
-                axis=1,
-            )
+        weights = self.configuration["weights"].get_weights()
+        # the variables may be stored out of core, so they are processed
+        # one block of q shells at a time
+        for rows in row_blocks(self._outputData["f(q,t)_total"]):
+            block = {}
+            for pair in self._elementsPairs:
+                ni = nAtomsPerElement[pair[0]]
+                nj = nAtomsPerElement[pair[1]]
+                f = self._outputData["f(q,t)_%s%s" % pair][rows] / np.sqrt(ni * nj)
+                block["f(q,t)_%s%s" % pair] = f
+                block["s(q,f)_%s%s" % pair] = get_spectrum(
+                    f,
+                    self.configuration["instrument_resolution"]["time_window"],
+                    self.configuration["instrument_resolution"]["time_step"],
+                    axis=1,
+                )
 
-        self._outputData["f(q,t)_total"][:] = weight(
-            self.configuration["weights"].get_weights(),
-            self._outputData,
-            nAtomsPerElement,
-            2,
-            "f(q,t)_%s%s",
-            update_partials=True,
-        )
+            for key in ("f(q,t)", "s(q,f)"):
+                self._outputData[key + "_total"][rows] = weight(
+                    weights,
+                    block,
+                    nAtomsPerElement,
+                    2,
+                    key + "_%s%s",
+                    update_partials=True,
+                )
 
-        self._outputData["s(q,f)_total"][:] = weight(
-            self.configuration["weights"].get_weights(),
-            self._outputData,
-            nAtomsPerElement,
-            2,
-            "s(q,f)_%s%s",
-            update_partials=True,
-        )
+            for name, values in block.items():
+                self._outputData[name][rows] = values
 
         self._outputData.write(
             self.configuration["output_files"]["root"],
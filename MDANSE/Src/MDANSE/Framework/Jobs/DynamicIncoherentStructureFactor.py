@@ -186,6 +186,27 @@ class DynamicIncoherentStructureFactor(IJob):
             main_result=True,
         )
 
+    def estimate_resources(self):
+        """Every step computes the phase series of one atom, of n_frames x
+        n_q complex numbers for all the q vectors, and correlates them.
+        """
+        n_atoms, n_frames = self._estimate_sizes()
+        n_q = sum(
+            shell["q_vectors"].shape[1]
+            for shell in self.configuration["q_vectors"]["value"].values()
+        )
+        n_elements = len(self.configuration["atom_selection"]["unique_names"])
+        n_times = self.configuration["frames"]["n_frames"]
+        n_configs = self.configuration["frames"]["n_configs"]
+        n_omegas = self.configuration["instrument_resolution"]["n_omegas"]
+        n_shells = self.configuration["q_vectors"]["n_shells"]
+        return self._resource_estimate(
+            memory=8 * (n_elements + 1) * n_shells * (n_times + n_omegas),
+            step_memory=16 * n_frames * n_q + 24 * n_frames,
+            bytes_read=24 * n_atoms * n_frames,
+            flops=n_atoms * (50 * n_frames * n_q + 8 * n_times * n_configs * n_q),
+        )
+
     def run_step(self, index):
         """
         Runs a single step of the job.\n
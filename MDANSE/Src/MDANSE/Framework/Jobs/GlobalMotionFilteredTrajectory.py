@@ -109,6 +109,7 @@ class GlobalMotionFilteredTrajectory(IJob):
             self._selected_atoms.atom_list,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
         )
 
         # This will store the configuration used as the reference for the following step.
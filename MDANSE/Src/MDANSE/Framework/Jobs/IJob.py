@@ -19,21 +19,42 @@ from logging.handlers import QueueHandler, QueueListener
 
 import abc
 import glob
+import json
 import os
 import multiprocessing
 import queue
 import random
+import shutil
 import stat
 import string
 import time
 import sys
 import traceback
 
+import h5py
+import numpy as np
+
 from MDANSE import PLATFORM
 from MDANSE.Core.Error import Error
 from MDANSE.Framework.Configurable import Configurable
+from MDANSE.Framework.JobCheckpoint import JobCheckpoint
+from MDANSE.Framework.JobProfiler import JobProfiler
+from MDANSE.Framework.MemoryMonitor import MemoryMonitor
+from MDANSE.Framework.ResourceEstimate import (
+    ResourceEstimate,
+    parse_bytes,
+    parse_duration,
+)
+from MDANSE.Framework.ResultCache import IGNORED_PARAMETERS, ResultCache
 from MDANSE.Framework.Jobs.JobStatus import JobStatus
 from MDANSE.Framework.OutputVariables.IOutputVariable import OutputData
+from MDANSE.Framework.Performance import (
+    PerformanceRecord,
+    phase,
+    set_current_record,
+    summary,
+    write_records,
+)
 from MDANSE.Core.SubclassFactory import SubclassFactory
 from MDANSE.MLogging import LOG, FMT
 
@@ -77,6 +98,62 @@ class JobError(Error):
         return self._message
 
 
+class RunOptionError(Error):
+    pass
+
+
+# the options of IJob.run which can be given on the command line of a job
+# script, with the function which converts their value
+RUN_OPTIONS = {
+    "result_cache": bool,
+    "intermediate_store": bool,
+    "max_memory": parse_bytes,
+    "max_wall_time": parse_duration,
+    "memory_budget": parse_bytes,
+}
+
+
+def parse_run_options(arguments, options=None, strict=False):
+    """
+    Reads the options of IJob.run from the command line of a job script,
+    e.g. --result-cache, --no-result-cache or --max-memory=4GiB. The
+    other arguments, e.g. --resume, are ignored unless strict is True.
+
+    :param arguments: the command line arguments
+    :type arguments: list of str
+
+    :param options: the options used when they are not on the command line
+    :type options: dict or None
+
+    :param strict: if True, the other arguments are refused
+    :type strict: bool
+
+    :return: the options
+    :rtype: dict
+    """
+    options = dict(options or {})
+    for argument in arguments:
+        flag, has_value, value = argument.partition("=")
+        name = flag[2:].replace("-", "_") if flag.startswith("--") else ""
+        if name.startswith("no_") and RUN_OPTIONS.get(name[3:]) is bool:
+            name, value = name[3:], False
+        elif RUN_OPTIONS.get(name) is bool:
+            value = True
+        elif name not in RUN_OPTIONS:
+            if strict:
+                raise RunOptionError(f"Unknown option of the run: {argument}")
+            continue
+        elif not has_value:
+            raise RunOptionError(f"{flag} needs a value, e.g. {flag}=<value>")
+        else:
+            try:
+                value = RUN_OPTIONS[name](value)
+            except ValueError as e:
+                raise RunOptionError(f"Invalid value of {flag}: {e}")
+        options[name] = value
+    return options
+
+
 def key_generator(keySize, chars=None, prefix=""):
     if chars is None:
         chars = string.ascii_lowercase + string.digits
@@ -97,6 +174,22 @@ class IJob(Configurable, metaclass=SubclassFactory):
 
     ancestor = []
 
+    # the time between two checkpoints of the completed steps, in seconds,
+    # or None for the jobs which cannot be resumed
+    checkpoint_interval = 600.0
+
+    # the attributes which accumulate the results of the steps outside of
+    # the output variables, and are stored in the checkpoints as well
+    checkpoint_attributes = ()
+
+    # False for the jobs whose results can differ between two runs with
+    # the same parameters, which are then not stored in the result cache
+    cacheable = True
+
+    # the floating point operations per atom and per frame assumed by the
+    # default estimate of the resources of the job
+    flops_per_atom_frame = 3000
+
     @staticmethod
     def define_unique_name():
         """
@@ -137,9 +230,20 @@ class IJob(Configurable, metaclass=SubclassFactory):
 
         self._log_filename = None
 
+        self._checkpoint = None
+
+        self._performance = {}
+
+        self._profiler = None
+
+        self._memory_monitor = None
+
+        self._use_intermediate_store = None
+
         self.inputQueue = Queue()
         self.outputQueue = Queue()
         self.log_queue = Queue()
+        self.performanceQueue = Queue()
 
     def __getstate__(self):
         d = self.__dict__.copy()
@@ -155,6 +259,7 @@ class IJob(Configurable, metaclass=SubclassFactory):
         return self._configuration
 
     def finalize(self):
+        self._outputData.close_store()
         if self._log_filename is not None:
             self.remove_log_file_handler()
 
@@ -171,6 +276,11 @@ class IJob(Configurable, metaclass=SubclassFactory):
         except KeyError:
             LOG.error("IJob did not find 'write_logs' in output_files")
 
+        output_files = self.configuration.get("output_files", None)
+        if output_files is not None and "formats" in output_files:
+            # the large output variables can be stored beside the output files
+            self._outputData.set_store(output_files["root"] + ".store.h5")
+
     @abc.abstractmethod
     def run_step(self, index):
         pass
@@ -184,13 +294,65 @@ class IJob(Configurable, metaclass=SubclassFactory):
             axes[unit] = axis
         return axes
 
+    def estimate_resources(self):
+        """Estimates the memory, the trajectory reads and the floating point
+        operations needed by the job, from its configuration and before it
+        is initialized. By default, the coordinates of the selected atoms
+        are read once in every frame, with flops_per_atom_frame operations
+        each. The jobs whose needs grow faster override this method.
+
+        :return: the estimate of the resources of the job
+        :rtype: MDANSE.Framework.ResourceEstimate.ResourceEstimate
+        """
+        n_atoms, n_frames = self._estimate_sizes()
+        return self._resource_estimate(
+            bytes_read=24 * n_atoms * n_frames,
+            flops=self.flops_per_atom_frame * n_atoms * n_frames,
+        )
+
+    def _estimate_sizes(self):
+        """Returns the number of selected atoms, or of atoms of the
+        trajectory, and the number of frames read by the job.
+
+        :return: the number of atoms and the number of frames
+        :rtype: tuple
+        """
+        configuration = self.configuration
+        if configuration.get("atom_selection"):
+            n_atoms = configuration["atom_selection"]["selection_length"]
+        elif configuration.get("trajectory"):
+            n_atoms = configuration["trajectory"][
+                "instance"
+            ].chemical_system.number_of_atoms
+        else:
+            n_atoms = 0
+        n_frames = configuration["frames"]["number"] if "frames" in configuration else 0
+        return n_atoms, n_frames
+
+    def _resource_estimate(self, **kwargs):
+        """Returns an estimate of the resources of the job for the number
+        of processes of its running mode.
+
+        :param kwargs: the memory, step_memory, bytes_read and flops of the job
+        :type kwargs: dict
+
+        :return: the estimate of the resources of the job
+        :rtype: MDANSE.Framework.ResourceEstimate.ResourceEstimate
+        """
+        slots = 1
+        running_mode = self.configuration.get("running_mode")
+        if running_mode and running_mode["mode"] == "multicore":
+            slots = running_mode["slots"]
+        return ResourceEstimate(slots=slots, **kwargs)
+
     @classmethod
-    def save(cls, jobFile, parameters=None):
+    def save(cls, jobFile, parameters=None, options=None):
         """
         Save a job file for a given job.\n
         :Parameters:
             #. jobFile (str): The name of the output job file.\n
-            #. parameters (dict): optional. If not None, the parameters with which the job file will be built.
+            #. parameters (dict): optional. If not None, the parameters with which the job file will be built.\n
+            #. options (dict): optional. The options of IJob.run with which the job file runs the job.
         """
 
         f = open(jobFile, "w")
@@ -205,7 +367,8 @@ class IJob(Configurable, metaclass=SubclassFactory):
         f.write("########################################################\n\n")
 
         # Write the import.
-        f.write("from MDANSE.Framework.Jobs.IJob import IJob\n\n")
+        f.write("import sys\n\n")
+        f.write("from MDANSE.Framework.Jobs.IJob import IJob, parse_run_options\n\n")
 
         f.write("########################################################\n")
         f.write("# Job parameters                                       #\n")
@@ -223,6 +386,20 @@ class IJob(Configurable, metaclass=SubclassFactory):
                 f.write(f"    {repr(k) + ': ' + repr(v) + ',':<50}\n")
         f.write("}\n")
 
+        # The options of the run, None for the default of MDANSE.
+        if options is None:
+            options = {}
+
+        f.write("\n")
+        f.write("# the options of the run, None for the default of MDANSE, which the\n")
+        f.write(
+            "# command line arguments of the script, e.g. --result-cache, replace\n"
+        )
+        f.write("options = {\n")
+        for k in RUN_OPTIONS:
+            f.write(f"    {k!r}: {options.get(k)!r},\n")
+        f.write("}\n")
+
         f.write("\n")
         f.write("########################################################\n")
         f.write("# Setup and run the analysis                           #\n")
@@ -231,7 +408,24 @@ class IJob(Configurable, metaclass=SubclassFactory):
 
         f.write('if __name__ == "__main__":\n')
         f.write("    %s = IJob.create(%r)\n" % (cls.__name__.lower(), cls.__name__))
-        f.write("    %s.run(parameters, status=True)\n" % (cls.__name__.lower()))
+        f.write(
+            "    # run the script with --resume to skip the steps of a stopped run,\n"
+            "    # with --profile to profile the steps and with --estimate to print\n"
+            "    # the memory and time needed by the job without running it\n"
+        )
+        f.write(
+            '    if "--estimate" in sys.argv:\n'
+            "        %(name)s.setup(parameters)\n"
+            "        print(%(name)s.estimate_resources())\n"
+            "    else:\n"
+            "        %(name)s.run(\n"
+            "            parameters,\n"
+            "            status=True,\n"
+            '            resume="--resume" in sys.argv,\n'
+            '            profile="--profile" in sys.argv,\n'
+            "            **parse_run_options(sys.argv[1:], options),\n"
+            "        )\n" % {"name": cls.__name__.lower()}
+        )
 
         f.close()
 
@@ -244,19 +438,236 @@ class IJob(Configurable, metaclass=SubclassFactory):
             else:
                 self._status.update()
 
+    def checkpoint_filename(self):
+        """Returns the name of the checkpoint file of the job, which is
+        written beside its output files.
+
+        :return: the checkpoint filename, or None if the job cannot be resumed
+        :rtype: str or None
+        """
+        if self.checkpoint_interval is None:
+            return None
+        output_files = self.configuration.get("output_files", None)
+        # the trajectories written by converters and trajectory jobs
+        # cannot be resumed
+        if output_files is None or "formats" not in output_files:
+            return None
+        return output_files["root"] + ".checkpoint.h5"
+
+    def _setup_checkpoint(self, resume):
+        """Creates the checkpoint of the job and, if the job is resumed,
+        restores the results of the steps completed by an earlier run.
+
+        :param resume: if True, the steps stored in the checkpoint are skipped
+        :type resume: bool
+        """
+        self._checkpoint = None
+        filename = self.checkpoint_filename()
+        if filename is None:
+            if resume:
+                LOG.warning(f"{self.__class__.__name__} cannot be resumed")
+            return
+
+        parameters = self.output_configuration()
+        # a job can be resumed with a different number of processes
+        parameters.pop("running_mode", None)
+        self._checkpoint = JobCheckpoint(
+            filename,
+            self.__class__.__name__,
+            self.numberOfSteps,
+            json.dumps(parameters, sort_keys=True),
+        )
+        if not resume:
+            return
+        if not os.path.exists(filename):
+            LOG.warning(f"No checkpoint {filename}, the job starts from the beginning")
+            return
+
+        output_data, attributes = self._checkpoint.load()
+        for name, value in output_data.items():
+            self._outputData[name][...] = value
+        for name, value in attributes.items():
+            current = getattr(self, name, None)
+            if isinstance(current, np.ndarray):
+                current[...] = value
+            else:
+                setattr(self, name, value)
+        LOG.info(
+            f"Resuming from {filename}: {self._checkpoint.n_done} of "
+            f"{self.numberOfSteps} steps already completed"
+        )
+
+    def _result_cache_key(self):
+        """Returns the key of the results of the job in the result cache.
+
+        :return: the key, or None if the results of the job are not cached
+        :rtype: str or None
+        """
+        if not self.cacheable:
+            return None
+        output_files = self.configuration.get("output_files", None)
+        formats = [] if output_files is None else output_files.get("formats", [])
+        # the cache only stores .mda files
+        if list(formats) != ["MDAFormat"]:
+            return None
+        return ResultCache.key(self)
+
+    def _copy_cached_results(self, key):
+        """Copies the results of an earlier run of the job from the result
+        cache to the output file of the job.
+
+        :param key: the key of the results of the job
+        :type key: str
+
+        :return: True if the results were found in the cache
+        :rtype: bool
+        """
+        cached = ResultCache().lookup(key, self)
+        if cached is None:
+            return False
+        output_file = self.configuration["output_files"]["files"][0]
+        shutil.copyfile(cached, output_file)
+        self._update_cached_metadata(output_file, cached)
+        LOG.info(f"The results of {self._name} were copied from {cached}")
+        return True
+
+    def _update_cached_metadata(self, output_file, cached):
+        """Replaces the metadata of the earlier run in a copy of its
+        results: the parameters which do not change the results, e.g. the
+        output files, are those of this job, and the performance and the
+        memory of the earlier run are removed.
+
+        :param output_file: the copy of the cached results
+        :type output_file: str
+
+        :param cached: the file of the result cache which was copied
+        :type cached: str
+        """
+        inputs = self.output_configuration()
+        string_dt = h5py.special_dtype(vlen=str)
+        with h5py.File(output_file, "a") as h5_file:
+            meta = h5_file.require_group("metadata")
+            for name in ("performance", "memory"):
+                if name in meta:
+                    del meta[name]
+            meta.attrs["result_cache"] = cached
+            if "inputs" not in meta or inputs is None:
+                return
+            for name in IGNORED_PARAMETERS:
+                if name not in inputs:
+                    continue
+                if name in meta["inputs"]:
+                    del meta["inputs"][name]
+                meta["inputs"].create_dataset(
+                    name, (1,), data=inputs[name], dtype=string_dt
+                )
+
+    def _pending_steps(self):
+        """Returns the indices of the steps which remain to be run.
+
+        :return: the indices of the steps
+        :rtype: list of int
+        """
+        if self._checkpoint is None:
+            return list(range(self.numberOfSteps))
+        return self._checkpoint.pending_steps()
+
+    def _step_done(self, index):
+        """Records the completion of a step, and writes the checkpoint
+        if the last one is older than checkpoint_interval.
+
+        :param index: the index of the step
+        :type index: int
+        """
+        if self._checkpoint is None:
+            return
+        self._checkpoint.mark_done(index)
+        if self._checkpoint.is_due(self.checkpoint_interval):
+            self._checkpoint.save(
+                self._outputData,
+                {name: getattr(self, name) for name in self.checkpoint_attributes},
+            )
+
+    def _run_step(self, step, index):
+        """Runs a step of the job, under the profiler if the job is
+        profiled.
+
+        :param step: the function running the step
+        :type step: callable
+
+        :param index: the index of the step
+        :type index: int
+
+        :return: the result of the step
+        """
+        with phase("run_step"):
+            if self._profiler is None:
+                return step(index)
+            return self._profiler.run_step(step, index)
+
+    def _sample_memory(self, active_workers=None, force=False):
+        """Samples the resident memory of the main process and of the
+        worker processes, reports it in the status of the job and, if the
+        job exceeds MemoryMonitor.memory_budget, lowers the number of
+        active workers.
+
+        :param active_workers: the number of workers allowed to take new
+            steps, shared with the workers of a multicore run
+        :type active_workers: multiprocessing.Value or None
+
+        :param force: if True, the processes are sampled whatever the time
+            of the last sample
+        :type force: bool
+        """
+        pids = {"main": os.getpid()}
+        for p in getattr(self, "_processes", []):
+            if p.pid is not None:
+                pids[p.name] = p.pid
+        if not self._memory_monitor.sample(pids, force=force):
+            return
+        if active_workers is not None:
+            n_running = sum(p.is_alive() for p in self._processes)
+            with active_workers.get_lock():
+                active_workers.value = self._memory_monitor.reduce_workers(
+                    active_workers.value, n_running
+                )
+        if self._status is not None:
+            self._status.update_memory(self._memory_monitor.state())
+
     def _run_singlecore(self):
         LOG.info(f"Single-core run: expects {self.numberOfSteps} steps")
-        for index in range(self.numberOfSteps):
+        if self._profiler is not None:
+            self._profiler.start_process()
+        self._sample_memory(force=True)
+        for index in self._pending_steps():
             if self._status is not None:
                 if hasattr(self._status, "_pause_event"):
                     self._status._pause_event.wait()
-            idx, result = self.run_step(index)
+            idx, result = self._run_step(self.run_step, index)
             if self._status is not None:
                 self._status.update()
-            self.combine(idx, result)
+            with phase("combine"):
+                self.combine(idx, result)
+            self._step_done(index)
+            self._sample_memory()
+        self._sample_memory(force=True)
+        if self._profiler is not None:
+            self._profiler.save_process("main")
         LOG.info("Single-core job completed all the steps")
 
-    def process_tasks_queue(self, tasks, outputs, log_queues):
+    def process_tasks_queue(
+        self, tasks, outputs, log_queues, step=None, worker=0, active_workers=None
+    ):
+
+        if step is None:
+            step = self.run_step
+
+        # the record and the profile of the main process were inherited
+        # by the fork
+        record = PerformanceRecord()
+        set_current_record(record)
+        if self._profiler is not None:
+            self._profiler.start_process()
 
         queue_handlers = []
         for log_queue in log_queues:
@@ -265,25 +676,46 @@ class IJob(Configurable, metaclass=SubclassFactory):
             LOG.addHandler(queue_handler)
 
         while True:
-            try:
-                index = tasks.get_nowait()
-            except queue.Empty:
-                if tasks.empty():
-                    self.configuration["trajectory"]["instance"].close()
-                    break
+            # each worker gets a None once all the indexes have been taken,
+            # and the workers above the number of active workers stop
+            # before taking a new index
+            if active_workers is not None and worker >= active_workers.value:
+                index = None
             else:
-                if self._status is not None:
-                    if hasattr(self._status, "_pause_event"):
-                        self._status._pause_event.wait()
-                output = self.run_step(index)
-                outputs.put(output)
+                index = tasks.get()
+            if index is None:
+                if "trajectory" in self.configuration:
+                    self.configuration["trajectory"]["instance"].close()
+                name = multiprocessing.current_process().name
+                self.performanceQueue.put((name, record.to_dict()))
+                if self._profiler is not None:
+                    self._profiler.save_process(name)
+                break
+            if self._status is not None:
+                if hasattr(self._status, "_pause_event"):
+                    self._status._pause_event.wait()
+            output = self._run_step(step, index)
+            outputs.put(output)
 
         for queue_handler in queue_handlers:
             LOG.removeHandler(queue_handler)
 
         return True
 
-    def _run_multicore(self):
+    def _run_multicore(self, step=None, collect=None):
+        """Runs the steps of the job in a pool of worker processes.
+
+        :param step: the function run by the workers for each index, which
+            returns an (index, result) tuple. run_step by default.
+        :type step: callable or None
+
+        :param collect: the function called in the main process with each
+            index and result, in the order the steps end. combine by default.
+        :type collect: callable or None
+        """
+        if collect is None:
+            collect = self.combine
+
         if hasattr(self._status, "_queue_0"):
             self._status._queue_0.put("started")
 
@@ -304,32 +736,42 @@ class IJob(Configurable, metaclass=SubclassFactory):
 
         self._processes = []
 
-        for i in range(self.numberOfSteps):
+        n_slots = self.configuration["running_mode"]["slots"]
+        active_workers = multiprocessing.Value("i", n_slots)
+        pending_steps = self._pending_steps()
+        for i in pending_steps:
             inputQueue.put(i)
+        for i in range(n_slots):
+            inputQueue.put(None)
 
-        for i in range(self.configuration["running_mode"]["slots"]):
+        for i in range(n_slots):
             self._run_multicore_check_terminate(listener)
             p = multiprocessing.Process(
                 target=self.process_tasks_queue,
-                args=(inputQueue, outputQueue, log_queues),
+                args=(inputQueue, outputQueue, log_queues, step, i, active_workers),
             )
             self._processes.append(p)
             p.daemon = False
             p.start()
 
         n_results = 0
-        while n_results != self.numberOfSteps:
+        while n_results != len(pending_steps):
             self._run_multicore_check_terminate(listener)
-            if self._status is not None:
-                self._status.fixed_status(n_results)
+            self._sample_memory(active_workers)
             try:
-                index, result = outputQueue.get_nowait()
+                index, result = outputQueue.get(timeout=0.1)
             except queue.Empty:
-                time.sleep(0.1)
                 continue
             else:
                 n_results += 1
-                self.combine(index, result)
+                if self._status is not None:
+                    self._status.update()
+                with phase("combine"):
+                    collect(index, result)
+                self._step_done(index)
+
+        self._sample_memory(force=True)
+        self._collect_worker_records()
 
         for p in self._processes:
             p.join()
@@ -341,6 +783,20 @@ class IJob(Configurable, metaclass=SubclassFactory):
 
         listener.stop()
 
+    def _collect_worker_records(self):
+        """Receives the performance records sent by the worker processes
+        when they have run out of steps."""
+        n_records = 0
+        while n_records < len(self._processes):
+            try:
+                name, record = self.performanceQueue.get(timeout=0.1)
+            except queue.Empty:
+                if not any(p.is_alive() for p in self._processes):
+                    break
+                continue
+            n_records += 1
+            self._performance[name] = record
+
     def _run_multicore_check_terminate(self, listener) -> None:
         """Check if a terminate job was added to the queue. If it was
         added we need to terminate and join all child processes.
@@ -369,6 +825,65 @@ class IJob(Configurable, metaclass=SubclassFactory):
                 while True:
                     time.sleep(10)
 
+    def _create_profiler(self):
+        """Creates the profiler of the steps of the job, which writes its
+        files next to the output files.
+
+        :return: the profiler, or None if the job has no output file
+        :rtype: JobProfiler or None
+        """
+        output_files = self.configuration.get("output_files", None)
+        if output_files is None or "root" not in output_files:
+            LOG.warning(f"{self.__class__.__name__} cannot be profiled")
+            return None
+        return JobProfiler(output_files["root"])
+
+    def output_filenames(self):
+        """Returns the names of the files written by the job.
+
+        :return: the output filenames
+        :rtype: list of str
+        """
+        output_files = self.configuration.get("output_files", None)
+        if output_files is None:
+            return []
+        if "files" in output_files:
+            return list(output_files["files"])
+        if "file" in output_files:
+            return [output_files["file"]]
+        return []
+
+    @property
+    def performance(self):
+        """Returns the time spent in the phases of the last run of the job
+        and in reading its trajectory, by process: "main" and, for a
+        multicore run, the name of each worker process.
+
+        :return: the performance records, see PerformanceRecord.to_dict
+        :rtype: dict
+        """
+        return self._performance
+
+    def _write_performance(self):
+        """Writes the performance records and the peak memory of the
+        processes in the log and in the metadata/performance and
+        metadata/memory groups of the HDF5 output files."""
+        LOG.info(f"Performance of {self._name}:\n{summary(self._performance)}")
+        LOG.info(
+            f"Peak resident memory of {self._name}: "
+            f"{self._memory_monitor.peak_total / 2**20:.1f} MiB"
+        )
+        for filename in self.output_filenames():
+            if not (os.path.exists(filename) and h5py.is_hdf5(filename)):
+                continue
+            try:
+                with h5py.File(filename, "a") as output_file:
+                    meta = output_file.require_group("metadata")
+                    write_records(meta, self._performance)
+                    self._memory_monitor.write(meta)
+            except OSError as e:
+                LOG.warning(f"Could not write the performance of the job: {e}")
+
     def _run_remote(self):
         raise NotImplementedError(
             "Currently there is no replacement for the old Pyro remote runs."
@@ -380,9 +895,56 @@ class IJob(Configurable, metaclass=SubclassFactory):
         "remote": _run_remote,
     }
 
-    def run(self, parameters, status=False):
+    def run(
+        self,
+        parameters,
+        status=False,
+        resume=False,
+        profile=False,
+        result_cache=None,
+        intermediate_store=None,
+        max_memory=None,
+        max_wall_time=None,
+        memory_budget=None,
+    ):
         """
         Run the job.
+
+        :param parameters: the parameters of the job
+        :type parameters: dict
+
+        :param status: if True, the progress of the job is reported
+        :type status: bool
+
+        :param resume: if True, the steps completed by an earlier run of
+            the same job, which was stopped before the end, are skipped
+        :type resume: bool
+
+        :param profile: if True, the steps are profiled as if profiling
+            was enabled in the running mode
+        :type profile: bool
+
+        :param result_cache: if True, the results are read from and stored
+            in the result cache, by default if ResultCache.enabled is True
+        :type result_cache: bool or None
+
+        :param intermediate_store: if True, the quantities which several
+            jobs need, e.g. rho(q,t), are read from and stored in the
+            intermediate store, by default if IntermediateStore.enabled is True
+        :type intermediate_store: bool or None
+
+        :param max_memory: if not None, the job is refused if it needs more
+            memory, in bytes, by default ResourceEstimate.max_memory
+        :type max_memory: int or None
+
+        :param max_wall_time: if not None, the job is refused if it needs
+            more time, in seconds, by default ResourceEstimate.max_wall_time
+        :type max_wall_time: float or None
+
+        :param memory_budget: if not None, the memory, in bytes, above which
+            a multicore job stops some of its workers, by default
+            MemoryMonitor.memory_budget
+        :type memory_budget: int or None
         """
 
         try:
@@ -391,9 +953,34 @@ class IJob(Configurable, metaclass=SubclassFactory):
             if status and self._status is None:
                 self._status = self._status_constructor(self)
 
+            record = PerformanceRecord()
+            set_current_record(record)
+            self._performance = {}
+
+            self._use_intermediate_store = intermediate_store
+
             self.setup(parameters)
 
-            self.initialize()
+            if result_cache is None:
+                result_cache = ResultCache.enabled
+            cache_key = self._result_cache_key() if result_cache else None
+            if cache_key is not None and self._copy_cached_results(cache_key):
+                if self._status is not None:
+                    self._status.start(1)
+                    self._status.update()
+                    self._status.finish()
+                return
+
+            estimate = self.estimate_resources()
+            if max_memory is not None:
+                estimate.max_memory = max_memory
+            if max_wall_time is not None:
+                estimate.max_wall_time = max_wall_time
+            LOG.info(f"Estimated resources of {self._name}: {estimate}")
+            estimate.check()
+
+            with phase("initialize"):
+                self.initialize()
 
             if self._status is not None:
                 self._status.start(self.numberOfSteps)
@@ -402,14 +989,45 @@ class IJob(Configurable, metaclass=SubclassFactory):
             if getattr(self, "numberOfSteps", 0) <= 0:
                 raise JobError(self, "Invalid number of steps for job %s" % self._name)
 
+            self._setup_checkpoint(resume)
+            if self._status is not None and self._checkpoint is not None:
+                # the steps of the earlier run count in the progress
+                self._status.skip(self._checkpoint.n_done)
+
             if "running_mode" in self.configuration:
                 mode = self.configuration["running_mode"]["mode"]
+                profile = profile or self.configuration["running_mode"]["profile"]
             else:
                 mode = "single-core"
 
-            IJob._runner[mode](self)
+            self._memory_monitor = MemoryMonitor()
+            if memory_budget is not None:
+                self._memory_monitor.memory_budget = memory_budget
+
+            self._profiler = None
+            if profile:
+                self._profiler = self._create_profiler()
+
+            self._runner[mode](self)
+
+            if self._profiler is not None:
+                self._profiler.merge()
+
+            with phase("finalize"):
+                self.finalize()
 
-            self.finalize()
+            self._performance = dict(
+                main=record.to_dict(), **dict(sorted(self._performance.items()))
+            )
+            self._write_performance()
+
+            if self._checkpoint is not None:
+                self._checkpoint.remove()
+
+            if cache_key is not None:
+                ResultCache().store(
+                    cache_key, self.configuration["output_files"]["files"][0]
+                )
 
             if self._status is not None:
                 self._status.finish()
@@ -417,6 +1035,8 @@ class IJob(Configurable, metaclass=SubclassFactory):
             tb = traceback.format_exc()
             LOG.critical(f"Job failed with traceback: {tb}")
             raise JobError(self, tb)
+        finally:
+            set_current_record(None)
 
     @property
     def info(self):
@@ -22,6 +22,7 @@ import time
 
 from MDANSE import PLATFORM
 from MDANSE.Framework.Status import Status
+from MDANSE.MLogging import LOG
 
 
 class JobState(collections.OrderedDict):
@@ -29,8 +30,12 @@ class JobState(collections.OrderedDict):
 
 
 class JobStatus(Status):
+    # the minimum time between two progress messages in the log, in seconds
+    log_interval = 10.0
+
     def __init__(self, job):
         Status.__init__(self)
+        self._last_log = time.time()
 
         self._state = JobState()
         self._state["pid"] = PLATFORM.pid()
@@ -40,11 +45,16 @@ class JobStatus(Status):
         self._state["current_step"] = 0
         self._state["n_steps"] = 0
         self._state["progress"] = 0
+        self._state["throughput"] = None
+        self._state["eta"] = None
         self._state["state"] = "running"
         self._state["name"] = job.name
         self._state["traceback"] = ""
         self._state["temporary_file"] = None
         self._state["info"] = ""
+        self._state["memory"] = {}
+        self._state["memory_total"] = 0
+        self._state["peak_memory_total"] = 0
 
         self.save_status()
 
@@ -76,8 +86,19 @@ class JobStatus(Status):
             self._state["progress"] = 100 * self.currentStep / self.nSteps
         else:
             self._state["progress"] = 0
+        self._state["throughput"] = self.throughput
+        self._state["eta"] = self.eta
+
+        if time.time() - self._last_log >= self.log_interval:
+            self._last_log = time.time()
+            LOG.info(f"{self._state['type']}: {self.progress_text()}")
 
         self.save_status()
 
-    def fixed_status(self, current_progress: int):
-        pass
+    def memory_status(self):
+        self._state.update(self.memory)
+        self.save_status()
+
+    def steps_status(self):
+        self._state["n_steps"] = self.nSteps
+        self.save_status()
@@ -66,6 +66,12 @@ class McStasVirtualInstrument(IJob):
 
     ancestor = ["hdf_trajectory", "molecular_viewer"]
 
+    # the steps write the McStas input files, they cannot be resumed
+    checkpoint_interval = None
+
+    # the McStas simulation is a Monte Carlo simulation
+    cacheable = False
+
     settings = collections.OrderedDict()
     settings["trajectory"] = ("HDFTrajectoryConfigurator", {})
     settings["frames"] = (
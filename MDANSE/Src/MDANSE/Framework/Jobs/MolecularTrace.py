@@ -45,6 +45,8 @@ class MolecularTrace(IJob):
 
     ancestor = ["hdf_trajectory", "molecular_viewer"]
 
+    checkpoint_attributes = ("grid",)
+
     settings = collections.OrderedDict()
     settings["trajectory"] = ("HDFTrajectoryConfigurator", {})
     settings["frames"] = (
@@ -103,6 +103,7 @@ class MoleculeFinder(IJob):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
             initial_charges=self.configuration["trajectory"]["instance"].charges(0),
         )
 
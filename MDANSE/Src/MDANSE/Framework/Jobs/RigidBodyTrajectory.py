@@ -154,6 +154,7 @@ class RigidBodyTrajectory(IJob):
             selectedAtoms,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
         )
 
         self._group_atoms = [group.atom_list for group in self._groups]
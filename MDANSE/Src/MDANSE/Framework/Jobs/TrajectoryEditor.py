@@ -123,6 +123,7 @@ class TrajectoryEditor(IJob):
             self.numberOfSteps,
             positions_dtype=self.configuration["output_files"]["dtype"],
             compression=self.configuration["output_files"]["compression"],
+            precision=self.configuration["output_files"]["precision"],
         )
 
     def run_step(self, index):
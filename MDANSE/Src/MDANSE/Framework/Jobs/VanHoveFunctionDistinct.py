@@ -20,7 +20,6 @@ import numpy as np
 
 from MDANSE.Extensions import van_hove
 from MDANSE.Framework.Jobs.IJob import IJob, JobError
-from MDANSE.MolecularDynamics.TrajectoryUtils import atom_index_to_molecule_index
 from MDANSE.Mathematics.Arithmetic import weight
 
 
@@ -47,6 +46,8 @@ class VanHoveFunctionDistinct(IJob):
         "Dynamics",
     )
 
+    checkpoint_attributes = ("h_intra", "h_inter")
+
     settings = collections.OrderedDict()
     settings["trajectory"] = ("HDFTrajectoryConfigurator", {})
     settings["frames"] = (
@@ -167,16 +168,15 @@ class VanHoveFunctionDistinct(IJob):
                 units="au",
             )
 
-        lut = atom_index_to_molecule_index(
-            self.configuration["trajectory"]["instance"].chemical_system
-        )
+        trajectory = self.configuration["trajectory"]["instance"]
+        lut = trajectory.topology_cache.molecule_indexes(trajectory.chemical_system)
         self._indexes = [
             idx
             for idxs in self.configuration["atom_selection"]["indexes"]
             for idx in idxs
         ]
         self._indexes = np.array(self._indexes, dtype=np.int32)
-        self.indexToMolecule = np.array([lut[i] for i in self._indexes], dtype=np.int32)
+        self.indexToMolecule = lut[self._indexes].astype(np.int32)
         self.indexToSymbol = np.array(
             [
                 self.selectedElements.index(name)
@@ -208,6 +208,26 @@ class VanHoveFunctionDistinct(IJob):
             (self.nElements, self.nElements, self.n_mid_points, self.numberOfSteps)
         )
 
+    def estimate_resources(self):
+        """Every step histograms the distances between all the pairs of
+        atoms of two frames, for n_configs pairs of frames.
+        """
+        n_atoms, _ = self._estimate_sizes()
+        n_total = self.configuration["trajectory"][
+            "instance"
+        ].chemical_system.number_of_atoms
+        n_elements = len(self.configuration["atom_selection"]["unique_names"])
+        n_pairs = n_elements * (n_elements + 1) // 2
+        n_r = len(self.configuration["r_values"]["mid_points"])
+        n_times = self.configuration["frames"]["n_frames"]
+        n_configs = self.configuration["frames"]["n_configs"]
+        return self._resource_estimate(
+            memory=8 * (2 * n_elements**2 + 3 * n_pairs + 3) * n_r * n_times,
+            step_memory=32 * n_elements**2 * n_r + 48 * n_total,
+            bytes_read=48 * n_total * n_times * n_configs,
+            flops=7 * n_atoms**2 * n_times * n_configs,
+        )
+
     def run_step(self, time: int) -> tuple[int, tuple[np.ndarray, np.ndarray]]:
         """Calculates the distance histogram between the configurations
         at the inputted time difference. The distance histograms are
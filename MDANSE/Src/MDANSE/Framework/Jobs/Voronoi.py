@@ -58,6 +58,9 @@ class Voronoi(IJob):
 
     ancestor = ["hdf_trajectory", "molecular_viewer"]
 
+    # the steps accumulate their results in the job, they cannot be resumed
+    checkpoint_interval = None
+
     settings = collections.OrderedDict()
     settings["trajectory"] = ("HDFTrajectoryConfigurator", {})
     settings["frames"] = (
@@ -13,32 +13,21 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
-import glob
-import importlib
-import os
+from MDANSE.Core.ClassManifest import load_manifest
+from MDANSE.Framework.Jobs.IJob import IJob
 
-from MDANSE.MLogging import LOG
+# The jobs and converters are registered from a static scan of their
+# modules, which are only imported when a job is created. This keeps
+# the import of MDANSE.Framework.Jobs (and the startup of the command
+# line interface) from importing every dependency of every job.
+IJob.register_lazy_subclasses(
+    load_manifest("IJob", ["MDANSE.Framework.Jobs", "MDANSE.Framework.Converters"])
+)
 
-current_path, _ = os.path.split(__file__)
 
-modnames = []
-fnames = glob.glob(current_path + "/*.py")
-for fname in fnames:
-    _, newname = os.path.split(fname)
-    newname = newname.split(".py")[0]
-    modnames.append(newname)
-globdict = globals()
-
-for name in modnames:
-    if name in ["__init__"]:
-        continue
-    try:
-        tempmod = importlib.import_module("." + name, "MDANSE.Framework.Jobs")
-    except ModuleNotFoundError:
-        LOG.error(f"Could not find {name} in MDANSE.Framework.Jobs")
-    tempobject = getattr(tempmod, name)
-    globdict[name] = tempobject
-    del tempmod  # optionally delete the reference to the parent module
-
-# now to ensure that jobs in other places get registered
-import MDANSE.Framework.Converters
+def __getattr__(name: str):
+    # "from MDANSE.Framework.Jobs import <JobName>" imports the job module
+    entry = IJob.lazy_entries().get(name)
+    if entry is None or entry["module"] != f"{__name__}.{name}":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return IJob.load_subclass(name)
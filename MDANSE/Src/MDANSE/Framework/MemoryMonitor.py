@@ -0,0 +1,208 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import time
+from typing import Optional
+
+import h5py
+
+from MDANSE.MLogging import LOG
+
+
+def process_rss(pid: int) -> Optional[int]:
+    """
+    Parameters
+    ----------
+    pid : int
+        The id of a process.
+
+    Returns
+    -------
+    Optional[int]
+        The resident memory of the process in bytes, read from
+        /proc/<pid>/status, or None if it cannot be read, e.g. if the
+        process has ended or the platform has no /proc file system.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class MemoryMonitor:
+    """Samples the resident memory (RSS) of the processes of a job: the
+    main process and, in a multicore run, every worker process.
+
+    The samples are taken at most once every interval seconds, so that
+    the monitor can be called in every iteration of the loop of a job.
+    The pages shared by the main process and the forked workers count in
+    the RSS of each of them, so that the total is an upper bound of the
+    memory of the job.
+
+    If memory_budget is set, the monitor asks for one worker less every
+    time the total RSS of the job exceeds high_water times the budget,
+    once the worker stopped before has exited: a worker only stops at the
+    end of its current step and its memory counts until then.
+
+    Attributes
+    ----------
+    interval : float
+        The minimum time between two samples, in seconds.
+    memory_budget : int or None
+        The memory, in bytes, that a multicore job should not exceed. If
+        None, the number of workers is never reduced. The memory_budget
+        option of IJob.run, e.g. --memory-budget=8GiB on the command line
+        of a job script, replaces it for one job.
+    high_water : float
+        The fraction of memory_budget above which a worker is stopped.
+    """
+
+    interval = 1.0
+    memory_budget = None
+    high_water = 0.9
+
+    def __init__(self):
+        self._last_sample = None
+        self._current = {}
+        self._peak = {}
+        self._peak_total = 0
+        self.workers_stopped = 0
+
+    @property
+    def current(self) -> dict[str, int]:
+        """The RSS of the processes at the last sample, in bytes, by
+        process name."""
+        return dict(self._current)
+
+    @property
+    def peak(self) -> dict[str, int]:
+        """The largest RSS of every process, in bytes, by process name."""
+        return dict(self._peak)
+
+    @property
+    def total(self) -> int:
+        """The total RSS of the processes at the last sample, in bytes."""
+        return sum(self._current.values())
+
+    @property
+    def peak_total(self) -> int:
+        """The largest total RSS of the processes, in bytes."""
+        return self._peak_total
+
+    def sample(self, pids: dict[str, int], force: bool = False) -> bool:
+        """Reads the RSS of the processes, unless the last sample is more
+        recent than interval.
+
+        Parameters
+        ----------
+        pids : dict[str, int]
+            The ids of the processes, by process name.
+        force : bool
+            If True, the processes are sampled whatever the time of the
+            last sample.
+
+        Returns
+        -------
+        bool
+            True if the processes were sampled.
+        """
+        now = time.monotonic()
+        if (
+            not force
+            and self._last_sample is not None
+            and now - self._last_sample < self.interval
+        ):
+            return False
+        self._last_sample = now
+        self._current = {}
+        for name, pid in pids.items():
+            rss = process_rss(pid)
+            if rss is None:
+                continue
+            self._current[name] = rss
+            self._peak[name] = max(rss, self._peak.get(name, 0))
+        self._peak_total = max(self._peak_total, self.total)
+        return True
+
+    def reduce_workers(self, n_active: int, n_running: int) -> int:
+        """Returns the number of workers which should run after the last
+        sample, lower than n_active if the job approaches memory_budget.
+
+        Parameters
+        ----------
+        n_active : int
+            The number of workers allowed to run.
+        n_running : int
+            The number of worker processes still alive, more than n_active
+            while a stopped worker finishes its step.
+
+        Returns
+        -------
+        int
+            The number of workers which should run, at least 1.
+        """
+        if self.memory_budget is None or n_active <= 1 or n_running > n_active:
+            return n_active
+        if self.total <= self.high_water * self.memory_budget:
+            return n_active
+        self.workers_stopped += 1
+        LOG.warning(
+            f"The job uses {self.total / 2**20:.1f} MiB of its memory budget of "
+            f"{self.memory_budget / 2**20:.1f} MiB: the number of workers is "
+            f"reduced to {n_active - 1}"
+        )
+        return n_active - 1
+
+    def state(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            The current and peak RSS, in bytes, for the status of a job.
+        """
+        return {
+            "memory": self.current,
+            "memory_total": self.total,
+            "peak_memory": self.peak,
+            "peak_memory_total": self.peak_total,
+            "workers_stopped": self.workers_stopped,
+        }
+
+    def write(self, h5_group: h5py.Group) -> h5py.Group:
+        """Writes the peak RSS of the processes in a "memory" HDF5 group,
+        as attributes in bytes.
+
+        Parameters
+        ----------
+        h5_group : h5py.Group
+            The group in which the memory group is created.
+
+        Returns
+        -------
+        h5py.Group
+            The memory group.
+        """
+        if "memory" in h5_group:
+            del h5_group["memory"]
+        memory = h5_group.create_group("memory")
+        memory.attrs["peak_total"] = self.peak_total
+        memory.attrs["workers_stopped"] = self.workers_stopped
+        for name, rss in self._peak.items():
+            memory.attrs[name] = rss
+        return memory
@@ -15,10 +15,13 @@
 #
 
 import collections
+import os
 
+import h5py
 import numpy as np
 
 from MDANSE.Framework.Formats.IFormat import IFormat
+from MDANSE.Framework.Performance import phase
 from MDANSE.Core.Error import Error
 
 from MDANSE.Core.SubclassFactory import SubclassFactory
@@ -28,18 +31,108 @@ class OutputVariableError(Error):
     pass
 
 
+def row_blocks(variable, max_block_size=2**26):
+    """Splits the first axis of an output variable into blocks of rows,
+    so that a variable which does not fit in memory can be processed
+    one block at a time.
+
+    :param variable: the output variable, in memory or out of core
+    :type variable: IOutputVariable or OutputVariableDataset
+
+    :param max_block_size: the largest number of bytes of a block
+    :type max_block_size: int
+
+    :return: the slices of the rows of each block
+    :rtype: generator of slice
+    """
+    n_rows = variable.shape[0]
+    row_size = 8 * int(np.prod(variable.shape[1:]))
+    n_block_rows = max(1, max_block_size // max(1, row_size))
+    for first in range(0, n_rows, n_block_rows):
+        yield slice(first, min(n_rows, first + n_block_rows))
+
+
 class OutputData(collections.OrderedDict):
-    def add(self, dataName, dataType, data, **kwargs):
-        collections.OrderedDict.__setitem__(
-            self,
-            dataName,
-            IOutputVariable.create(dataType, data, dataName, **kwargs),
-        )
+    """The output variables of a job.
+
+    The variables added with out_of_core=True whose size is larger than
+    out_of_core_threshold are stored in the datasets of a temporary HDF5
+    file, the store, rather than in memory, if a store has been set with
+    set_store. The steps of the job then write their results directly to
+    the file, and the output formats copy them from it.
+    """
+
+    # the size in bytes above which a variable added with out_of_core=True
+    # is stored in the HDF5 store
+    out_of_core_threshold = 2**28
+
+    # the HDF5 compression filter of the variables stored out of core
+    out_of_core_compression = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._store_filename = None
+        self._store = None
+
+    def set_store(self, filename):
+        """Sets the HDF5 file in which the variables are stored out of
+        core. The file is only created when the first such variable is
+        added.
+
+        :param filename: the path of the store
+        :type filename: str
+        """
+        self._store_filename = filename
+
+    def close_store(self):
+        """Closes and deletes the HDF5 store, once the output variables
+        have been written."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+            os.remove(self._store_filename)
+
+    def add(self, dataName, dataType, data, out_of_core=False, **kwargs):
+        """Adds an output variable.
+
+        :param dataName: the name of the variable
+        :type dataName: str
+
+        :param dataType: the type of the variable, e.g. "LineOutputVariable"
+        :type dataType: str
+
+        :param data: the values, or the shape of a variable of zeros
+        :type data: array-like or tuple
+
+        :param out_of_core: if True, a variable given by its shape is stored
+            in the HDF5 store if it is larger than out_of_core_threshold
+        :type out_of_core: bool
+        """
+        if (
+            out_of_core
+            and self._store_filename is not None
+            and isinstance(data, tuple)
+            and 8 * np.prod(data) > self.out_of_core_threshold
+        ):
+            if self._store is None:
+                self._store = h5py.File(self._store_filename, "w")
+            variable = OutputVariableDataset(
+                self._store,
+                dataName,
+                dataType,
+                data,
+                compression=self.out_of_core_compression,
+                **kwargs,
+            )
+        else:
+            variable = IOutputVariable.create(dataType, data, dataName, **kwargs)
+        collections.OrderedDict.__setitem__(self, dataName, variable)
 
     def write(self, basename, formats, header=None, inputs=None):
         for fmt in formats:
             temp_format = IFormat.create(fmt)
-            temp_format.write(basename, self, header, inputs)
+            with phase("write"):
+                temp_format.write(basename, self, header, inputs)
 
 
 class IOutputVariable(np.ndarray, metaclass=SubclassFactory):
@@ -128,3 +221,160 @@ class IOutputVariable(np.ndarray, metaclass=SubclassFactory):
         info = "\n".join(info)
 
         return info
+
+
+class OutputVariableDataset:
+    """An output variable stored in a chunked HDF5 dataset instead of
+    memory. It can be indexed like an IOutputVariable, and the in-place
+    arithmetic operators process it one block of rows at a time. Any
+    other use, e.g. np.asarray, reads the whole variable.
+    """
+
+    # the size in bytes of the chunks of the dataset
+    chunk_size = 2**20
+
+    def __init__(
+        self,
+        store,
+        varname,
+        dataType,
+        shape,
+        axis="index",
+        units="unitless",
+        main_result=False,
+        partial_result=False,
+        compression=None,
+    ):
+        """
+        Create the dataset of an output variable, filled with zeros.
+
+        @param store: the HDF5 file of the out-of-core variables.
+        @type store: h5py.File
+
+        @param varname: the name of the output variable.
+        @type varname: string
+
+        @param dataType: the type of IOutputVariable which would hold the variable in memory.
+        @type dataType: string
+
+        @param shape: the shape of the variable.
+        @type shape: tuple
+
+        @param compression: the HDF5 compression filter, or None.
+        @type compression: string
+        """
+
+        variable_class = IOutputVariable.indirect_subclass_dictionary()[dataType]
+        if len(shape) != variable_class._nDimensions:
+            raise OutputVariableError(
+                "Invalid number of dimensions for an output variable of type %r"
+                % dataType
+            )
+
+        # the chunks hold whole rows, which is how the jobs write them
+        row_size = 8 * int(np.prod(shape[1:]))
+        chunk_rows = max(1, min(shape[0], self.chunk_size // max(1, row_size)))
+
+        self._dataset = store.create_dataset(
+            str(varname).strip().replace("/", "|"),
+            shape=shape,
+            dtype=np.float64,
+            chunks=(chunk_rows,) + tuple(shape[1:]),
+            compression=compression,
+            fillvalue=0.0,
+        )
+
+        data_tags = []
+        if main_result:
+            data_tags.append("main")
+        if partial_result:
+            data_tags.append("partial")
+
+        self._dataset.attrs["varname"] = varname
+        self._dataset.attrs["units"] = units
+        self._dataset.attrs["axis"] = axis
+        self._dataset.attrs["tags"] = ",".join(data_tags)
+
+    @property
+    def dataset(self):
+        return self._dataset
+
+    @property
+    def varname(self):
+        return self._dataset.attrs["varname"]
+
+    @property
+    def units(self):
+        return self._dataset.attrs["units"]
+
+    @property
+    def axis(self):
+        return self._dataset.attrs["axis"]
+
+    @property
+    def tags(self):
+        return self._dataset.attrs["tags"]
+
+    @property
+    def shape(self):
+        return self._dataset.shape
+
+    @property
+    def ndim(self):
+        return self._dataset.ndim
+
+    @property
+    def size(self):
+        return self._dataset.size
+
+    @property
+    def dtype(self):
+        return self._dataset.dtype
+
+    def __len__(self):
+        return len(self._dataset)
+
+    def __getitem__(self, key):
+        return self._dataset[key]
+
+    def __setitem__(self, key, value):
+        self._dataset[key] = value
+
+    def __array__(self, dtype=None, copy=None):
+        values = self._dataset[()]
+        if dtype is not None:
+            values = values.astype(dtype)
+        return values
+
+    def _apply(self, operation, other):
+        # the operand is either broadcast to every block, or has a row per row
+        split = np.ndim(other) == self.ndim and np.shape(other)[0] == self.shape[0] > 1
+        for rows in row_blocks(self):
+            block = self._dataset[rows]
+            operation(block, other[rows] if split else other, out=block)
+            self._dataset[rows] = block
+        return self
+
+    def __iadd__(self, other):
+        return self._apply(np.add, other)
+
+    def __isub__(self, other):
+        return self._apply(np.subtract, other)
+
+    def __imul__(self, other):
+        return self._apply(np.multiply, other)
+
+    def __itruediv__(self, other):
+        return self._apply(np.true_divide, other)
+
+    def info(self):
+        info = []
+
+        info.append("# variable name: %s" % self.varname)
+        info.append("# \ttype: %s" % self.__class__.__name__)
+        info.append("# \taxis: %s" % str(self.axis))
+        info.append("# \tunits: %s" % self.units)
+
+        info = "\n".join(info)
+
+        return info
@@ -0,0 +1,270 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import contextlib
+import functools
+import time
+from typing import Any, Callable, Iterator, Union
+
+import h5py
+import numpy as np
+
+# the columns of the arrays of the phases written in the output files
+PHASE_COLUMNS = ("wall_time", "cpu_time", "calls", "read_time")
+
+_current_record = None
+
+
+def _payload_size(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_payload_size(item) for item in value.values())
+    variables = getattr(value, "variables", None)
+    if isinstance(variables, dict):
+        return _payload_size(variables)
+    return 0
+
+
+class PerformanceRecord:
+    """The time spent by a process in the phases of a job (initialize,
+    run_step, combine, finalize, write ...) and in reading trajectories.
+
+    For every phase, the wall time, the CPU time of the process, the
+    number of calls and the part of the wall time spent in the trajectory
+    readers are accumulated. The frames and bytes returned by the
+    trajectory readers are counted as well.
+    """
+
+    def __init__(self):
+        self._phases = {}
+        self._read_time = 0.0
+        self._frames_read = 0
+        self._bytes_read = 0
+        self._reading = False
+
+    @property
+    def read_time(self) -> float:
+        """The wall time spent in the trajectory readers, in seconds."""
+        return self._read_time
+
+    @property
+    def frames_read(self) -> int:
+        """The number of frames returned by the trajectory readers."""
+        return self._frames_read
+
+    @property
+    def bytes_read(self) -> int:
+        """The size of the arrays returned by the trajectory readers."""
+        return self._bytes_read
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measures the time of a phase of the job.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase, e.g. "run_step".
+        """
+        wall, cpu, read = time.perf_counter(), time.process_time(), self._read_time
+        try:
+            yield
+        finally:
+            entry = self._phases.setdefault(name, [0.0, 0.0, 0, 0.0])
+            entry[0] += time.perf_counter() - wall
+            entry[1] += time.process_time() - cpu
+            entry[2] += 1
+            entry[3] += self._read_time - read
+
+    def add_read(self, duration: float, n_frames: int, n_bytes: int) -> None:
+        """Records a read of a trajectory.
+
+        Parameters
+        ----------
+        duration : float
+            The wall time of the read, in seconds.
+        n_frames : int
+            The number of frames read.
+        n_bytes : int
+            The number of bytes read.
+        """
+        self._read_time += duration
+        self._frames_read += n_frames
+        self._bytes_read += n_bytes
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns
+        -------
+        dict[str, Any]
+            The record as a JSON-serialisable dictionary.
+        """
+        return {
+            "phases": {
+                name: dict(zip(PHASE_COLUMNS, entry))
+                for name, entry in self._phases.items()
+            },
+            "read_time": self._read_time,
+            "frames_read": self._frames_read,
+            "bytes_read": self._bytes_read,
+        }
+
+
+def current_record() -> Union[PerformanceRecord, None]:
+    """
+    Returns
+    -------
+    PerformanceRecord or None
+        The record of the job run by this process, if any.
+    """
+    return _current_record
+
+
+def set_current_record(record: Union[PerformanceRecord, None]) -> None:
+    """Sets the record in which the phases and the trajectory reads of
+    this process are accumulated.
+
+    Parameters
+    ----------
+    record : PerformanceRecord or None
+        The record of the job run by this process, or None to stop
+        recording.
+    """
+    global _current_record
+    _current_record = record
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Measures the time of a phase in the current record, if any.
+
+    Parameters
+    ----------
+    name : str
+        The name of the phase.
+    """
+    if _current_record is None:
+        yield
+    else:
+        with _current_record.phase(name):
+            yield
+
+
+def recorded_read(single_frame: bool) -> Callable:
+    """Decorates a method of a trajectory reader so that its time and the
+    size of what it returns are added to the current record. The reads
+    made by a recorded method, e.g. read_com_trajectory calling
+    read_atomic_trajectory, are only counted once.
+
+    Parameters
+    ----------
+    single_frame : bool
+        True if the method reads one frame, False if it returns an array
+        of the frames of a range.
+
+    Returns
+    -------
+    Callable
+        The decorator.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            record = _current_record
+            if record is None or record._reading:
+                return method(*args, **kwargs)
+            record._reading = True
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                record._reading = False
+            n_frames = 1 if single_frame else len(result)
+            record.add_read(
+                time.perf_counter() - start, n_frames, _payload_size(result)
+            )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def write_records(
+    h5_group: h5py.Group, records: dict[str, dict[str, Any]]
+) -> h5py.Group:
+    """Writes the records of the processes of a job in a "performance"
+    HDF5 group. Every process has a group, with the frames and bytes read
+    as attributes and an array of PHASE_COLUMNS for every phase.
+
+    Parameters
+    ----------
+    h5_group : h5py.Group
+        The group in which the performance group is created.
+    records : dict[str, dict[str, Any]]
+        The records of the processes (see PerformanceRecord.to_dict), by
+        process name.
+
+    Returns
+    -------
+    h5py.Group
+        The performance group.
+    """
+    if "performance" in h5_group:
+        del h5_group["performance"]
+    performance = h5_group.create_group("performance")
+    performance.attrs["columns"] = list(PHASE_COLUMNS)
+    for process, record in records.items():
+        grp = performance.create_group(process)
+        for key in ("read_time", "frames_read", "bytes_read"):
+            grp.attrs[key] = record[key]
+        for name, entry in record["phases"].items():
+            grp.create_dataset(name, data=[entry[c] for c in PHASE_COLUMNS])
+    return performance
+
+
+def summary(records: dict[str, dict[str, Any]]) -> str:
+    """
+    Parameters
+    ----------
+    records : dict[str, dict[str, Any]]
+        The records of the processes of a job, by process name.
+
+    Returns
+    -------
+    str
+        A table of the times of the phases and of the trajectory reads
+        of every process, for the log.
+    """
+    lines = [
+        f"{'process':<12}{'phase':<14}{'calls':>8}{'wall (s)':>12}"
+        f"{'cpu (s)':>12}{'read (s)':>12}"
+    ]
+    for process, record in records.items():
+        for name, entry in record["phases"].items():
+            lines.append(
+                f"{process:<12}{name:<14}{entry['calls']:>8d}"
+                f"{entry['wall_time']:>12.3f}{entry['cpu_time']:>12.3f}"
+                f"{entry['read_time']:>12.3f}"
+            )
+        if record["frames_read"]:
+            lines.append(
+                f"{process:<12}read {record['frames_read']} frames, "
+                f"{record['bytes_read'] / 2**20:.1f} MiB "
+                f"in {record['read_time']:.3f} s"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,248 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import string
+from typing import Union
+
+from MDANSE.Core.Error import Error
+
+BYTE_UNITS = {"B": 1, "KiB": 2**10, "MiB": 2**20, "GiB": 2**30, "TiB": 2**40}
+
+TIME_UNITS = {"s": 1, "min": 60, "h": 3600, "d": 86400}
+
+
+class ResourceLimitError(Error):
+    pass
+
+
+def format_bytes(n_bytes: float) -> str:
+    """
+    Parameters
+    ----------
+    n_bytes : float
+        A number of bytes.
+
+    Returns
+    -------
+    str
+        The number of bytes in the largest binary unit smaller than it.
+    """
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(n_bytes) < 1024:
+            return f"{n_bytes:.1f} {unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:.1f} TiB"
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Parameters
+    ----------
+    seconds : float
+        A duration in seconds.
+
+    Returns
+    -------
+    str
+        The duration in seconds, minutes, hours or days.
+    """
+    for unit, size in (("d", 86400), ("h", 3600), ("min", 60)):
+        if seconds >= size:
+            return f"{seconds / size:.1f} {unit}"
+    return f"{seconds:.1f} s"
+
+
+def _parse_quantity(text: str, units: dict[str, float]) -> float:
+    text = text.strip()
+    number = text.rstrip(string.ascii_letters)
+    unit = text[len(number) :]
+    if unit and unit not in units:
+        raise ValueError(
+            f"unknown unit {unit!r} in {text!r}, expected one of {', '.join(units)}"
+        )
+    value = float(number) * units.get(unit, 1)
+    if value < 0:
+        raise ValueError(f"{text!r} is negative")
+    return value
+
+
+def parse_bytes(text: str) -> int:
+    """
+    Parameters
+    ----------
+    text : str
+        A number of bytes, e.g. 4GiB or 512 MiB, in bytes if it has no unit.
+
+    Returns
+    -------
+    int
+        The number of bytes.
+
+    Raises
+    ------
+    ValueError
+        If the text is not a number of bytes.
+    """
+    return int(_parse_quantity(text, BYTE_UNITS))
+
+
+def parse_duration(text: str) -> float:
+    """
+    Parameters
+    ----------
+    text : str
+        A duration, e.g. 2h or 30 min, in seconds if it has no unit.
+
+    Returns
+    -------
+    float
+        The duration in seconds.
+
+    Raises
+    ------
+    ValueError
+        If the text is not a duration.
+    """
+    return _parse_quantity(text, TIME_UNITS)
+
+
+class ResourceEstimate:
+    """The memory, trajectory reads and floating point operations that a
+    job is expected to need, computed from its configuration before it is
+    initialized (see IJob.estimate_resources).
+
+    The memory of a job is split in the memory of the main process (the
+    output variables and the results combined) and the memory of one step
+    (the arrays of a run_step call), which is needed in every worker
+    process of a multicore run.
+
+    Attributes
+    ----------
+    process_memory : int
+        The memory of a process before any job data are allocated.
+    flops_per_second : float
+        The floating point operations per second of one process.
+    read_bytes_per_second : float
+        The bytes per second read from a trajectory by one process.
+    max_memory : int or None
+        If not None, the jobs which need more memory, in bytes, are refused.
+    max_wall_time : float or None
+        If not None, the jobs which need more time, in seconds, are refused.
+
+    The max_memory and max_wall_time options of IJob.run, e.g.
+    --max-memory=4GiB on the command line of a job script, replace the
+    limits for one job.
+
+    The rates were calibrated with Tests/Benchmarks/benchmark_jobs.py,
+    which reports the estimates next to the measured times and memory.
+    """
+
+    process_memory = 160 * 2**20
+    flops_per_second = 5e8
+    read_bytes_per_second = 5e7
+    max_memory = None
+    max_wall_time = None
+
+    def __init__(
+        self,
+        memory: float = 0,
+        step_memory: float = 0,
+        bytes_read: float = 0,
+        flops: float = 0,
+        slots: int = 1,
+    ):
+        """
+        Parameters
+        ----------
+        memory : float
+            The memory needed by the main process, in bytes.
+        step_memory : float
+            The memory needed to run one step, in bytes.
+        bytes_read : float
+            The number of bytes read from the trajectory.
+        flops : float
+            The number of floating point operations of the job.
+        slots : int
+            The number of worker processes, 1 for a single-core run.
+        """
+        self.memory = memory
+        self.step_memory = step_memory
+        self.bytes_read = bytes_read
+        self.flops = flops
+        self.slots = slots
+
+    @property
+    def peak_memory(self) -> float:
+        """The memory needed by all the processes of the job, in bytes."""
+        workers = self.slots if self.slots > 1 else 0
+        return (
+            self.process_memory
+            + self.memory
+            + self.step_memory
+            + workers * (self.process_memory + self.step_memory)
+        )
+
+    @property
+    def wall_time(self) -> float:
+        """The approximate wall time of the job, in seconds."""
+        return (
+            self.flops / self.flops_per_second
+            + self.bytes_read / self.read_bytes_per_second
+        ) / self.slots
+
+    def check(self) -> None:
+        """Refuses the jobs which exceed max_memory or max_wall_time.
+
+        Raises
+        ------
+        ResourceLimitError
+            If the job exceeds one of the limits.
+        """
+        if self.max_memory is not None and self.peak_memory > self.max_memory:
+            raise ResourceLimitError(
+                f"The job needs about {format_bytes(self.peak_memory)} of memory, "
+                f"more than the limit of {format_bytes(self.max_memory)}"
+            )
+        if self.max_wall_time is not None and self.wall_time > self.max_wall_time:
+            raise ResourceLimitError(
+                f"The job needs about {format_duration(self.wall_time)}, "
+                f"more than the limit of {format_duration(self.max_wall_time)}"
+            )
+
+    def to_dict(self) -> dict[str, Union[float, int]]:
+        """
+        Returns
+        -------
+        dict[str, Union[float, int]]
+            The estimate as a JSON-serialisable dictionary.
+        """
+        return {
+            "peak_memory": self.peak_memory,
+            "memory": self.memory,
+            "step_memory": self.step_memory,
+            "bytes_read": self.bytes_read,
+            "flops": self.flops,
+            "slots": self.slots,
+            "wall_time": self.wall_time,
+        }
+
+    def __str__(self):
+        return (
+            f"memory {format_bytes(self.peak_memory)} "
+            f"({self.slots} process(es)), "
+            f"trajectory read {format_bytes(self.bytes_read)}, "
+            f"{self.flops:.2g} FLOP, "
+            f"about {format_duration(self.wall_time)}"
+        )
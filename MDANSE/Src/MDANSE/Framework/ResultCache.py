@@ -0,0 +1,262 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import hashlib
+import json
+import os
+import shutil
+from typing import Union
+
+import h5py
+
+from MDANSE import PLATFORM
+from MDANSE.MLogging import LOG
+from MDANSE.MolecularDynamics.TopologyCache import hash_h5_items
+
+# the parameters which do not change the results of a job
+IGNORED_PARAMETERS = ("output_files", "running_mode")
+
+
+def file_fingerprint(filename: str) -> dict[str, Union[int, str]]:
+    """Identifies the contents of an input file without reading it all:
+    its size, its modification time and, for an HDF5 trajectory, the
+    hash of its chemical system.
+
+    Parameters
+    ----------
+    filename : str
+        The path of the file.
+
+    Returns
+    -------
+    dict[str, Union[int, str]]
+        The fingerprint of the file.
+    """
+    stat = os.stat(filename)
+    fingerprint = {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+    if h5py.is_hdf5(filename):
+        with h5py.File(filename, "r") as h5_file:
+            if "chemical_system" in h5_file:
+                fingerprint["chemical_system"] = hash_h5_items(
+                    h5_file, ["/chemical_system"]
+                )
+    return fingerprint
+
+
+def job_parameters(job) -> dict[str, str]:
+    """
+    Parameters
+    ----------
+    job : IJob
+        A configured job.
+
+    Returns
+    -------
+    dict[str, str]
+        The JSON parameters of the job which define its results.
+    """
+    parameters = job.output_configuration()
+    for name in IGNORED_PARAMETERS:
+        parameters.pop(name, None)
+    return parameters
+
+
+def evict_least_recently_used(directory: str, extension: str, max_size: int) -> None:
+    """Deletes the files of a cache directory which were the least
+    recently used, i.e. modified, until their total size is at most
+    max_size.
+
+    Parameters
+    ----------
+    directory : str
+        The cache directory.
+    extension : str
+        The extension of the cached files.
+    max_size : int
+        The largest total size of the files, in bytes.
+    """
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(extension):
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        LOG.debug(f"Removed {path} from the cache")
+
+
+class ResultCache:
+    """Stores the .mda files written by the jobs in the MDANSE cache
+    directory, so that a job run again with the same parameters on the
+    same input files copies its results instead of computing them.
+
+    The results are found by a hash of the name and parameters of the
+    job and of the fingerprints of its input files (see file_fingerprint).
+    The inputs stored in the metadata of a cached file are compared with
+    the parameters of the job before the file is used. When the cache is
+    larger than max_size, the least recently used results are deleted.
+
+    Attributes
+    ----------
+    enabled : bool
+        Set to True to read and write the cache. The cache is disabled by
+        default. The result_cache option of IJob.run, e.g. --result-cache
+        on the command line of a job script, replaces it for one job.
+    max_size : int
+        The largest size of the cache, in bytes.
+    """
+
+    enabled = False
+
+    max_size = 2**32
+
+    def __init__(self, directory: str = None):
+        """
+        Parameters
+        ----------
+        directory : str, optional
+            The directory in which the results are stored, by default the
+            results directory of the MDANSE cache directory.
+        """
+        if directory is None:
+            directory = os.path.join(PLATFORM.cache_directory(), "results")
+        PLATFORM.create_directory(directory)
+        self._directory = directory
+
+    @property
+    def directory(self) -> str:
+        """The directory in which the results are stored."""
+        return self._directory
+
+    @staticmethod
+    def key(job) -> Union[str, None]:
+        """
+        Parameters
+        ----------
+        job : IJob
+            A configured job.
+
+        Returns
+        -------
+        str or None
+            The key of the results of the job, or None if an input file
+            of the job is missing.
+        """
+        fingerprints = {}
+        for name, configurator in job.configuration.items():
+            filename = configurator.get("filename", None)
+            if name in IGNORED_PARAMETERS or not isinstance(filename, str):
+                continue
+            try:
+                fingerprints[name] = file_fingerprint(filename)
+            except OSError:
+                return None
+        record = json.dumps(
+            [job.__class__.__name__, job_parameters(job), fingerprints],
+            sort_keys=True,
+        )
+        return hashlib.sha256(record.encode("utf-8")).hexdigest()
+
+    def filename(self, key: str) -> str:
+        """
+        Parameters
+        ----------
+        key : str
+            The key of the results of a job.
+
+        Returns
+        -------
+        str
+            The path of the cached .mda file.
+        """
+        return os.path.join(self._directory, f"{key}.mda")
+
+    def lookup(self, key: str, job) -> Union[str, None]:
+        """Finds the cached results of a job.
+
+        Parameters
+        ----------
+        key : str
+            The key of the results of the job.
+        job : IJob
+            The configured job.
+
+        Returns
+        -------
+        str or None
+            The path of the cached .mda file, or None if the results of
+            the job are not in the cache.
+        """
+        filename = self.filename(key)
+        if not os.path.exists(filename):
+            return None
+        try:
+            with h5py.File(filename, "r") as h5_file:
+                task_name = h5_file["/metadata/task_name"][0].decode("utf-8")
+                inputs = {
+                    name: dset[0].decode("utf-8")
+                    for name, dset in h5_file["/metadata/inputs"].items()
+                    if name not in IGNORED_PARAMETERS
+                }
+        except (OSError, KeyError) as e:
+            LOG.debug(f"Could not read the cached results {filename}: {e}")
+            return None
+        if task_name != job.__class__.__name__ or inputs != job_parameters(job):
+            LOG.warning(
+                f"The cached results {filename} are not the results of {job.name}"
+            )
+            return None
+        # the modification time orders the results for the eviction
+        os.utime(filename)
+        return filename
+
+    def store(self, key: str, filename: str) -> None:
+        """Copies the results of a job in the cache, and deletes the least
+        recently used results if the cache has become too large.
+
+        Parameters
+        ----------
+        key : str
+            The key of the results of the job.
+        filename : str
+            The path of the .mda file written by the job.
+        """
+        cached = self.filename(key)
+        temporary = cached + ".tmp"
+        try:
+            shutil.copyfile(filename, temporary)
+            os.replace(temporary, cached)
+        except OSError as e:
+            LOG.debug(f"Could not store {filename} in the result cache: {e}")
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Deletes the least recently used results until the size of the
+        cache is at most max_size."""
+        evict_least_recently_used(self._directory, ".mda", self.max_size)
+
+    def clear(self) -> None:
+        """Deletes all the cached results."""
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith(".mda"):
+                os.remove(entry.path)
@@ -16,13 +16,25 @@
 import abc
 import time
 
+from MDANSE.Framework.ResourceEstimate import format_duration
+
 
 class Status(object, metaclass=abc.ABCMeta):
     """
     This class defines an interface for status objects.
     This kind of object is used to store the status a loop-based task.
+
+    The progress is reported by update_status at most once every
+    update_interval seconds, with the number of steps completed since the
+    start, so that a task with many short steps does not flood the log or
+    the GUI. The throughput, in steps per second, is smoothed with an
+    exponential moving average of factor throughput_smoothing, and gives
+    the estimated time remaining (eta).
     """
 
+    update_interval = 0.5
+    throughput_smoothing = 0.3
+
     def __init__(self):
         self._updateStep = 1
 
@@ -34,6 +46,9 @@ class Status(object, metaclass=abc.ABCMeta):
         self._deltas = [self._startTime, self._startTime + 1.0]
         self._elapsedTime = "N/A"
         self._lastRefresh = self._startTime
+        self._lastReportedStep = 0
+        self._throughput = None
+        self._memory = {}
 
     @abc.abstractmethod
     def finish_status(self):
@@ -51,9 +66,23 @@ class Status(object, metaclass=abc.ABCMeta):
     def update_status(self):
         pass
 
-    @abc.abstractmethod
-    def fixed_status(self, current_progress: int):
-        pass
+    def memory_status(self):
+        """Reports the memory of the task, called after every sample of
+        its memory. Does nothing by default."""
+
+    def steps_status(self):
+        """Reports a new number of steps of a started task. Does nothing
+        by default."""
+
+    @property
+    def memory(self):
+        return self._memory
+
+    def update_memory(self, memory: dict):
+        """Stores a sample of the resident memory of the processes of the
+        task, see MemoryMonitor.state."""
+        self._memory = memory
+        self.memory_status()
 
     @property
     def currentStep(self):
@@ -90,17 +119,65 @@ class Status(object, metaclass=abc.ABCMeta):
     def nSteps(self):
         return self._nSteps
 
+    @property
+    def throughput(self):
+        """The smoothed number of steps per second, None before the first
+        report."""
+        return self._throughput
+
+    @property
+    def eta(self):
+        """The estimated time remaining in seconds, None if unknown."""
+        if not self._throughput or self._nSteps is None:
+            return None
+        return max(0, self._nSteps - self._currentStep) / self._throughput
+
+    def progress_text(self):
+        if self._nSteps:
+            percent = 100 * self._currentStep / self._nSteps
+            text = f"{self._currentStep}/{self._nSteps} steps ({percent:.1f}%)"
+        else:
+            text = f"{self._currentStep} steps"
+        if self._throughput:
+            text += f", {self._throughput:.3g} steps/s"
+        if self.eta is not None:
+            text += f", {format_duration(self.eta)} remaining"
+        return text
+
     def start(self, nSteps, rate=None):
         if self._nSteps is not None:
             return
 
         self._nSteps = nSteps
+        self._lastRefresh = time.time()
 
         if rate is not None:
             self._updateStep = max(0, int(rate * nSteps))
 
         self.start_status()
 
+    def skip(self, nSteps):
+        """Counts steps completed before the start, e.g. by an earlier run
+        of a resumed task, without including them in the throughput."""
+        if nSteps <= 0:
+            return
+
+        self._currentStep += nSteps
+        self._lastReportedStep = self._currentStep
+        self._lastRefresh = time.time()
+
+        self.update_status()
+
+    def set_number_of_steps(self, nSteps):
+        """Changes the number of steps of a started task, e.g. of a task
+        which finds new steps while it runs."""
+        if nSteps == self._nSteps:
+            return
+
+        self._nSteps = nSteps
+
+        self.steps_status()
+
     def stop(self):
         self._stopped = True
         self.stop_status()
@@ -115,7 +192,21 @@ class Status(object, metaclass=abc.ABCMeta):
 
         self._deltas[1] = lastUpdate
 
-        if force or ((lastUpdate - self._lastRefresh) > 5):
-            self._lastRefresh = lastUpdate
+        finished = self._nSteps is not None and self._currentStep >= self._nSteps
+        elapsed = lastUpdate - self._lastRefresh
+        if not (force or finished or elapsed >= self.update_interval):
+            return
+
+        new_steps = self._currentStep - self._lastReportedStep
+        if new_steps > 0 and elapsed > 0:
+            throughput = new_steps / elapsed
+            if self._throughput is None:
+                self._throughput = throughput
+            else:
+                self._throughput += self.throughput_smoothing * (
+                    throughput - self._throughput
+                )
+        self._lastRefresh = lastUpdate
+        self._lastReportedStep = self._currentStep
 
         self.update_status()
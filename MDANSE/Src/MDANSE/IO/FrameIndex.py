@@ -0,0 +1,319 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import hashlib
+import os
+from typing import Union
+
+import numpy as np
+
+from MDANSE import PLATFORM
+from MDANSE.MLogging import LOG
+
+BLOCK_SIZE = 2**24
+
+# the number of frames, and of bytes at their beginning, which are
+# compared to check that an indexed file has only grown
+SAMPLE_FRAMES = 64
+SAMPLE_BYTES = 64
+
+
+def scan_marker_offsets(
+    filename: str, marker: bytes, start: int = 0, block_size: int = BLOCK_SIZE
+) -> np.ndarray:
+    """Finds the byte offsets of all the lines of a file which start
+    with a marker, reading the file in large binary blocks.
+
+    Parameters
+    ----------
+    filename : str
+        The path of the text file.
+    marker : bytes
+        The beginning of the lines to find, e.g. b"ITEM: TIMESTEP".
+    start : int, optional
+        The offset from which the file is scanned. It must be the
+        beginning of a line.
+    block_size : int, optional
+        The number of bytes read at once.
+
+    Returns
+    -------
+    np.ndarray
+        The offsets of the beginning of the lines starting with marker.
+    """
+    pattern = b"\n" + marker
+    offsets = []
+    with open(filename, "rb") as source:
+        source.seek(start)
+        # the newline before the first line of the scan is implicit
+        previous = b"\n"
+        position = start - 1
+        while True:
+            block = source.read(block_size)
+            if not block:
+                break
+            data = previous + block
+            found = data.find(pattern)
+            while found >= 0:
+                offsets.append(position + found + 1)
+                found = data.find(pattern, found + 1)
+            # keep the end of the block to find markers split between blocks
+            keep = min(len(pattern) - 1, len(data))
+            position += len(data) - keep
+            previous = data[len(data) - keep :]
+    return np.array(offsets, dtype=np.int64)
+
+
+def scan_line_offsets(
+    filename: str, lines_per_frame: int, start: int = 0, block_size: int = BLOCK_SIZE
+) -> np.ndarray:
+    """Finds the byte offsets of the frames of a file in which every
+    frame has the same number of lines (e.g. an XYZ file).
+
+    Parameters
+    ----------
+    filename : str
+        The path of the text file.
+    lines_per_frame : int
+        The number of lines of every frame.
+    start : int, optional
+        The offset of the beginning of a frame, from which the file is
+        scanned.
+    block_size : int, optional
+        The number of bytes read at once.
+
+    Returns
+    -------
+    np.ndarray
+        The offsets of the beginning of the complete frames.
+    """
+    line_starts = [np.array([start], dtype=np.int64)]
+    position = start
+    ends_with_newline = True
+    with open(filename, "rb") as source:
+        source.seek(start)
+        while True:
+            block = source.read(block_size)
+            if not block:
+                break
+            newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+            line_starts.append(newlines.astype(np.int64) + position + 1)
+            position += len(block)
+            ends_with_newline = block.endswith(b"\n")
+    line_starts = np.concatenate(line_starts)
+    # the last entry is the end of the file, not the beginning of a line
+    n_lines = len(line_starts) - 1 if ends_with_newline else len(line_starts)
+    n_frames = n_lines // lines_per_frame
+    return line_starts[: n_frames * lines_per_frame : lines_per_frame]
+
+
+class FrameIndex:
+    """The byte offsets of the frames of a text trajectory, which allows
+    to read any frame without reading the previous ones.
+
+    The offsets are stored in the MDANSE cache directory, together with
+    the size and modification time of the trajectory, so that converting
+    the same file again does not need to scan it. If the file has only
+    grown since it was indexed, only the new part is scanned. A file is
+    considered to have grown if the beginnings of a sample of its frames
+    and the end of the indexed part are unchanged; otherwise, e.g. if it
+    was overwritten by a longer file, it is scanned again from the start.
+
+    Frames are found either as the lines starting with a marker, or as
+    blocks of a fixed number of lines.
+
+    Attributes
+    ----------
+    persistent : bool
+        Set to False to neither read nor write the stored indexes.
+    """
+
+    persistent = True
+
+    def __init__(
+        self,
+        filename: str,
+        marker: Union[bytes, None] = None,
+        lines_per_frame: Union[int, None] = None,
+    ):
+        """
+        Parameters
+        ----------
+        filename : str
+            The path of the text trajectory.
+        marker : bytes, optional
+            The beginning of the first line of every frame.
+        lines_per_frame : int, optional
+            The number of lines of every frame, used if marker is None.
+        """
+        if (marker is None) == (lines_per_frame is None):
+            raise ValueError("Exactly one of marker and lines_per_frame is needed")
+        self._filename = filename
+        self._marker = marker
+        self._lines_per_frame = lines_per_frame
+        self._file = None
+        self._offsets = np.zeros(0, dtype=np.int64)
+        self._size = 0
+        self._fingerprint = ""
+        self.update()
+
+    def __getstate__(self):
+        d = self.__dict__.copy()
+        d["_file"] = None
+        return d
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """The byte offsets of the beginning of the frames."""
+        return self._offsets
+
+    @property
+    def index_filename(self) -> str:
+        """The name of the file in which the offsets are stored."""
+        key = f"{os.path.abspath(self._filename)}\0{self._marker}\0{self._lines_per_frame}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        directory = os.path.join(PLATFORM.cache_directory(), "frame_index")
+        PLATFORM.create_directory(directory)
+        return os.path.join(directory, f"{digest}.npz")
+
+    def _scan(self, start: int) -> np.ndarray:
+        if self._marker is not None:
+            return scan_marker_offsets(self._filename, self._marker, start)
+        return scan_line_offsets(self._filename, self._lines_per_frame, start)
+
+    def _compute_fingerprint(self, offsets: np.ndarray, size: int) -> str:
+        """Returns a digest of the beginning of a sample of the frames and
+        of the end of the first size bytes of the file."""
+        n_samples = min(len(offsets), SAMPLE_FRAMES)
+        samples = np.unique(np.linspace(0, len(offsets) - 1, n_samples).astype(int))
+        positions = [int(offsets[i]) for i in samples] + [max(0, size - SAMPLE_BYTES)]
+        digest = hashlib.sha1()
+        with open(self._filename, "rb") as source:
+            for position in positions:
+                source.seek(position)
+                digest.update(source.read(max(0, min(SAMPLE_BYTES, size - position))))
+        return digest.hexdigest()
+
+    def _has_grown(self) -> bool:
+        """Returns True if the indexed part of the file is unchanged."""
+        return self._fingerprint == self._compute_fingerprint(self._offsets, self._size)
+
+    def _load(self, stat: os.stat_result) -> None:
+        try:
+            with np.load(self.index_filename) as stored:
+                size, mtime = int(stored["size"]), stored["mtime"]
+                offsets = stored["offsets"]
+                fingerprint = str(stored["fingerprint"])
+        except (OSError, KeyError, ValueError):
+            return
+        if size == stat.st_size and mtime == stat.st_mtime_ns:
+            self._offsets, self._size, self._fingerprint = offsets, size, fingerprint
+        elif size < stat.st_size and len(offsets):
+            # if the file has grown, update scans it from the last frame
+            self._offsets, self._size, self._fingerprint = offsets, size, fingerprint
+            if not self._has_grown():
+                self._offsets = np.zeros(0, dtype=np.int64)
+                self._size, self._fingerprint = 0, ""
+
+    def _save(self, stat: os.stat_result) -> None:
+        try:
+            np.savez(
+                self.index_filename,
+                offsets=self._offsets,
+                size=stat.st_size,
+                mtime=stat.st_mtime_ns,
+                fingerprint=self._fingerprint,
+            )
+        except OSError as e:
+            LOG.debug(f"Could not store the frame index of {self._filename}: {e}")
+
+    def update(self) -> int:
+        """Finds the frames which have been added to the file since it
+        was last indexed.
+
+        Returns
+        -------
+        int
+            The number of frames of the file.
+        """
+        stat = os.stat(self._filename)
+        if stat.st_size == self._size:
+            return len(self)
+        if self._size == 0 and self.persistent:
+            self._load(stat)
+            if self._size == stat.st_size:
+                return len(self)
+        if self._size > stat.st_size or (self._size and not self._has_grown()):
+            self._offsets = np.zeros(0, dtype=np.int64)
+        start = int(self._offsets[-1]) if len(self._offsets) else 0
+        self._offsets = np.concatenate(
+            [self._offsets[self._offsets < start], self._scan(start)]
+        )
+        self._size = stat.st_size
+        self._fingerprint = self._compute_fingerprint(self._offsets, self._size)
+        if self.persistent:
+            self._save(stat)
+        return len(self)
+
+    def frame_range(self, frame: int) -> tuple[int, int]:
+        """
+        Parameters
+        ----------
+        frame : int
+            The index of the frame.
+
+        Returns
+        -------
+        tuple[int, int]
+            The offsets of the first byte of the frame and of the first
+            byte after the frame.
+        """
+        start = int(self._offsets[frame])
+        if frame + 1 < len(self._offsets):
+            end = int(self._offsets[frame + 1])
+        else:
+            end = self._size
+        return start, end
+
+    def read_frame(self, frame: int) -> bytes:
+        """Reads the text of a frame.
+
+        Parameters
+        ----------
+        frame : int
+            The index of the frame.
+
+        Returns
+        -------
+        bytes
+            The content of the file from the beginning of the frame to
+            the beginning of the next one.
+        """
+        if frame < 0 or frame >= len(self):
+            raise IndexError(f"Invalid frame number: {frame}")
+        start, end = self.frame_range(frame)
+        if self._file is None:
+            self._file = open(self._filename, "rb")
+        self._file.seek(start)
+        return self._file.read(end - start)
+
+    def close(self) -> None:
+        """Closes the trajectory file if a frame has been read."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -16,6 +16,9 @@
 
 import abc
 from collections import OrderedDict
+from typing import Union
+
+import numpy as np
 
 
 class _IFileVariable(metaclass=abc.ABCMeta):
@@ -87,3 +90,39 @@ def load_variables(dictionary):
         data[vname]["units"] = attributes.get("units", "au")
 
     return data
+
+
+def parse_columns(
+    block: Union[bytes, str], n_rows: int, columns=None, dtype=np.float64
+) -> np.ndarray:
+    """Parses a block of text made of rows with the same number of
+    whitespace-separated fields in one go, instead of line by line.
+
+    :param block: The text of the block.
+    :type block: bytes or str
+
+    :param n_rows: The number of rows of the block.
+    :type n_rows: int
+
+    :param columns: The columns to return, as any index or slice of the
+        columns. All the columns are returned if None.
+    :type columns: int, list, slice or None
+
+    :param dtype: The type to which the fields are converted. If None,
+        the fields are returned as strings.
+    :type dtype: numpy dtype or None
+
+    :return: The fields of the block, of shape (n_rows, n_columns).
+    :rtype: numpy.ndarray
+    """
+    fields = np.array(block.split())
+    if n_rows == 0 or len(fields) % n_rows:
+        raise ValueError(
+            f"Could not split {len(fields)} fields into {n_rows} rows of equal length"
+        )
+    table = fields.reshape(n_rows, -1)
+    if columns is not None:
+        table = table[:, columns]
+    if dtype is None:
+        return table
+    return table.astype(dtype)
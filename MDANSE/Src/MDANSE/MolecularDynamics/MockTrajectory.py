@@ -29,6 +29,7 @@ from MDANSE.MolecularDynamics.Configuration import (
     RealConfiguration,
     _Configuration,
 )
+from MDANSE.MolecularDynamics.TopologyCache import TopologyCache
 from MDANSE.MolecularDynamics.TrajectoryUtils import atomic_trajectory
 from MDANSE.MolecularDynamics.UnitCell import UnitCell
 
@@ -75,6 +76,7 @@ class MockTrajectory:
         )
         self._variables = {}
         self._coordinates = None
+        self._topology_cache = None
 
         self._chemicalSystem = ChemicalSystem("MockSystem")
         for atom in self._atom_types:
@@ -522,6 +524,18 @@ class MockTrajectory:
         """
         return self._chemicalSystem
 
+    @property
+    def topology_cache(self) -> TopologyCache:
+        """MockTrajectory has no file to identify its chemical
+        system, so the topology cache is kept in memory only.
+
+        :return: the topology cache
+        :rtype: MDANSE.MolecularDynamics.TopologyCache.TopologyCache
+        """
+        if self._topology_cache is None:
+            self._topology_cache = TopologyCache(None)
+        return self._topology_cache
+
     @property
     def file(self) -> str:
         """There is no trajectory file.
@@ -0,0 +1,361 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import hashlib
+import os
+from typing import Callable, Iterable, Union
+
+import h5py
+import numpy as np
+
+from MDANSE import PLATFORM
+from MDANSE.Chemistry.ChemicalEntity import ChemicalSystem
+from MDANSE.MLogging import LOG
+
+
+def hash_h5_items(h5_file: h5py.File, paths: Iterable[str]) -> str:
+    """Computes a hash of the contents of the given HDF5 groups or
+    datasets. Groups are hashed recursively, in alphabetical order.
+
+    Parameters
+    ----------
+    h5_file : h5py.File
+        The opened HDF5 file.
+    paths : Iterable[str]
+        The paths of the groups or datasets to hash. Missing paths are
+        skipped.
+
+    Returns
+    -------
+    str
+        The hexadecimal digest of the contents.
+    """
+    hasher = hashlib.sha256()
+
+    def update(name: str, item: Union[h5py.Group, h5py.Dataset]) -> None:
+        hasher.update(name.encode("utf-8"))
+        for attr_name in sorted(item.attrs):
+            hasher.update(attr_name.encode("utf-8"))
+            hasher.update(str(item.attrs[attr_name]).encode("utf-8"))
+        if isinstance(item, h5py.Group):
+            for key in sorted(item.keys()):
+                update(f"{name}/{key}", item[key])
+            return
+        data = np.asarray(item[()])
+        hasher.update(str(data.shape).encode("utf-8"))
+        if data.dtype.kind == "O":
+            for entry in data.ravel():
+                if isinstance(entry, str):
+                    entry = entry.encode("utf-8")
+                hasher.update(bytes(entry))
+                hasher.update(b"\0")
+        else:
+            hasher.update(data.dtype.str.encode("utf-8"))
+            hasher.update(np.ascontiguousarray(data).tobytes())
+
+    for path in paths:
+        if path in h5_file:
+            update(path, h5_file[path])
+
+    return hasher.hexdigest()
+
+
+def cache_key(*parts: str) -> str:
+    """Builds a valid HDF5 path for the cache from a category and any
+    number of strings (e.g. a JSON selection) that define the entry.
+
+    Returns
+    -------
+    str
+        The key, in the form category/digest.
+    """
+    category, *contents = parts
+    if not contents:
+        return category
+    digest = hashlib.sha1("\0".join(contents).encode("utf-8")).hexdigest()
+    return f"{category}/{digest}"
+
+
+class TopologyCache:
+    """Stores the data derived from the topology of a chemical system
+    (atom selections, molecule look-up tables, bond maps ...) in an
+    HDF5 file of the MDANSE cache directory, so that jobs run on the
+    same chemical system do not have to recompute them.
+
+    The file is named after a hash of the chemical system so that
+    every trajectory of the same system shares the same cache. The
+    cache is only an optimisation: any error while reading or writing
+    it is logged and otherwise ignored.
+
+    Attributes
+    ----------
+    enabled : bool
+        Set to False to disable reading and writing of all caches.
+    version : int
+        The version of the cache layout. Cache files with a different
+        version are ignored.
+    """
+
+    enabled = True
+
+    version = 1
+
+    def __init__(self, system_hash: str, directory: str = None):
+        """
+        Parameters
+        ----------
+        system_hash : str
+            The hash identifying the chemical system. If None, the
+            entries are only kept in memory.
+        directory : str, optional
+            The directory in which the cache file is stored, by default
+            the MDANSE cache directory.
+        """
+        self._system_hash = system_hash
+        self._directory = directory
+        self._memory = {}
+
+    def __getstate__(self):
+        d = self.__dict__.copy()
+        d["_memory"] = {}
+        return d
+
+    @property
+    def filename(self) -> str:
+        """The name of the HDF5 file storing the cache."""
+        if self._directory is None:
+            directory = os.path.join(PLATFORM.cache_directory(), "topology")
+        else:
+            directory = self._directory
+        PLATFORM.create_directory(directory)
+        return os.path.join(directory, f"{self._system_hash}.h5")
+
+    def _read(self, key: str) -> Union[np.ndarray, list[np.ndarray], None]:
+        if (
+            not self.enabled
+            or self._system_hash is None
+            or not os.path.exists(self.filename)
+        ):
+            return None
+        try:
+            with h5py.File(self.filename, "r") as h5_file:
+                if h5_file.attrs.get("version", None) != self.version:
+                    return None
+                if key not in h5_file:
+                    return None
+                item = h5_file[key]
+                if isinstance(item, h5py.Dataset):
+                    return item[:]
+                values = item["values"][:]
+                offsets = item["offsets"][:]
+                if len(offsets) == 1:
+                    return []
+                return np.split(values, offsets[1:-1])
+        except (OSError, KeyError) as e:
+            LOG.debug(f"Could not read {key} from the topology cache: {e}")
+            return None
+
+    def _write(self, key: str, data: Union[np.ndarray, list[Iterable[int]]]) -> bool:
+        if not self.enabled or self._system_hash is None:
+            return False
+        try:
+            with h5py.File(self.filename, "a") as h5_file:
+                if h5_file.attrs.get("version", None) != self.version:
+                    for name in list(h5_file.keys()):
+                        del h5_file[name]
+                    h5_file.attrs["version"] = self.version
+                if key in h5_file:
+                    del h5_file[key]
+                if isinstance(data, np.ndarray):
+                    h5_file.create_dataset(key, data=data)
+                else:
+                    lengths = [len(entry) for entry in data]
+                    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+                    np.cumsum(lengths, out=offsets[1:])
+                    values = np.fromiter(
+                        (v for entry in data for v in entry),
+                        dtype=np.int64,
+                        count=offsets[-1],
+                    )
+                    grp = h5_file.create_group(key)
+                    grp.create_dataset("values", data=values)
+                    grp.create_dataset("offsets", data=offsets)
+        except (OSError, ValueError) as e:
+            LOG.debug(f"Could not write {key} to the topology cache: {e}")
+            return False
+        return True
+
+    def get(
+        self,
+        key: str,
+        compute: Callable[[], Union[np.ndarray, list[Iterable[int]]]] = None,
+    ) -> Union[np.ndarray, list[np.ndarray], None]:
+        """Returns an entry of the cache. If the entry is missing and a
+        function is given, it is computed, stored and returned.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry, see cache_key.
+        compute : Callable, optional
+            Function returning either an array or a list of integer
+            sequences (stored as a ragged array).
+
+        Returns
+        -------
+        np.ndarray or list[np.ndarray] or None
+            The cached data or None if the entry is missing and no
+            function was given.
+        """
+        if key in self._memory:
+            return self._memory[key]
+
+        data = self._read(key)
+        if data is None and compute is not None:
+            data = compute()
+            self._write(key, data)
+            if not isinstance(data, np.ndarray):
+                data = [np.asarray(entry, dtype=np.int64) for entry in data]
+
+        if data is not None:
+            self._memory[key] = data
+        return data
+
+    def put(self, key: str, data: Union[np.ndarray, list[Iterable[int]]]) -> None:
+        """Stores an entry in the cache. The entry is kept in memory if it
+        cannot be written to the cache file, e.g. if the cache has none.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry, see cache_key.
+        data : np.ndarray or list[Iterable[int]]
+            An array or a list of integer sequences.
+        """
+        if self._write(key, data):
+            # the entry is read back from the file in the layout of get
+            self._memory.pop(key, None)
+        elif isinstance(data, np.ndarray):
+            self._memory[key] = data
+        else:
+            self._memory[key] = [np.asarray(entry, dtype=np.int64) for entry in data]
+
+    def clear(self) -> None:
+        """Deletes the cache file of this chemical system."""
+        self._memory = {}
+        if self._system_hash is None:
+            return
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+    def atom_symbols(self, chemical_system: ChemicalSystem) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.ndarray
+            The chemical symbol of each atom, indexed by atom index.
+        """
+
+        def compute():
+            symbols = np.empty(chemical_system.number_of_atoms, dtype=object)
+            for at in chemical_system.atom_list:
+                symbols[at.index] = at.symbol
+            return symbols.astype(bytes)
+
+        return self.get("atom_symbols", compute).astype(str)
+
+    def molecule_indexes(self, chemical_system: ChemicalSystem) -> np.ndarray:
+        """The cached version of atom_index_to_molecule_index.
+
+        Returns
+        -------
+        np.ndarray
+            The index of the top level chemical entity of each atom,
+            indexed by atom index.
+        """
+
+        def compute():
+            lut = np.full(chemical_system.number_of_atoms, -1, dtype=np.int64)
+            for i, ce in enumerate(chemical_system.chemical_entities):
+                for at in ce.atom_list:
+                    lut[at.index] = i
+            return lut
+
+        return self.get("molecule_indexes", compute)
+
+    def bonds(self, chemical_system: ChemicalSystem) -> list[np.ndarray]:
+        """
+        Returns
+        -------
+        list[np.ndarray]
+            The indexes of the atoms bonded to each atom, indexed by
+            atom index.
+        """
+
+        def compute():
+            bonds = [[] for _ in range(chemical_system.number_of_atoms)]
+            for at in chemical_system.atom_list:
+                bonds[at.index] = [other_at.index for other_at in at.bonds]
+            return bonds
+
+        return self.get("bonds", compute)
+
+    def entity_atoms(self, chemical_system: ChemicalSystem) -> list[np.ndarray]:
+        """
+        Returns
+        -------
+        list[np.ndarray]
+            The indexes of the atoms of each top level chemical entity,
+            indexed by the position of the entity in the chemical system.
+        """
+        if "entity_atoms" not in self._memory:
+            lut = self.molecule_indexes(chemical_system)
+            order = np.argsort(lut, kind="stable")
+            counts = np.bincount(
+                lut[lut >= 0], minlength=len(chemical_system.chemical_entities)
+            )
+            start = np.count_nonzero(lut < 0)
+            self._memory["entity_atoms"] = np.split(
+                order[start:], np.cumsum(counts)[:-1]
+            )
+        return self._memory["entity_atoms"]
+
+    def com_topology(
+        self, chemical_system: ChemicalSystem, indexes: Iterable[int]
+    ) -> tuple[list[list[int]], list[np.ndarray]]:
+        """Returns the topology needed to compute a center of mass
+        trajectory with com_trajectory.
+
+        Parameters
+        ----------
+        chemical_system : ChemicalSystem
+            The chemical system of the trajectory.
+        indexes : Iterable[int]
+            The indexes of the atoms of the center of mass.
+
+        Returns
+        -------
+        tuple[list[list[int]], list[np.ndarray]]
+            The atom indexes of each top level chemical entity the atoms
+            belong to, and the bonded atoms indexed by atom index.
+        """
+        lut = self.molecule_indexes(chemical_system)
+        entity_atoms = self.entity_atoms(chemical_system)
+        entities = np.unique(lut[np.asarray(indexes, dtype=np.int64)])
+        # com_trajectory modifies these lists, so new ones are created
+        entity_indexes = [entity_atoms[e].tolist() for e in entities]
+        return entity_indexes, self.bonds(chemical_system)
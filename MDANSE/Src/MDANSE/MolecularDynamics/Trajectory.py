@@ -17,23 +17,34 @@
 from ast import operator
 from typing import Collection
 import math
+import queue
+import threading
+import time
 
 import numpy as np
 import h5py
 
 from MDANSE.MLogging import LOG
-from MDANSE.Trajectory.MdanseTrajectory import MdanseTrajectory
+from MDANSE.Trajectory.MdanseTrajectory import (
+    MdanseTrajectory,
+    open_trajectory_file,
+)
 from MDANSE.Trajectory.H5MDTrajectory import H5MDTrajectory
 from MDANSE.Chemistry import ATOMS_DATABASE
 from MDANSE.Chemistry.ChemicalEntity import Atom, ChemicalSystem, _ChemicalEntity
 from MDANSE.MolecularDynamics.Configuration import (
     RealConfiguration,
 )
+from MDANSE.MolecularDynamics.TrajectorySummary import TrajectorySummary
 from MDANSE.MolecularDynamics.TrajectoryUtils import (
     sorted_atoms,
     resolve_undefined_molecules_name,
 )
-
+from MDANSE.MolecularDynamics.VirtualTrajectory import (
+    VirtualTrajectoryError,
+    build_trajectory_view,
+    build_virtual_trajectory,
+)
 
 available_formats = {
     "MDANSE": MdanseTrajectory,
@@ -50,23 +61,74 @@ class Trajectory:
     def __init__(self, filename, trajectory_format=None):
         self._filename = filename
         self._format = trajectory_format
+        h5_file = None
         if self._format is None:
-            self.guess_correct_format()
-        self._trajectory = self.open_trajectory(self._format)
+            h5_file = self.guess_correct_format()
+        self._trajectory = self.open_trajectory(self._format, h5_file)
         self._min_span = np.zeros(3)
         self._max_span = np.zeros(3)
 
+    @classmethod
+    def from_segments(cls, segment_filenames, filename):
+        """Concatenates MDANSE trajectory segments into a virtual
+        trajectory, which reads the frames from the segment files, and
+        opens it.
+
+        :param segment_filenames: the trajectories to concatenate, in order
+        :type segment_filenames: list of str
+        :param filename: the path of the virtual trajectory to write
+        :type filename: str
+
+        :return: the virtual trajectory
+        :rtype: Trajectory
+        """
+        build_virtual_trajectory(segment_filenames, filename)
+        return cls(filename, "MDANSE")
+
+    def view(self, filename, frames=slice(None), atom_indices=None):
+        """Writes a trajectory which reads a range of frames and a subset
+        of atoms of this trajectory without copying them, and opens it.
+
+        :param filename: the path of the view to write
+        :type filename: str
+        :param frames: the frames of this trajectory in the view
+        :type frames: slice
+        :param atom_indices: the indices of the atoms in the view, or None
+            for all the atoms
+        :type atom_indices: list of int
+
+        :return: the view
+        :rtype: Trajectory
+        """
+        if self._format != "MDANSE":
+            raise VirtualTrajectoryError(
+                f"Views of {self._format} trajectories are not supported"
+            )
+        build_trajectory_view(self._filename, filename, frames, atom_indices)
+        return Trajectory(filename, "MDANSE")
+
     def guess_correct_format(self):
-        """This is a placeholder for now. As the number of
-        formats increases, they will have to be handled here.
+        """Finds the format of the trajectory by probing the layout of
+        the file with each of the available formats. The file is opened
+        only once and no data is read.
+
+        :return: the opened file if a format was found, None otherwise
+        :rtype: h5py.File
         """
+        try:
+            h5_file = open_trajectory_file(self._filename)
+        except OSError:
+            return None
         for fname, fclass in available_formats.items():
-            if fclass.file_is_right(self._filename):
+            if fclass.probe(h5_file):
                 self._format = fname
+                return h5_file
+        h5_file.close()
+        return None
 
-    def open_trajectory(self, trajectory_format):
+    def open_trajectory(self, trajectory_format, h5_file=None):
         trajectory_class = available_formats[trajectory_format]
-        trajectory = trajectory_class(self._filename)
+        trajectory = trajectory_class(self._filename, h5_file)
         return trajectory
 
     def close(self):
@@ -97,6 +159,15 @@ class Trajectory:
     def __len__(self):
         return len(self._trajectory)
 
+    def refresh(self):
+        """Make the frames written since the trajectory was opened visible,
+        if the file is still being written in SWMR mode.
+
+        :return: the number of frames of the trajectory
+        :rtype: int
+        """
+        return self._trajectory.refresh()
+
     def charges(self, frame):
         """Return the coordinates at a given frame.
 
@@ -153,6 +224,11 @@ class Trajectory:
         return self._trajectory.unit_cell(frame)
 
     def calculate_coordinate_span(self) -> np.ndarray:
+        summary = self.summary
+        if summary is not None and "min_span" in summary:
+            self._max_span = np.asarray(summary["max_span"])
+            self._min_span = np.asarray(summary["min_span"])
+            return
         min_span = np.array(3 * [1e11])
         max_span = np.zeros(3)
         for frame in range(len(self)):
@@ -287,6 +363,25 @@ class Trajectory:
         """
         return self._trajectory.chemical_system
 
+    @property
+    def summary(self):
+        """Return the statistics stored in the /summary group of the
+        trajectory when it was written (see TrajectorySummary).
+
+        :return: the summary, or None if the trajectory has no valid summary
+        :rtype: dict
+        """
+        return getattr(self._trajectory, "summary", None)
+
+    @property
+    def topology_cache(self):
+        """Return the cache of the data derived from the chemical system.
+
+        :return: the topology cache
+        :rtype: MDANSE.MolecularDynamics.TopologyCache.TopologyCache
+        """
+        return self._trajectory.topology_cache
+
     @property
     def file(self):
         """Return the trajectory file object.
@@ -331,6 +426,20 @@ class TrajectoryWriterError(Exception):
 class TrajectoryWriter:
     allowed_compression = ["gzip", "lzf"]
 
+    # The HDF5 filters applied to the configuration variables for each
+    # value of the compression argument. The scale-offset filter rounds
+    # the coordinates to the precision of the writer, and HDF5 converts
+    # them back to floating point numbers when they are read. The other
+    # variables, whose values may be much smaller than a precision in nm,
+    # only get the lossless filters of the profile.
+    storage_profiles = {
+        "none": {},
+        "gzip": {"compression": "gzip"},
+        "lzf": {"compression": "lzf"},
+        "shuffle_gzip": {"shuffle": True, "compression": "gzip"},
+        "scale_offset": {"scaleoffset": True, "compression": "gzip"},
+    }
+
     def __init__(
         self,
         h5_filename,
@@ -341,6 +450,10 @@ class TrajectoryWriter:
         chunking_axis=1,
         compression="none",
         initial_charges=None,
+        buffer_frames=None,
+        background_flush=False,
+        precision=1e-4,
+        swmr=False,
     ):
         """Constructor.
 
@@ -352,11 +465,35 @@ class TrajectoryWriter:
         :type h5_filename: int
         :param selected_atoms: the selected atoms of the chemical system to write
         :type selected_atoms: list of MDANSE.Chemistry.ChemicalEntity.Atom
+        :param buffer_frames: the number of frames kept in memory and written
+            to the file at once. By default, as many frames as fit in 32 MB
+            per variable, and at most 128.
+        :type buffer_frames: int
+        :param background_flush: if True, the buffered frames are written by
+            a separate thread while the next frames are being dumped
+        :type background_flush: bool
+        :param compression: the storage profile of the configuration
+            variables, one of the keys of storage_profiles
+        :type compression: str
+        :param precision: the largest rounding error, in nm, of the
+            coordinates stored with the "scale_offset" profile
+        :type precision: float
+        :param swmr: if True, the datasets grow with the frames written,
+            n_steps is only used to size the buffers and chunks, and the
+            frames can be read while the trajectory is being written
+            (HDF5 single writer multiple readers mode) once they have
+            been flushed
+        :type swmr: bool
         """
 
         self._h5_filename = h5_filename
 
-        self._h5_file = h5py.File(self._h5_filename, "w")
+        self._swmr = swmr
+
+        if swmr:
+            self._h5_file = h5py.File(self._h5_filename, "w", libver="latest")
+        else:
+            self._h5_file = h5py.File(self._h5_filename, "w")
 
         self._chemical_system = chemical_system
 
@@ -395,11 +532,45 @@ class TrajectoryWriter:
 
         self._compression = compression
 
+        self._precision = precision
+
+        if compression == "scale_offset" and np.dtype(self._dtype).itemsize < 4:
+            raise TrajectoryWriterError(
+                "The scale_offset storage profile needs 32 or 64-bit floats"
+            )
+
         if initial_charges is None:
             self._initial_charges = np.zeros(self._n_atoms)
         else:
             self._initial_charges = initial_charges
 
+        self._summary = TrajectorySummary()
+
+        if buffer_frames is None:
+            buffer_frames = min(128, 2**25 // (24 * max(1, self._n_atoms)))
+        self._buffer_frames = max(1, min(buffer_frames, self._n_steps))
+        self._buffer = None
+        self._n_buffered = 0
+        self._units = {}
+
+        self._flush_queue = None
+        self._flush_thread = None
+        self._flush_error = None
+        if background_flush:
+            self._flush_queue = queue.Queue(maxsize=1)
+            self._flush_thread = threading.Thread(
+                target=self._flush_worker, daemon=True
+            )
+            self._flush_thread.start()
+
+    def __del__(self):
+        # the buffered frames of a writer which was not closed are kept
+        try:
+            if self._n_buffered and self._h5_file.id.valid:
+                self.flush()
+        except Exception:
+            pass
+
     def _dump_chemical_system(self):
         """Dump the chemical system to the trajectory file."""
 
@@ -411,13 +582,25 @@ class TrajectoryWriter:
 
     def close(self):
         """Close the trajectory file"""
+        self.flush()
+        if self._flush_thread is not None:
+            self._flush_queue.put(None)
+            self._flush_thread.join()
+            self._flush_thread = None
+            self._raise_flush_error()
+
+        if self._swmr:
+            # no object can be created in SWMR mode, and the file is
+            # reopened to store the charges and the summary
+            self._h5_file.close()
+            self._h5_file = h5py.File(self._h5_filename, "r+", libver="latest")
+
         self.validate_charges()
 
-        configuration = self._chemical_system.configuration
         n_atoms = self._chemical_system.total_number_of_atoms
-        if configuration is not None:
+        if self._buffer is not None:
             configuration_grp = self._h5_file["/configuration"]
-            for k, v in configuration.variables.items():
+            for k in self._buffer["variables"]:
                 dset = configuration_grp.get(k, None)
                 dset.resize((self._current_index, n_atoms, 3))
             try:
@@ -428,6 +611,14 @@ class TrajectoryWriter:
                 unit_cell_dataset.resize((self._current_index, 3, 3))
             time_dataset = self._h5_file["/time"]
             time_dataset.resize((self._current_index,))
+            self._summary.write(self._h5_file)
+            for k in self._buffer["variables"]:
+                dset = configuration_grp[k]
+                ratio = dset.size * 8 / max(1, dset.id.get_storage_size())
+                LOG.info(
+                    f"{k} stored with the {self._compression} profile, "
+                    f"{ratio:.2f} times smaller than in float64"
+                )
         self._h5_file.close()
 
     def write_charges(self, charges: np.ndarray, index: int):
@@ -442,21 +633,21 @@ class TrajectoryWriter:
         """
         variable_charge_dset = self._h5_file.get("/configuration/charges", None)
         if variable_charge_dset is None:
-            if self._compression in TrajectoryWriter.allowed_compression:
-                variable_charge_dset = self._h5_file.create_dataset(
-                    "/configuration/charges",
-                    shape=(self._n_steps, self._n_atoms),
-                    chunks=(1, self._n_atoms),
-                    dtype=self._dtype,
-                    compression=self._compression,
-                )
-            else:
-                variable_charge_dset = self._h5_file.create_dataset(
-                    "/configuration/charges",
-                    shape=(self._n_steps, self._n_atoms),
-                    chunks=(1, self._n_atoms),
-                    dtype=self._dtype,
+            if self._h5_file.swmr_mode:
+                raise TrajectoryWriterError(
+                    "The charges of the first frame must be written before "
+                    "the first frames are flushed in SWMR mode"
                 )
+            variable_charge_dset = self._h5_file.create_dataset(
+                "/configuration/charges",
+                shape=(0 if self._swmr else self._n_steps, self._n_atoms),
+                maxshape=(None if self._swmr else self._n_steps, self._n_atoms),
+                chunks=(1, self._n_atoms),
+                dtype=self._dtype,
+                **self._variable_options(),
+            )
+        if index >= len(variable_charge_dset):
+            variable_charge_dset.resize(index + 1, axis=0)
         variable_charge_dset[index] = charges
 
     def validate_charges(self):
@@ -481,6 +672,9 @@ class TrajectoryWriter:
     def dump_configuration(self, time, units=None):
         """Dump the chemical system configuration at a given time.
 
+        The configuration is copied to a buffer, which is written to the
+        file once it is full, or when flush or close are called.
+
         :param time: the time
         :type time: float
 
@@ -488,7 +682,7 @@ class TrajectoryWriter:
         :type units: dict
         """
 
-        if self._current_index >= self._n_steps:
+        if self._current_index >= self._n_steps and not self._swmr:
             raise IndexError(
                 f"The current index {self._current_index} is greater than the actual number of steps of the trajectory {self._n_steps}"
             )
@@ -497,12 +691,118 @@ class TrajectoryWriter:
         if configuration is None:
             return
 
-        if units is None:
-            units = {}
+        if self._buffer is None:
+            self._buffer = self._new_buffer()
+        if units is not None:
+            for k, v in units.items():
+                self._units.setdefault(k, v)
+
+        frame = self._n_buffered
+        for k, v in configuration.variables.items():
+            data = self._buffer["variables"].get(k, None)
+            if data is None:
+                # atoms which are not selected are stored as NaN
+                data = np.full((self._buffer_frames, self._n_atoms, 3), np.nan)
+                self._buffer["variables"][k] = data
+            data[frame, self._selected_atoms, :] = v[self._selected_atoms, :]
+
+        if configuration.is_periodic:
+            if self._buffer["unit_cell"] is None:
+                self._buffer["unit_cell"] = np.zeros((self._buffer_frames, 3, 3))
+            self._buffer["unit_cell"][frame] = configuration.unit_cell.direct
+
+        self._buffer["time"][frame] = time
+
+        self._n_buffered += 1
+        self._current_index += 1
+        if self._n_buffered == self._buffer_frames:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered frames to the file."""
+        if self._n_buffered == 0:
+            return
+        start = self._current_index - self._n_buffered
+        block = (start, self._n_buffered, self._buffer, dict(self._units))
+        if self._flush_thread is None:
+            self._write_block(*block)
+        else:
+            self._raise_flush_error()
+            # waits for the previous block to be taken by the thread
+            self._flush_queue.put(block)
+        # the values of a variable or unit cell missing from the next
+        # frames must not be those of the frames written
+        self._buffer = self._new_buffer(self._buffer)
+        self._n_buffered = 0
+
+    def _new_buffer(self, previous=None):
+        buffer = {
+            "variables": {},
+            "unit_cell": None,
+            "time": np.empty(self._buffer_frames),
+        }
+        if previous is not None:
+            for k in previous["variables"]:
+                buffer["variables"][k] = np.full(
+                    (self._buffer_frames, self._n_atoms, 3), np.nan
+                )
+            if previous["unit_cell"] is not None:
+                buffer["unit_cell"] = np.zeros((self._buffer_frames, 3, 3))
+        return buffer
+
+    def _flush_worker(self):
+        while True:
+            block = self._flush_queue.get()
+            if block is None:
+                break
+            if self._flush_error is not None:
+                continue
+            try:
+                self._write_block(*block)
+            except Exception as e:
+                self._flush_error = e
+
+    def _raise_flush_error(self):
+        if self._flush_error is not None:
+            raise TrajectoryWriterError(
+                f"Could not write frames to {self._h5_filename}: {self._flush_error}"
+            ) from self._flush_error
+
+    def _variable_options(self, lossy=False):
+        """Returns the HDF5 filters of the configuration variables.
+
+        :param lossy: if True, the filter which rounds the values to the
+            precision of the writer is included, as for the coordinates
+        :type lossy: bool
+        :return: the keyword arguments of h5py.Group.create_dataset
+        :rtype: dict
+        """
+        options = dict(self.storage_profiles.get(self._compression, {}))
+        if options.pop("scaleoffset", False) and lossy:
+            # the number of decimal digits kept by the scale-offset filter
+            options["scaleoffset"] = max(0, math.ceil(-math.log10(self._precision)))
+        return options
+
+    def _write_block(self, start, n_frames, buffer, units):
+        """Writes consecutive frames to the file with one write per dataset.
+
+        :param start: the index of the first frame of the block
+        :type start: int
+        :param n_frames: the number of frames of the block
+        :type n_frames: int
+        :param buffer: the buffer holding the frames
+        :type buffer: dict
+        :param units: the units of the variables
+        :type units: dict
+        """
+        stop = start + n_frames
+        # in SWMR mode the datasets grow with the frames written
+        n_rows = 0 if self._swmr else self._n_steps
+        max_rows = None if self._swmr else self._n_steps
 
         if self._chunking_axis == 0:
             chunk_tuple = (self._n_steps, 1, 3)
-        if self._chunking_axis == 1:
+        elif self._chunking_axis == 1:
             chunk_tuple = (1, self._n_atoms, 3)
         else:
             chunk_tuple = (
@@ -513,54 +813,69 @@ class TrajectoryWriter:
 
         # Write the configuration variables
         configuration_grp = self._h5_file["/configuration"]
-        for k, v in configuration.variables.items():
-            data = np.empty(v.shape)
-            data[:] = np.nan
-            data[self._selected_atoms, :] = v[self._selected_atoms, :]
+        summary_variables = {}
+        for k, data in buffer["variables"].items():
+            summary_variables[k] = data[:n_frames]
             dset = configuration_grp.get(k, None)
             if dset is None:
-                if self._compression in TrajectoryWriter.allowed_compression:
-                    dset = configuration_grp.create_dataset(
-                        k,
-                        shape=(self._n_steps, self._n_atoms, 3),
-                        chunks=chunk_tuple,
-                        dtype=self._dtype,
-                        compression=self._compression,
-                    )
-                else:
-                    dset = configuration_grp.create_dataset(
-                        k,
-                        shape=(self._n_steps, self._n_atoms, 3),
-                        chunks=chunk_tuple,
-                        dtype=self._dtype,
-                    )
+                options = self._variable_options(lossy=k == "coordinates")
+                dset = configuration_grp.create_dataset(
+                    k,
+                    shape=(n_rows, self._n_atoms, 3),
+                    maxshape=(max_rows, self._n_atoms, 3),
+                    chunks=chunk_tuple,
+                    dtype=self._dtype,
+                    **options,
+                )
                 dset.attrs["units"] = units.get(k, "")
-            dset[self._current_index] = data
+                if "scaleoffset" in options:
+                    dset.attrs["precision"] = 10.0 ** -options["scaleoffset"]
+            if self._swmr:
+                dset.resize(stop, axis=0)
+            dset[start:stop] = data[:n_frames]
 
         # Write the unit cell
-        if configuration.is_periodic:
-            unit_cell = configuration.unit_cell
+        summary_unit_cells = None
+        if buffer["unit_cell"] is not None:
+            summary_unit_cells = buffer["unit_cell"][:n_frames]
             unit_cell_dset = self._h5_file.get("unit_cell", None)
             if unit_cell_dset is None:
                 unit_cell_dset = self._h5_file.create_dataset(
                     "unit_cell",
-                    shape=(self._n_steps, 3, 3),
-                    chunks=(1, 3, 3),
+                    shape=(n_rows, 3, 3),
+                    maxshape=(max_rows, 3, 3),
+                    chunks=(min(self._n_steps, 128), 3, 3),
                     dtype=np.float64,
                 )
                 unit_cell_dset.attrs["units"] = units.get("unit_cell", "")
-            unit_cell_dset[self._current_index] = unit_cell.direct
+            if self._swmr:
+                unit_cell_dset.resize(stop, axis=0)
+            unit_cell_dset[start:stop] = summary_unit_cells
 
         # Write the time
         time_dset = self._h5_file.get("time", None)
         if time_dset is None:
             time_dset = self._h5_file.create_dataset(
-                "time", shape=(self._n_steps,), chunks=(1,), dtype=np.float64
+                "time",
+                shape=(n_rows,),
+                maxshape=(max_rows,),
+                chunks=(min(self._n_steps, 1024),),
+                dtype=np.float64,
             )
             time_dset.attrs["units"] = units.get("time", "")
-        time_dset[self._current_index] = time
+        if self._swmr:
+            time_dset.resize(stop, axis=0)
+        time_dset[start:stop] = buffer["time"][:n_frames]
 
-        self._current_index += 1
+        self._summary.update(
+            buffer["time"][:n_frames], summary_variables, summary_unit_cells
+        )
+
+        if self._swmr:
+            # all the datasets exist once the first block is written
+            if not self._h5_file.swmr_mode:
+                self._h5_file.swmr_mode = True
+            self._h5_file.flush()
 
 
 class RigidBodyTrajectoryGenerator:
@@ -768,6 +1083,45 @@ def read_atoms_trajectory(
     # t.close()
 
 
+def storage_statistics(filename, max_block_size=2**26):
+    """Measures how compactly the configuration variables of an MDANSE
+    trajectory are stored and how fast they are read, so that the storage
+    profiles of TrajectoryWriter can be compared.
+
+    :param filename: the path of the MDANSE trajectory
+    :type filename: str
+    :param max_block_size: the largest number of bytes read at once
+    :type max_block_size: int
+
+    :return: for each configuration variable, the storage profile filters
+        ("compression", "shuffle" and "scaleoffset"), the "precision" of
+        rounded values, the "stored_bytes", the "compression_ratio" with
+        respect to float64 values and the "read_throughput" in MB of
+        float64 values per second
+    :rtype: dict
+    """
+    statistics = {}
+    with h5py.File(filename, "r") as h5_file:
+        for name, dset in h5_file["/configuration"].items():
+            frame_size = 8 * dset.size // max(1, len(dset))
+            block = max(1, max_block_size // max(1, frame_size))
+            start = time.perf_counter()
+            for first in range(0, len(dset), block):
+                dset[first : first + block].astype(np.float64)
+            elapsed = time.perf_counter() - start
+            stored_bytes = dset.id.get_storage_size()
+            statistics[name] = {
+                "compression": dset.compression,
+                "shuffle": dset.shuffle,
+                "scaleoffset": dset.scaleoffset,
+                "precision": dset.attrs.get("precision", None),
+                "stored_bytes": stored_bytes,
+                "compression_ratio": 8 * dset.size / max(1, stored_bytes),
+                "read_throughput": 8e-6 * dset.size / max(elapsed, 1e-9),
+            }
+    return statistics
+
+
 if __name__ == "__main__":
     from MDANSE.MolecularDynamics.Configuration import RealConfiguration
 
@@ -0,0 +1,245 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+from typing import Union
+import warnings
+
+import h5py
+import numpy as np
+
+from MDANSE.MLogging import LOG
+
+
+class TrajectorySummary:
+    """Accumulates statistics over the frames of a trajectory, so that
+    they can be stored in the /summary group of an MDANSE trajectory and
+    read later without going through the frames again.
+
+    The statistics are:
+
+    - the number of frames, the first and last time and the smallest
+      and largest time step,
+    - the smallest and largest span of the coordinates along each axis,
+    - the smallest, largest and mean unit cell volume,
+    - the smallest and largest value of each configuration variable
+      along each axis.
+
+    Atoms whose values are NaN (i.e. atoms which were not selected when
+    the trajectory was written) are ignored.
+    """
+
+    version = 1
+
+    def __init__(self):
+        self._n_frames = 0
+        self._time_first = None
+        self._time_last = None
+        self._time_step_min = np.inf
+        self._time_step_max = -np.inf
+        self._min_span = None
+        self._max_span = None
+        self._volume_min = np.inf
+        self._volume_max = -np.inf
+        self._volume_sum = 0.0
+        self._variables = {}
+
+    @property
+    def n_frames(self) -> int:
+        """The number of frames added to the summary."""
+        return self._n_frames
+
+    def update(
+        self,
+        times: np.ndarray,
+        variables: dict[str, np.ndarray],
+        unit_cells: Union[np.ndarray, None] = None,
+    ) -> None:
+        """Adds a block of consecutive frames to the summary.
+
+        Parameters
+        ----------
+        times : np.ndarray
+            The times of the frames, of shape (n_frames,).
+        variables : dict[str, np.ndarray]
+            The configuration variables, each of shape
+            (n_frames, n_atoms, 3).
+        unit_cells : np.ndarray or None
+            The direct unit cells of shape (n_frames, 3, 3), or None if
+            the trajectory is not periodic.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if len(times) == 0:
+            return
+
+        if self._time_last is None:
+            self._time_first = times[0]
+            steps = np.diff(times)
+        else:
+            steps = np.diff(times, prepend=self._time_last)
+        if len(steps):
+            self._time_step_min = min(self._time_step_min, steps.min())
+            self._time_step_max = max(self._time_step_max, steps.max())
+        self._time_last = times[-1]
+
+        with warnings.catch_warnings():
+            # all-NaN slices (no atom selected) give NaN, which is expected
+            warnings.simplefilter("ignore", RuntimeWarning)
+            for name, values in variables.items():
+                mini = np.nanmin(values, axis=1)
+                maxi = np.nanmax(values, axis=1)
+                if name == "coordinates":
+                    spans = maxi - mini
+                    self._min_span = _fmin(self._min_span, np.nanmin(spans, axis=0))
+                    self._max_span = _fmax(self._max_span, np.nanmax(spans, axis=0))
+                old_min, old_max = self._variables.get(name, (None, None))
+                self._variables[name] = (
+                    _fmin(old_min, np.nanmin(mini, axis=0)),
+                    _fmax(old_max, np.nanmax(maxi, axis=0)),
+                )
+
+        if unit_cells is not None:
+            volumes = np.abs(np.linalg.det(unit_cells))
+            self._volume_min = min(self._volume_min, volumes.min())
+            self._volume_max = max(self._volume_max, volumes.max())
+            self._volume_sum += volumes.sum()
+
+        self._n_frames += len(times)
+
+    def as_dict(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            The summary, in the same form as returned by read.
+        """
+        summary = {"version": self.version, "n_frames": self._n_frames}
+        if self._n_frames == 0:
+            return summary
+
+        summary["time_first"] = self._time_first
+        summary["time_last"] = self._time_last
+        if self._n_frames > 1:
+            summary["time_step"] = (self._time_last - self._time_first) / (
+                self._n_frames - 1
+            )
+            summary["time_step_min"] = self._time_step_min
+            summary["time_step_max"] = self._time_step_max
+            summary["time_step_is_regular"] = bool(
+                np.isclose(self._time_step_min, self._time_step_max, rtol=1e-6)
+            )
+        if self._min_span is not None:
+            summary["min_span"] = self._min_span
+            summary["max_span"] = self._max_span
+        if np.isfinite(self._volume_min):
+            summary["volume_min"] = self._volume_min
+            summary["volume_max"] = self._volume_max
+            summary["volume_mean"] = self._volume_sum / self._n_frames
+        summary["variables"] = {
+            name: {"min": mini, "max": maxi}
+            for name, (mini, maxi) in self._variables.items()
+        }
+        return summary
+
+    def write(self, h5_file: h5py.File) -> None:
+        """Stores the summary in the /summary group of a trajectory file,
+        replacing any previous summary.
+
+        Parameters
+        ----------
+        h5_file : h5py.File
+            The trajectory file, opened for writing.
+        """
+        if "summary" in h5_file:
+            del h5_file["summary"]
+        grp = h5_file.create_group("summary")
+        summary = self.as_dict()
+        for name, values in summary.pop("variables", {}).items():
+            var_grp = grp.create_group(f"variables/{name}")
+            var_grp.attrs["min"] = values["min"]
+            var_grp.attrs["max"] = values["max"]
+        for name, value in summary.items():
+            grp.attrs[name] = value
+
+    @classmethod
+    def read(cls, h5_file: h5py.File) -> Union[dict, None]:
+        """Reads the summary stored in a trajectory file.
+
+        Parameters
+        ----------
+        h5_file : h5py.File
+            The trajectory file.
+
+        Returns
+        -------
+        dict or None
+            The summary, or None if the file has no summary or if it
+            was written with another version of the summary.
+        """
+        grp = h5_file.get("summary", None)
+        if grp is None or grp.attrs.get("version", None) != cls.version:
+            return None
+        summary = {}
+        for name, value in grp.attrs.items():
+            summary[name] = value.item() if np.ndim(value) == 0 else value
+        summary["variables"] = {
+            name: {"min": var_grp.attrs["min"], "max": var_grp.attrs["max"]}
+            for name, var_grp in grp.get("variables", {}).items()
+        }
+        return summary
+
+
+def _fmin(old: Union[np.ndarray, None], new: np.ndarray) -> np.ndarray:
+    return new if old is None else np.fmin(old, new)
+
+
+def _fmax(old: Union[np.ndarray, None], new: np.ndarray) -> np.ndarray:
+    return new if old is None else np.fmax(old, new)
+
+
+def index_trajectory(filename: str, max_block_size: int = 2**26) -> dict:
+    """Computes the summary of an existing MDANSE trajectory and stores
+    it in the file. This is only needed for trajectories written before
+    TrajectoryWriter started storing summaries.
+
+    Parameters
+    ----------
+    filename : str
+        The path of the MDANSE trajectory.
+    max_block_size : int, optional
+        The largest number of bytes of a configuration variable read at
+        once.
+
+    Returns
+    -------
+    dict
+        The summary which has been stored in the file.
+    """
+    summary = TrajectorySummary()
+    with h5py.File(filename, "r+") as h5_file:
+        configuration = h5_file["/configuration"]
+        n_frames = len(configuration["coordinates"])
+        frame_size = max(dset[0].nbytes for dset in configuration.values() if len(dset))
+        block = max(1, max_block_size // max(1, frame_size))
+        for first in range(0, n_frames, block):
+            last = min(n_frames, first + block)
+            variables = {name: dset[first:last] for name, dset in configuration.items()}
+            if "unit_cell" in h5_file:
+                unit_cells = h5_file["unit_cell"][first:last]
+            else:
+                unit_cells = None
+            summary.update(h5_file["time"][first:last], variables, unit_cells)
+        summary.write(h5_file)
+    LOG.info(f"Stored the summary of {n_frames} frames in {filename}")
+    return summary.as_dict()
@@ -0,0 +1,259 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+import os
+from typing import Sequence, Union
+
+import h5py
+import numpy as np
+
+from MDANSE.Core.Error import Error
+from MDANSE.MLogging import LOG
+from MDANSE.MolecularDynamics.TopologyCache import hash_h5_items
+from MDANSE.Trajectory.MdanseTrajectory import MdanseTrajectory
+
+
+class VirtualTrajectoryError(Error):
+    pass
+
+
+def _chemical_system_hash(h5_file: h5py.File) -> str:
+    # the name of the chemical system may differ between the segments
+    grp = h5_file["/chemical_system"]
+    return hash_h5_items(h5_file, [f"/chemical_system/{k}" for k in sorted(grp)])
+
+
+def _frame_datasets(h5_file: h5py.File) -> dict[str, h5py.Dataset]:
+    datasets = {
+        f"/configuration/{name}": dset
+        for name, dset in h5_file["/configuration"].items()
+    }
+    if "unit_cell" in h5_file:
+        datasets["/unit_cell"] = h5_file["/unit_cell"]
+    return datasets
+
+
+def _atom_runs(atom_indices: Sequence[int]) -> list[tuple[int, int]]:
+    # the (start, stop) ranges of consecutive atom indices
+    indices = np.unique(np.asarray(atom_indices, dtype=int))
+    if len(indices) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    starts = indices[np.concatenate([[0], breaks])]
+    stops = indices[np.concatenate([breaks - 1, [len(indices) - 1]])] + 1
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+def _copy_system(source: h5py.File, h5_file: h5py.File) -> None:
+    source.copy(source["/chemical_system"], h5_file, "chemical_system")
+    if "charge" in source:
+        source.copy(source["/charge"], h5_file, "charge")
+    h5_file.create_group("/configuration")
+
+
+def _copy_attrs(source: h5py.Dataset, dset: h5py.Dataset) -> None:
+    for attr_name, value in source.attrs.items():
+        dset.attrs[attr_name] = value
+
+
+def shifted_times(segment_times: Sequence[np.ndarray]) -> np.ndarray:
+    """Joins the time axes of consecutive trajectory segments. A segment
+    whose time does not start after the end of the previous segment, e.g.
+    because the simulation clock was reset at a restart, is shifted to
+    start one time step after the previous segment.
+
+    Parameters
+    ----------
+    segment_times : Sequence[np.ndarray]
+        The times of the frames of each segment.
+
+    Returns
+    -------
+    np.ndarray
+        The times of all the frames.
+    """
+    times = []
+    time_step = 1.0
+    for segment in segment_times:
+        segment = np.asarray(segment, dtype=np.float64)
+        if len(segment) > 1:
+            time_step = (segment[-1] - segment[0]) / (len(segment) - 1)
+        if times and len(segment) and segment[0] <= times[-1][-1]:
+            segment = segment - segment[0] + times[-1][-1] + time_step
+        if len(segment):
+            times.append(segment)
+    if not times:
+        return np.zeros(0)
+    return np.concatenate(times)
+
+
+def build_virtual_trajectory(segment_filenames: Sequence[str], filename: str) -> str:
+    """Writes an MDANSE trajectory which concatenates trajectory segments,
+    e.g. the parts of a simulation split across restarts, without copying
+    their frames. The configuration variables and unit cells are HDF5
+    virtual datasets which read the segment files, so the segments must
+    stay where they are. The times are copied and shifted so that they
+    increase across the segments.
+
+    Parameters
+    ----------
+    segment_filenames : Sequence[str]
+        The MDANSE trajectories to concatenate, in order. They must have
+        the same chemical system and the same configuration variables.
+    filename : str
+        The path of the trajectory to write.
+
+    Returns
+    -------
+    str
+        The path of the trajectory.
+    """
+    if not segment_filenames:
+        raise VirtualTrajectoryError("No trajectory segment to concatenate")
+
+    segment_filenames = [os.path.abspath(name) for name in segment_filenames]
+    if os.path.abspath(filename) in segment_filenames:
+        raise VirtualTrajectoryError(
+            f"The virtual trajectory {filename} would overwrite one of its segments"
+        )
+
+    segments = []
+    times = []
+    reference = None
+    for name in segment_filenames:
+        with h5py.File(name, "r") as h5_file:
+            if not MdanseTrajectory.probe(h5_file):
+                raise VirtualTrajectoryError(f"{name} is not an MDANSE trajectory")
+            datasets = _frame_datasets(h5_file)
+            layout = {
+                path: (dset.shape[1:], dset.dtype) for path, dset in datasets.items()
+            }
+            chemical_system = _chemical_system_hash(h5_file)
+            if reference is None:
+                reference = (chemical_system, layout)
+            elif chemical_system != reference[0]:
+                raise VirtualTrajectoryError(
+                    f"The chemical system of {name} differs from the one of "
+                    f"{segment_filenames[0]}"
+                )
+            elif layout != reference[1]:
+                raise VirtualTrajectoryError(
+                    f"The configuration variables of {name} differ from the ones "
+                    f"of {segment_filenames[0]}: {layout} != {reference[1]}"
+                )
+            n_frames = len(h5_file["/configuration/coordinates"])
+            segments.append((name, n_frames))
+            times.append(h5_file["/time"][:n_frames])
+
+    n_frames = sum(n for _, n in segments)
+    with h5py.File(segment_filenames[0], "r") as first, h5py.File(
+        filename, "w"
+    ) as h5_file:
+        _copy_system(first, h5_file)
+        for path, dset in _frame_datasets(first).items():
+            virtual = h5py.VirtualLayout(
+                shape=(n_frames,) + dset.shape[1:], dtype=dset.dtype
+            )
+            start = 0
+            for name, n in segments:
+                source = h5py.VirtualSource(
+                    name, path, shape=(n,) + dset.shape[1:], dtype=dset.dtype
+                )
+                virtual[start : start + n] = source
+                start += n
+            vdset = h5_file.create_virtual_dataset(path, virtual, fillvalue=np.nan)
+            _copy_attrs(dset, vdset)
+
+        time_dset = h5_file.create_dataset("/time", data=shifted_times(times))
+        _copy_attrs(first["/time"], time_dset)
+
+        h5_file.attrs["segments"] = segment_filenames
+
+    LOG.info(
+        f"Wrote the virtual trajectory {filename} of {n_frames} frames "
+        f"from {len(segments)} segments"
+    )
+    return filename
+
+
+def build_trajectory_view(
+    source_filename: str,
+    filename: str,
+    frames: slice = slice(None),
+    atom_indices: Union[Sequence[int], None] = None,
+) -> str:
+    """Writes an MDANSE trajectory which reads a range of frames and a
+    subset of atoms of another MDANSE trajectory, without copying them.
+    As in a trajectory written by TrajectoryWriter for selected atoms, the
+    chemical system is unchanged and the values of the atoms which are not
+    selected are NaN.
+
+    Parameters
+    ----------
+    source_filename : str
+        The MDANSE trajectory to read.
+    filename : str
+        The path of the trajectory to write.
+    frames : slice, optional
+        The frames of the source trajectory in the view.
+    atom_indices : Sequence[int] or None, optional
+        The indices of the atoms in the view, or None for all the atoms.
+
+    Returns
+    -------
+    str
+        The path of the trajectory.
+    """
+    source_filename = os.path.abspath(source_filename)
+    if os.path.abspath(filename) == source_filename:
+        raise VirtualTrajectoryError(
+            f"The trajectory view {filename} would overwrite its source"
+        )
+
+    with h5py.File(source_filename, "r") as source, h5py.File(filename, "w") as h5_file:
+        if not MdanseTrajectory.probe(source):
+            raise VirtualTrajectoryError(
+                f"{source_filename} is not an MDANSE trajectory"
+            )
+        frame_range = range(len(source["/configuration/coordinates"]))[frames]
+        if len(frame_range) == 0:
+            raise VirtualTrajectoryError(f"No frame of {source_filename} selected")
+        frames = slice(frame_range.start, frame_range.stop, frame_range.step)
+        if frame_range.step < 0:
+            raise VirtualTrajectoryError("The frames of a view must be increasing")
+
+        _copy_system(source, h5_file)
+        for path, dset in _frame_datasets(source).items():
+            virtual = h5py.VirtualLayout(
+                shape=(len(frame_range),) + dset.shape[1:], dtype=dset.dtype
+            )
+            vsource = h5py.VirtualSource(dset)
+            if atom_indices is None or path == "/unit_cell":
+                virtual[:] = vsource[frames]
+            else:
+                for start, stop in _atom_runs(atom_indices):
+                    virtual[:, start:stop] = vsource[frames, start:stop]
+            vdset = h5_file.create_virtual_dataset(path, virtual, fillvalue=np.nan)
+            _copy_attrs(dset, vdset)
+
+        time_dset = h5_file.create_dataset("/time", data=source["/time"][frames])
+        _copy_attrs(source["/time"], time_dset)
+
+        h5_file.attrs["segments"] = [source_filename]
+
+    LOG.info(
+        f"Wrote the view {filename} of {len(frame_range)} frames of {source_filename}"
+    )
+    return filename
@@ -23,8 +23,7 @@ import textwrap
 
 from MDANSE.Core.Error import Error
 from MDANSE import PLATFORM
-from MDANSE.Framework.Jobs.IJob import IJob
-from MDANSE.Framework.InputData.HDFTrajectoryInputData import HDFTrajectoryInputData
+from MDANSE.Framework.Jobs.IJob import IJob, RunOptionError, parse_run_options
 from MDANSE.Framework.Jobs.JobStatus import JobState
 from MDANSE.MLogging import LOG
 
@@ -223,10 +222,126 @@ class CommandLineParser(optparse.OptionParser):
         @type parser: instance of MDANSEOptionParser
         """
 
+        from MDANSE.Framework.InputData.HDFTrajectoryInputData import (
+            HDFTrajectoryInputData,
+        )
+
         trajName = parser.rargs[0]
         inputTraj = HDFTrajectoryInputData(trajName)
         LOG.info(inputTraj.info())
 
+    def index_trajectory(self, option, opt_str, value, parser):
+        """Compute the summary of an existing trajectory and store it in the file.
+
+        @param option: the option that triggered the callback.
+        @type option: optparse.Option instance
+
+        @param opt_str: the option string seen on the command line.
+        @type opt_str: str
+
+        @param value: the argument for the option.
+        @type value: str
+
+        @param parser: the MDANSE option parser.
+        @type parser: instance of MDANSEOptionParser
+        """
+
+        if len(parser.rargs) != 1:
+            raise CommandLineParserError(
+                "Invalid number of arguments for %r option" % opt_str
+            )
+
+        from MDANSE.MolecularDynamics.TrajectorySummary import index_trajectory
+
+        trajName = parser.rargs[0]
+        if not os.path.exists(trajName):
+            raise CommandLineParserError("The trajectory %r does not exist" % trajName)
+        index_trajectory(trajName)
+
+    def concatenate_trajectories(self, option, opt_str, value, parser):
+        """Write a virtual trajectory which concatenates trajectory segments.
+
+        @param option: the option that triggered the callback.
+        @type option: optparse.Option instance
+
+        @param opt_str: the option string seen on the command line.
+        @type opt_str: str
+
+        @param value: the argument for the option.
+        @type value: str
+
+        @param parser: the MDANSE option parser.
+        @type parser: instance of MDANSEOptionParser
+        """
+
+        if len(parser.rargs) < 2:
+            raise CommandLineParserError(
+                "Invalid number of arguments for %r option" % opt_str
+            )
+
+        from MDANSE.MolecularDynamics.VirtualTrajectory import (
+            build_virtual_trajectory,
+        )
+
+        trajName, segments = parser.rargs[0], parser.rargs[1:]
+        for segment in segments:
+            if not os.path.exists(segment):
+                raise CommandLineParserError(
+                    "The trajectory %r does not exist" % segment
+                )
+        build_virtual_trajectory(segments, trajName)
+
+    def view_trajectory(self, option, opt_str, value, parser):
+        """Write a trajectory which reads a range of frames and a subset of
+        atoms of another trajectory without copying them. The frames are
+        given as first:last:step, the last frame excluded, and the atoms as
+        comma-separated indices or ranges of indices, e.g. 0-9,20.
+
+        @param option: the option that triggered the callback.
+        @type option: optparse.Option instance
+
+        @param opt_str: the option string seen on the command line.
+        @type opt_str: str
+
+        @param value: the argument for the option.
+        @type value: str
+
+        @param parser: the MDANSE option parser.
+        @type parser: instance of MDANSEOptionParser
+        """
+
+        if not 2 <= len(parser.rargs) <= 4:
+            raise CommandLineParserError(
+                "Invalid number of arguments for %r option" % opt_str
+            )
+
+        from MDANSE.MolecularDynamics.VirtualTrajectory import build_trajectory_view
+
+        viewName, trajName = parser.rargs[:2]
+        if not os.path.exists(trajName):
+            raise CommandLineParserError("The trajectory %r does not exist" % trajName)
+
+        frames = slice(None)
+        atom_indices = None
+        try:
+            if len(parser.rargs) > 2:
+                frames = slice(
+                    *[
+                        int(bound) if bound else None
+                        for bound in parser.rargs[2].split(":")
+                    ]
+                )
+            if len(parser.rargs) > 3:
+                atom_indices = []
+                for indices in parser.rargs[3].split(","):
+                    first, _, last = indices.partition("-")
+                    atom_indices.extend(range(int(first), int(last or first) + 1))
+        except (TypeError, ValueError):
+            raise CommandLineParserError(
+                "Invalid frames or atoms for %r option" % opt_str
+            )
+        build_trajectory_view(trajName, viewName, frames, atom_indices)
+
     def error(self, msg):
         """Called when an error occured in the command line.
 
@@ -262,35 +377,116 @@ class CommandLineParser(optparse.OptionParser):
                 "Invalid number of arguments for %r option" % opt_str
             )
 
-    def run_job(self, option, opt_str, value, parser):
-        """Run job file(s).
-
-        @param option: the option that triggered the callback.
-        @type option: optparse.Option instance
+    def _run_job_script(self, opt_str, parser, *arguments):
+        """Run a job file in a new process. The command line arguments
+        after the job file, e.g. --result-cache, are the options of the run.
 
         @param opt_str: the option string seen on the command line.
         @type opt_str: str
 
-        @param value: the argument for the option.
-        @type value: str
-
         @param parser: the MDANSE option parser.
         @type parser: instance of MDANSEOptionParser
+
+        @param arguments: the command line arguments of the job file.
+        @type arguments: str
         """
 
-        if len(parser.rargs) != 1:
+        if not parser.rargs:
             raise CommandLineParserError(
                 "Invalid number of arguments for %r option" % opt_str
             )
 
         filename = parser.rargs[0]
 
+        options = parser.rargs[1:]
+        del parser.rargs[1:]
+        try:
+            parse_run_options(options, strict=True)
+        except RunOptionError as e:
+            raise CommandLineParserError(str(e))
+
         if not os.path.exists(filename):
             raise CommandLineParserError(
                 "The job file %r could not be executed" % filename
             )
 
-        subprocess.Popen([sys.executable, filename])
+        subprocess.Popen([sys.executable, filename, *arguments, *options])
+
+    def run_job(self, option, opt_str, value, parser):
+        """Run job file(s).
+
+        @param option: the option that triggered the callback.
+        @type option: optparse.Option instance
+
+        @param opt_str: the option string seen on the command line.
+        @type opt_str: str
+
+        @param value: the argument for the option.
+        @type value: str
+
+        @param parser: the MDANSE option parser.
+        @type parser: instance of MDANSEOptionParser
+        """
+
+        self._run_job_script(opt_str, parser)
+
+    def resume_job(self, option, opt_str, value, parser):
+        """Run a job file, skipping the steps stored in the checkpoint of
+        an earlier run of the job which was stopped before the end.
+
+        @param option: the option that triggered the callback.
+        @type option: optparse.Option instance
+
+        @param opt_str: the option string seen on the command line.
+        @type opt_str: str
+
+        @param value: the argument for the option.
+        @type value: str
+
+        @param parser: the MDANSE option parser.
+        @type parser: instance of MDANSEOptionParser
+        """
+
+        self._run_job_script(opt_str, parser, "--resume")
+
+    def profile_job(self, option, opt_str, value, parser):
+        """Run a job file with the profiling of its steps, in the main
+        process and in every worker process. The merged statistics and
+        their summary are written next to the output files of the job.
+
+        @param option: the option that triggered the callback.
+        @type option: optparse.Option instance
+
+        @param opt_str: the option string seen on the command line.
+        @type opt_str: str
+
+        @param value: the argument for the option.
+        @type value: str
+
+        @param parser: the MDANSE option parser.
+        @type parser: instance of MDANSEOptionParser
+        """
+
+        self._run_job_script(opt_str, parser, "--profile")
+
+    def estimate_job(self, option, opt_str, value, parser):
+        """Display the memory and the time that a job file is expected to
+        need, without running it.
+
+        @param option: the option that triggered the callback.
+        @type option: optparse.Option instance
+
+        @param opt_str: the option string seen on the command line.
+        @type opt_str: str
+
+        @param value: the argument for the option.
+        @type value: str
+
+        @param parser: the MDANSE option parser.
+        @type parser: instance of MDANSEOptionParser
+        """
+
+        self._run_job_script(opt_str, parser, "--estimate")
 
     def save_job(self, option, opt_str, value, parser):
         """
@@ -402,6 +598,30 @@ def main():
         callback=parser.display_trajectory_contents,
         help="Display the chemical contents of a trajectory.",
     )
+    group.add_option(
+        "-s",
+        "--summary",
+        action="callback",
+        callback=parser.index_trajectory,
+        help="Store the summary of a trajectory written by an older version of MDANSE.",
+    )
+    group.add_option(
+        "-c",
+        "--concatenate",
+        action="callback",
+        callback=parser.concatenate_trajectories,
+        help="Write a virtual trajectory (first argument) which concatenates "
+        "trajectory segments (next arguments) without copying them.",
+    )
+    group.add_option(
+        "--view",
+        action="callback",
+        callback=parser.view_trajectory,
+        help="Write a virtual trajectory (first argument) which reads the "
+        "frames first:last:step (third argument) and the atoms, e.g. 0-9,20 "
+        "(fourth argument), of a trajectory (second argument) without "
+        "copying them.",
+    )
 
     # Add the goup to the parser.
     parser.add_option_group(group)
@@ -425,7 +645,34 @@ def main():
         help="Display the jobs list.",
     )
     group.add_option(
-        "--jr", action="callback", callback=parser.run_job, help="Run MDANSE job(s)."
+        "--jr",
+        action="callback",
+        callback=parser.run_job,
+        help="Run MDANSE job(s). The arguments after the job script are the "
+        "options of the run, e.g. --result-cache to read and store the "
+        "results in the result cache, --intermediate-store to share the "
+        "quantities computed from the trajectory with the next jobs and "
+        "--max-memory=4GiB or --max-wall-time=2h to refuse the jobs which "
+        "need more and --memory-budget=8GiB to stop workers of a multicore "
+        "job above this memory.",
+    )
+    group.add_option(
+        "--resume",
+        action="callback",
+        callback=parser.resume_job,
+        help="Resume a MDANSE job script from the checkpoint of a stopped run.",
+    )
+    group.add_option(
+        "--profile",
+        action="callback",
+        callback=parser.profile_job,
+        help="Run a MDANSE job script and profile its steps in every process.",
+    )
+    group.add_option(
+        "--estimate",
+        action="callback",
+        callback=parser.estimate_job,
+        help="Display the memory and time needed by a MDANSE job script.",
     )
     group.add_option(
         "--js",
@@ -21,6 +21,7 @@ import h5py
 
 from MDANSE.MLogging import LOG
 from MDANSE.Framework.Units import measure
+from MDANSE.Framework.Performance import recorded_read
 from MDANSE.Chemistry import ATOMS_DATABASE
 from MDANSE.Chemistry.ChemicalEntity import ChemicalSystem
 from MDANSE.Extensions import com_trajectory
@@ -28,6 +29,7 @@ from MDANSE.MolecularDynamics.Configuration import (
     PeriodicRealConfiguration,
     RealConfiguration,
 )
+from MDANSE.MolecularDynamics.TopologyCache import TopologyCache, hash_h5_items
 from MDANSE.MolecularDynamics.TrajectoryUtils import (
     resolve_undefined_molecules_name,
     atomic_trajectory,
@@ -41,16 +43,23 @@ class H5MDTrajectory:
     H5MD files created by MDMC.
     """
 
-    def __init__(self, h5_filename):
+    def __init__(self, h5_filename, h5_file=None):
         """Constructor.
 
         :param h5_filename: the trajectory filename
         :type h5_filename: str
+
+        :param h5_file: the trajectory file, if it has already been opened for reading
+        :type h5_file: h5py.File
         """
 
         self._h5_filename = h5_filename
 
-        self._h5_file = h5py.File(self._h5_filename, "r")
+        if h5_file is None:
+            h5_file = h5py.File(self._h5_filename, "r")
+        self._h5_file = h5_file
+
+        self._topology_cache = None
 
         # Load the chemical system
         try:
@@ -91,24 +100,33 @@ class H5MDTrajectory:
         self._variables_to_skip = []
 
     @classmethod
-    def file_is_right(self, filename):
-        result = True
+    def probe(cls, h5_file):
+        """Check whether an opened HDF5 file has the layout of an H5MD
+        trajectory. Only the names of the groups are checked, no data
+        is read.
+
+        :param h5_file: the HDF5 file
+        :type h5_file: h5py.File
+
+        :return: True if the file can be read as an H5MD trajectory
+        :rtype: bool
+        """
+        return "h5md" in h5_file and "/particles/all/position/value" in h5_file
+
+    @classmethod
+    def file_is_right(cls, filename):
         try:
-            temp = h5py.File(filename)
-        except:
-            result = False
-        else:
-            try:
-                temp["h5md"]
-            except:
-                result = False
-        return result
+            with h5py.File(filename, "r") as h5_file:
+                return cls.probe(h5_file)
+        except OSError:
+            return False
 
     def close(self):
         """Close the trajectory."""
 
         self._h5_file.close()
 
+    @recorded_read(single_frame=True)
     def __getitem__(self, frame):
         """Return the configuration at a given frame
 
@@ -160,6 +178,7 @@ class H5MDTrajectory:
         self.__dict__ = state
         self._h5_file = h5py.File(state["_h5_filename"], "r")
 
+    @recorded_read(single_frame=True)
     def charges(self, frame):
         """Return the electrical charge of atoms at a given frame.
 
@@ -186,6 +205,7 @@ class H5MDTrajectory:
 
         return charge.astype(np.float64)
 
+    @recorded_read(single_frame=True)
     def coordinates(self, frame):
         """Return the coordinates at a given frame.
 
@@ -211,6 +231,7 @@ class H5MDTrajectory:
 
         return retval.astype(np.float64) * conv_factor
 
+    @recorded_read(single_frame=True)
     def configuration(self, frame):
         """Build and return a configuration at a given frame.
 
@@ -323,6 +344,15 @@ class H5MDTrajectory:
 
         return grp.shape[0]
 
+    def refresh(self):
+        """H5MD files are not written in SWMR mode by MDANSE.
+
+        :return: the number of frames of the trajectory
+        :rtype: int
+        """
+        return len(self)
+
+    @recorded_read(single_frame=False)
     def read_com_trajectory(
         self, atoms, first=0, last=None, step=1, box_coordinates=False
     ):
@@ -388,16 +418,9 @@ class H5MDTrajectory:
                 ]
             )
 
-            top_lvl_chemical_entities = set(
-                [at.top_level_chemical_entity for at in atoms]
+            top_lvl_chemical_entities_indexes, bonds = self.topology_cache.com_topology(
+                self._chemical_system, indexes
             )
-            top_lvl_chemical_entities_indexes = [
-                [at.index for at in e.atom_list] for e in top_lvl_chemical_entities
-            ]
-            bonds = {}
-            for e in top_lvl_chemical_entities:
-                for at in e.atom_list:
-                    bonds[at.index] = [other_at.index for other_at in at.bonds]
 
             com_traj = com_trajectory.com_trajectory(
                 coords,
@@ -447,6 +470,7 @@ class H5MDTrajectory:
         else:
             return box_coordinates
 
+    @recorded_read(single_frame=False)
     def read_atomic_trajectory(
         self, index, first=0, last=None, step=1, box_coordinates=False
     ):
@@ -501,6 +525,7 @@ class H5MDTrajectory:
         else:
             return coords
 
+    @recorded_read(single_frame=False)
     def read_configuration_trajectory(
         self, index, first=0, last=None, step=1, variable="velocities"
     ):
@@ -562,6 +587,22 @@ class H5MDTrajectory:
         """
         return self._chemical_system
 
+    @property
+    def topology_cache(self):
+        """Return the cache of the data derived from the chemical system.
+
+        :return: the topology cache
+        :rtype: MDANSE.MolecularDynamics.TopologyCache.TopologyCache
+        """
+        if self._topology_cache is None:
+            self._topology_cache = TopologyCache(
+                hash_h5_items(
+                    self._h5_file,
+                    ["/parameters/atom_symbols", "/particles/all/species"],
+                )
+            )
+        return self._topology_cache
+
     @property
     def file(self):
         """Return the trajectory file object.
@@ -19,6 +19,7 @@ import numpy as np
 import h5py
 
 from MDANSE.MLogging import LOG
+from MDANSE.Framework.Performance import recorded_read
 from MDANSE.Chemistry import ATOMS_DATABASE
 from MDANSE.Chemistry.ChemicalEntity import ChemicalSystem
 from MDANSE.Extensions import com_trajectory
@@ -26,6 +27,8 @@ from MDANSE.MolecularDynamics.Configuration import (
     PeriodicRealConfiguration,
     RealConfiguration,
 )
+from MDANSE.MolecularDynamics.TopologyCache import TopologyCache, hash_h5_items
+from MDANSE.MolecularDynamics.TrajectorySummary import TrajectorySummary
 from MDANSE.MolecularDynamics.TrajectoryUtils import (
     resolve_undefined_molecules_name,
     atomic_trajectory,
@@ -33,28 +36,52 @@ from MDANSE.MolecularDynamics.TrajectoryUtils import (
 from MDANSE.MolecularDynamics.UnitCell import UnitCell
 
 
+def open_trajectory_file(filename):
+    """Open a trajectory file for reading. A file which is still being
+    written in SWMR mode (e.g. by a converter following a running
+    simulation) can only be read by opening it in SWMR mode as well.
+
+    :param filename: the trajectory filename
+    :type filename: str
+
+    :return: the opened file
+    :rtype: h5py.File
+    """
+    try:
+        return h5py.File(filename, "r")
+    except OSError:
+        return h5py.File(filename, "r", swmr=True)
+
+
 class MdanseTrajectory:
     """This used to be Trajectory, but has now been renamed.
     Trajectory is now a wrapper object, and MdanseTrajectory
     is the original implementation of the Mdanse HDF5 format.
     """
 
-    def __init__(self, h5_filename):
+    def __init__(self, h5_filename, h5_file=None):
         """Constructor.
 
         :param h5_filename: the trajectory filename
         :type h5_filename: str
+
+        :param h5_file: the trajectory file, if it has already been opened for reading
+        :type h5_file: h5py.File
         """
 
         self._h5_filename = h5_filename
 
-        self._h5_file = h5py.File(self._h5_filename, "r")
+        if h5_file is None:
+            h5_file = open_trajectory_file(self._h5_filename)
+        self._h5_file = h5_file
+
+        self._topology_cache = None
 
         # Load the chemical system
         self._chemical_system = ChemicalSystem(
             os.path.splitext(os.path.basename(self._h5_filename))[0]
         )
-        self._chemical_system.load(self._h5_filename)
+        self._chemical_system.load(self._h5_file)
 
         # Load all the unit cells
         self._load_unit_cells()
@@ -72,27 +99,39 @@ class MdanseTrajectory:
         resolve_undefined_molecules_name(self._chemical_system)
 
     @classmethod
-    def file_is_right(self, filename):
-        result = True
+    def probe(cls, h5_file):
+        """Check whether an opened HDF5 file has the layout of an MDANSE
+        trajectory. Only the names of the groups, datasets and attributes
+        are checked, no data is read.
+
+        :param h5_file: the HDF5 file
+        :type h5_file: h5py.File
+
+        :return: True if the file can be read as an MDANSE trajectory
+        :rtype: bool
+        """
+        grp = h5_file.get("/chemical_system")
+        return (
+            isinstance(grp, h5py.Group)
+            and "contents" in grp
+            and "name" in grp.attrs
+            and "/configuration/coordinates" in h5_file
+        )
+
+    @classmethod
+    def file_is_right(cls, filename):
         try:
-            temp = h5py.File(filename)
-        except:
-            result = False
-        else:
-            try:
-                temp_cs = ChemicalSystem(
-                    os.path.splitext(os.path.basename(filename))[0]
-                )
-                temp_cs.load(filename)
-            except:
-                result = False
-        return result
+            with open_trajectory_file(filename) as h5_file:
+                return cls.probe(h5_file)
+        except OSError:
+            return False
 
     def close(self):
         """Close the trajectory."""
 
         self._h5_file.close()
 
+    @recorded_read(single_frame=True)
     def __getitem__(self, frame):
         """Return the configuration at a given frame
 
@@ -121,8 +160,9 @@ class MdanseTrajectory:
 
     def __setstate__(self, state):
         self.__dict__ = state
-        self._h5_file = h5py.File(state["_h5_filename"], "r")
+        self._h5_file = open_trajectory_file(state["_h5_filename"])
 
+    @recorded_read(single_frame=True)
     def charges(self, frame):
         """Return the electrical charge of atoms at a given frame.
 
@@ -149,6 +189,7 @@ class MdanseTrajectory:
 
         return charges.astype(np.float64)
 
+    @recorded_read(single_frame=True)
     def coordinates(self, frame):
         """Return the coordinates at a given frame.
 
@@ -166,6 +207,7 @@ class MdanseTrajectory:
 
         return grp["coordinates"][frame].astype(np.float64)
 
+    @recorded_read(single_frame=True)
     def configuration(self, frame):
         """Build and return a configuration at a given frame.
 
@@ -208,6 +250,22 @@ class MdanseTrajectory:
         else:
             self._unit_cells = None
 
+    def refresh(self):
+        """Make the frames written since the trajectory was opened visible,
+        if the file is still being written in SWMR mode.
+
+        :return: the number of frames of the trajectory
+        :rtype: int
+        """
+        if self._h5_file.swmr_mode:
+            for dset in self._h5_file["/configuration"].values():
+                dset.refresh()
+            for name in ("time", "unit_cell"):
+                if name in self._h5_file:
+                    self._h5_file[name].refresh()
+            self._load_unit_cells()
+        return len(self)
+
     def time(self):
         return self._h5_file["time"][:]
 
@@ -240,6 +298,7 @@ class MdanseTrajectory:
 
         return grp["coordinates"].shape[0]
 
+    @recorded_read(single_frame=False)
     def read_com_trajectory(
         self, atoms, first=0, last=None, step=1, box_coordinates=False
     ):
@@ -281,16 +340,9 @@ class MdanseTrajectory:
             direct_cells = np.array([uc.transposed_direct for uc in self._unit_cells])
             inverse_cells = np.array([uc.transposed_inverse for uc in self._unit_cells])
 
-            top_lvl_chemical_entities = set(
-                [at.top_level_chemical_entity for at in atoms]
+            top_lvl_chemical_entities_indexes, bonds = self.topology_cache.com_topology(
+                self._chemical_system, indexes
             )
-            top_lvl_chemical_entities_indexes = [
-                [at.index for at in e.atom_list] for e in top_lvl_chemical_entities
-            ]
-            bonds = {}
-            for e in top_lvl_chemical_entities:
-                for at in e.atom_list:
-                    bonds[at.index] = [other_at.index for other_at in at.bonds]
 
             com_traj = com_trajectory.com_trajectory(
                 coords,
@@ -340,6 +392,7 @@ class MdanseTrajectory:
         else:
             return box_coordinates
 
+    @recorded_read(single_frame=False)
     def read_atomic_trajectory(
         self, index, first=0, last=None, step=1, box_coordinates=False
     ):
@@ -386,6 +439,7 @@ class MdanseTrajectory:
         else:
             return coords
 
+    @recorded_read(single_frame=False)
     def read_configuration_trajectory(
         self, index, first=0, last=None, step=1, variable="velocities"
     ):
@@ -447,6 +501,32 @@ class MdanseTrajectory:
         """
         return self._chemical_system
 
+    @property
+    def summary(self):
+        """Return the statistics stored in the /summary group of the trajectory
+        by TrajectoryWriter or by TrajectorySummary.index_trajectory.
+
+        :return: the summary, or None if the file has no summary or if it does not match the trajectory
+        :rtype: dict
+        """
+        summary = TrajectorySummary.read(self._h5_file)
+        if summary is None or summary["n_frames"] != len(self):
+            return None
+        return summary
+
+    @property
+    def topology_cache(self):
+        """Return the cache of the data derived from the chemical system.
+
+        :return: the topology cache
+        :rtype: MDANSE.MolecularDynamics.TopologyCache.TopologyCache
+        """
+        if self._topology_cache is None:
+            self._topology_cache = TopologyCache(
+                hash_h5_items(self._h5_file, ["/chemical_system"])
+            )
+        return self._topology_cache
+
     @property
     def file(self):
         """Return the trajectory file object.
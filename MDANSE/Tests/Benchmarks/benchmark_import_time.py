@@ -0,0 +1,108 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Measures the time needed to import the MDANSE modules used at the
+startup of the command line interface and of the job workers.
+
+Every measurement is done in a new interpreter, so that the modules
+imported by a previous measurement are not already loaded.
+
+Usage: python benchmark_import_time.py [-n REPEATS] [--details]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "MDANSE": "import MDANSE",
+    "IJob registry": "from MDANSE.Framework.Jobs.IJob import IJob",
+    "job list": (
+        "from MDANSE.Framework.Jobs.IJob import IJob; IJob.indirect_subclasses()"
+    ),
+    "create one job": (
+        "from MDANSE.Framework.Jobs.IJob import IJob; IJob.create('Density')"
+    ),
+    "import all jobs": (
+        "from MDANSE.Framework.Jobs.IJob import IJob;"
+        " IJob.indirect_subclass_dictionary()"
+    ),
+    "command line interface": "import MDANSE.Scripts.mdanse",
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def time_statement(statement: str, repeats: int) -> list[float]:
+    results = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(float(output.split()[-1]))
+    return results
+
+
+def import_details(statement: str, count: int = 15) -> str:
+    """Returns the slowest imports reported by python -X importtime."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    lines = []
+    for line in stderr.splitlines()[1:]:
+        try:
+            _, cumulative, name = line.split("|")
+            lines.append((int(cumulative), name.strip()))
+        except ValueError:
+            continue
+    lines.sort(reverse=True)
+    return "\n".join(f"    {t / 1e6:8.3f} s  {name}" for t, name in lines[:count])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--repeats", type=int, default=5)
+    parser.add_argument(
+        "--details",
+        action="store_true",
+        help="show the slowest imports of each statement",
+    )
+    args = parser.parse_args()
+
+    # The first run fills the caches (bytecode, class manifest).
+    time_statement(STATEMENTS["job list"], 1)
+
+    print(f"{'statement':<25}{'median (s)':>12}{'min (s)':>12}")
+    for label, statement in STATEMENTS.items():
+        results = time_statement(statement, args.repeats)
+        print(f"{label:<25}{statistics.median(results):>12.3f}{min(results):>12.3f}")
+        if args.details:
+            print(import_details(statement))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+#    This file is part of MDANSE.
+#
+#    MDANSE is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Runs the analysis jobs on synthetic trajectories of several sizes and
+records their throughput, peak memory and output checksums.
+
+The trajectories are generated with MockTrajectory, as a supercell of
+Si, O and H atoms vibrating in two modulations, and written with
+TrajectoryWriter. Every job is then run with its default parameters, in
+single-core and in multicore mode, each run in a new interpreter so that
+its peak resident memory is measured on its own. The jobs which cannot
+analyse such a system, e.g. the jobs which need molecules, are reported
+as failed with their error.
+
+For every run, the results are:
+    - the throughput, in atom-frames per second: the number of atoms of
+      the trajectory times the number of frames read, divided by the wall
+      time of IJob.run;
+    - the peak resident memory of the main process and of the largest
+      worker process, in MiB;
+    - the wall time and the peak memory predicted by
+      IJob.estimate_resources, to calibrate ResourceEstimate;
+    - a checksum of the output files. The HDF5 datasets are rounded to
+      CHECKSUM_BITS bits of mantissa first, so that the checksums do not
+      depend on the order of the floating point operations.
+
+The results can be written to a JSON file and compared with those of a
+previous release, to detect the regressions of performance and the
+changes of the results.
+
+Usage:
+    python benchmark_jobs.py [--atoms N ...] [--frames N ...] [--jobs NAME ...]
+        [--processes N] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import h5py
+import numpy as np
+
+# the number of atoms and of frames of the trajectories, by scale
+SCALES = {
+    "small": ([1000], [100]),
+    "medium": ([1000, 10000], [100, 1000]),
+    "large": ([1000, 10000, 100000, 1000000], [100, 1000, 10000]),
+}
+
+# the number of bits of mantissa kept in the checksums of the datasets
+CHECKSUM_BITS = 20
+
+# the parameters of the jobs which are not left to their defaults
+PARAMETERS = {
+    "q_vectors": (
+        "SphericalLatticeQVectors",
+        {"seed": 1, "shells": (0.0, 5.0, 0.5), "n_vectors": 100, "width": 0.5},
+    ),
+    "q_values": (0.0, 10.0, 0.1),
+    "r_values": (0.0, 0.5, 0.01),
+    "instrument_resolution": ("Gaussian", {"sigma": 1.0, "mu": 0.0}),
+    "interpolation_order": 3,
+    "weights": "equal",
+}
+
+# the jobs which need another input than a trajectory
+EXCLUDED_JOBS = [
+    "McStasVirtualInstrument",
+    "NeutronDynamicTotalStructureFactor",
+    "StructureFactorFromScatteringFunction",
+]
+
+
+def analysis_jobs() -> list[str]:
+    """Returns the names of the jobs which analyse a trajectory."""
+    from MDANSE.Framework.Jobs.IJob import IJob
+
+    names = []
+    for name, job_class in IJob.indirect_subclass_dictionary().items():
+        category = getattr(job_class, "category", ())
+        if not category or category[0] != "Analysis" or name in EXCLUDED_JOBS:
+            continue
+        if "trajectory" in getattr(job_class, "settings", {}):
+            names.append(name)
+    return sorted(names)
+
+
+def write_trajectory(filename: str, n_atoms: int, n_frames: int) -> int:
+    """Writes a MockTrajectory of at least n_atoms atoms and n_frames frames
+    in an MDANSE trajectory file.
+
+    Returns the number of atoms of the trajectory.
+    """
+    from MDANSE.MolecularDynamics.Configuration import PeriodicRealConfiguration
+    from MDANSE.MolecularDynamics.MockTrajectory import MockTrajectory
+    from MDANSE.MolecularDynamics.Trajectory import TrajectoryWriter
+
+    repetitions = math.ceil((n_atoms / 3) ** (1 / 3))
+    mock = MockTrajectory(
+        number_of_frames=n_frames,
+        atoms_in_box=("Si", "O", "H"),
+        box_repetitions=(repetitions, repetitions, repetitions),
+        box_size=4.0 * np.eye(3),
+        pbc=True,
+    )
+    mock.set_coordinates(np.array([[1.0, 1.0, 1.0], [1.0, 2.0, 1.0], [1.0, 2.0, 1.9]]))
+    mock.modulate_structure(
+        polarisation=np.array([[1.0, 1.0, 0.0], [0.0, 0.0, 1.0], [0.0, 0.0, 0.0]]),
+        propagation_vector=np.array([0.0, 0.0, 0.0]),
+        period=20,
+        amplitude=0.2,
+    )
+    mock.modulate_structure(
+        polarisation=np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 1.0], [0.0, 1.0, 0.0]]),
+        propagation_vector=np.array([1.0, 0.0, 0.0]),
+        period=10,
+        amplitude=0.1,
+    )
+
+    chemical_system = mock.chemical_system
+    time_step = mock[1]["time"] - mock[0]["time"]
+    writer = TrajectoryWriter(
+        filename,
+        chemical_system,
+        n_frames,
+        initial_charges=np.zeros(chemical_system.number_of_atoms),
+    )
+    for frame in range(n_frames):
+        # the modulations are periodic, so are the velocities
+        velocities = (
+            mock.coordinates((frame + 1) % n_frames)
+            - mock.coordinates((frame - 1) % n_frames)
+        ) / (2 * time_step)
+        chemical_system.configuration = PeriodicRealConfiguration(
+            chemical_system,
+            mock.coordinates(frame),
+            mock.unit_cell(frame),
+            velocities=velocities,
+        )
+        writer.dump_configuration(
+            mock[frame]["time"],
+            units={
+                "time": "ps",
+                "unit_cell": "nm",
+                "coordinates": "nm",
+                "velocities": "nm/ps",
+            },
+        )
+    writer.close()
+    return chemical_system.number_of_atoms
+
+
+def checksum(filenames: list[str]) -> str:
+    """Returns a checksum of the output files of a job. The metadata of
+    the HDF5 files, which contain the dates and the timings of the job,
+    are ignored."""
+    digest = hashlib.sha256()
+    for filename in sorted(filenames):
+        if not os.path.exists(filename):
+            continue
+        if not h5py.is_hdf5(filename):
+            with open(filename, "rb") as source:
+                digest.update(source.read())
+            continue
+        datasets = []
+        with h5py.File(filename, "r") as h5_file:
+            h5_file.visititems(
+                lambda name, item: (
+                    datasets.append(name)
+                    if isinstance(item, h5py.Dataset)
+                    and not name.startswith("metadata")
+                    else None
+                )
+            )
+            for name in sorted(datasets):
+                data = h5_file[name][()]
+                digest.update(name.encode())
+                if np.issubdtype(np.asarray(data).dtype, np.floating):
+                    mantissa, exponent = np.frexp(np.nan_to_num(data))
+                    data = np.ldexp(
+                        np.round(mantissa * 2**CHECKSUM_BITS) / 2**CHECKSUM_BITS,
+                        exponent,
+                    )
+                digest.update(np.ascontiguousarray(data).tobytes())
+    return digest.hexdigest()
+
+
+def run_job(spec: dict) -> dict:
+    """Runs a job on a trajectory, in this process, and returns its
+    results."""
+    from MDANSE.Framework.Jobs.IJob import IJob
+
+    job = IJob.create(spec["job"])
+    settings = job.settings
+    parameters = {name: value for name, value in PARAMETERS.items() if name in settings}
+    parameters["trajectory"] = spec["trajectory"]
+    n_frames = spec["n_frames"]
+    if settings["frames"][0] == "CorrelationFramesConfigurator":
+        parameters["frames"] = (0, n_frames, 1, n_frames // 2)
+    else:
+        parameters["frames"] = (0, n_frames, 1)
+    parameters["output_files"] = {
+        "OutputFilesConfigurator": (spec["root"], ("MDAFormat",), "no logs"),
+        "OutputStructureConfigurator": (spec["root"], "vasp", "no logs"),
+        "OutputTrajectoryConfigurator": (spec["root"], 64, "none", "no logs"),
+    }[settings["output_files"][0]]
+    if spec["mode"] == "multicore":
+        parameters["running_mode"] = ("multicore", -spec["processes"])
+
+    job.setup(dict(parameters))
+    estimate = job.estimate_resources()
+
+    start = time.perf_counter()
+    job.run(parameters)
+    wall_time = time.perf_counter() - start
+
+    return {
+        "wall_time": wall_time,
+        "estimated_wall_time": estimate.wall_time,
+        "estimated_memory_mb": estimate.peak_memory / 2**20,
+        "atom_frames_per_s": (
+            spec["n_atoms"] * job.configuration["frames"]["number"] / wall_time
+        ),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_worker_rss_mb": (
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        ),
+        "checksum": checksum(job.output_filenames()),
+    }
+
+
+def benchmark(spec: dict) -> dict:
+    """Runs a job in a new interpreter and returns its results, or the
+    error which stopped it."""
+    process = subprocess.run(
+        [sys.executable, __file__, "--run", json.dumps(spec)],
+        capture_output=True,
+        text=True,
+    )
+    result = dict(spec)
+    del result["trajectory"], result["root"]
+    if process.returncode == 0:
+        result.update(json.loads(process.stdout.splitlines()[-1]))
+    else:
+        lines = process.stderr.strip().splitlines()
+        result["error"] = lines[-1] if lines else f"exit code {process.returncode}"
+    return result
+
+
+def key(result: dict) -> tuple:
+    return (result["job"], result["mode"], result["n_atoms"], result["n_frames"])
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> int:
+    """Prints the runs which are slower than in the baseline, or whose
+    outputs have changed, and returns their number."""
+    reference = {key(result): result for result in baseline}
+    regressions = 0
+    for result in results:
+        old = reference.get(key(result))
+        if old is None or "error" in old or "error" in result:
+            continue
+        ratio = result["atom_frames_per_s"] / old["atom_frames_per_s"]
+        changes = []
+        if ratio < tolerance:
+            changes.append(f"throughput x{ratio:.2f}")
+        if result["checksum"] != old["checksum"]:
+            changes.append("output changed")
+        if changes:
+            regressions += 1
+            print(f"REGRESSION {' '.join(map(str, key(result)))}: {', '.join(changes)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scale",
+        choices=list(SCALES),
+        default="small",
+        help="the sizes of the trajectories, unless --atoms or --frames are given",
+    )
+    parser.add_argument("--atoms", type=int, nargs="+")
+    parser.add_argument("--frames", type=int, nargs="+")
+    parser.add_argument("--jobs", nargs="+", help="the jobs to run (default: all)")
+    parser.add_argument("--modes", nargs="+", default=["single-core", "multicore"])
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=multiprocessing.cpu_count(),
+        help="the number of processes of the multicore runs",
+    )
+    parser.add_argument("--output", help="the JSON file of the results")
+    parser.add_argument("--compare", help="the JSON file of a previous run")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.8,
+        help="the smallest ratio of throughput to the baseline",
+    )
+    parser.add_argument("--run", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        print(json.dumps(run_job(json.loads(args.run))))
+        return
+
+    from MDANSE.Framework.Jobs.IJob import IJob
+
+    atoms = args.atoms or SCALES[args.scale][0]
+    frames = args.frames or SCALES[args.scale][1]
+    jobs = args.jobs or analysis_jobs()
+
+    results = []
+    print(
+        f"{'job':<42}{'mode':<13}{'atoms':>9}{'frames':>8}"
+        f"{'atom-frames/s':>15}{'wall (s)':>10}{'est. (s)':>10}"
+        f"{'rss (MiB)':>11}{'workers':>9}{'est. (MiB)':>12}  checksum"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for n_atoms in atoms:
+            for n_frames in frames:
+                trajectory = os.path.join(directory, f"mock_{n_atoms}_{n_frames}.mdt")
+                actual_atoms = write_trajectory(trajectory, n_atoms, n_frames)
+                for job in jobs:
+                    job_class = IJob.indirect_subclass_dictionary()[job]
+                    for mode in args.modes:
+                        if (
+                            mode == "multicore"
+                            and "running_mode" not in job_class.settings
+                        ):
+                            continue
+                        result = benchmark(
+                            {
+                                "job": job,
+                                "mode": mode,
+                                "processes": args.processes,
+                                "n_atoms": actual_atoms,
+                                "n_frames": n_frames,
+                                "trajectory": trajectory,
+                                "root": os.path.join(directory, f"{job}_{mode}"),
+                            }
+                        )
+                        results.append(result)
+                        line = f"{job:<42}{mode:<13}{actual_atoms:>9}{n_frames:>8}"
+                        if "error" in result:
+                            print(f"{line}  failed: {result['error']}")
+                        else:
+                            print(
+                                f"{line}{result['atom_frames_per_s']:>15.4g}"
+                                f"{result['wall_time']:>10.3g}"
+                                f"{result['estimated_wall_time']:>10.3g}"
+                                f"{result['peak_rss_mb']:>11.1f}"
+                                f"{result['peak_worker_rss_mb']:>9.1f}"
+                                f"{result['estimated_memory_mb']:>12.1f}"
+                                f"  {result['checksum'][:12]}"
+                            )
+                os.remove(trajectory)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline:
+            if compare(results, json.load(baseline), args.tolerance):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
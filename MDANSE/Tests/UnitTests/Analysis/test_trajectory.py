@@ -1,11 +1,14 @@
+import subprocess
 import sys
 import tempfile
 import os
 from os import path
 import pytest
 
-from MDANSE.Framework.Jobs.IJob import IJob
+import h5py
+import numpy as np
 
+from MDANSE.Framework.Jobs.IJob import IJob
 
 sys.setrecursionlimit(100000)
 short_traj = os.path.join(
@@ -89,6 +92,41 @@ def test_CroppedTrajectory(parameters):
     os.remove(temp_name + ".log")
 
 
+def test_trajectory_view_matches_CroppedTrajectory(parameters, tmp_path):
+    parameters["running_mode"] = ("single-core",)
+    parameters["frames"] = (2, 10, 3)
+    copy_name = str(tmp_path / "cropped")
+    parameters["output_files"] = (copy_name, 64, "none", "INFO")
+    IJob.create("CroppedTrajectory").run(parameters, status=True)
+
+    with h5py.File(copy_name + ".mdt") as copy:
+        n_atoms = copy["/configuration/coordinates"].shape[1]
+        expected = {
+            name: copy[name][:]
+            for name in ("/configuration/coordinates", "/unit_cell")
+            if name in copy
+        }
+    view_name = str(tmp_path / "view.mdt")
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "MDANSE.Scripts.mdanse",
+            "--view",
+            view_name,
+            short_traj,
+            "2:11:3",
+            f"0-{n_atoms - 1}",
+        ],
+        check=True,
+    )
+    with h5py.File(view_name) as view:
+        assert view["/configuration/coordinates"].is_virtual
+        assert len(view["/configuration/coordinates"]) == 3
+        for name, values in expected.items():
+            np.testing.assert_array_equal(view[name][:], values)
+
+
 def test_CenterOfMassesTrajectory(parameters):
     """This will need to detect molecules before it can
     find the centre of each one of them."""
@@ -6,6 +6,8 @@ from MDANSE.Framework.AtomSelector.atom_selectors import (
     select_hs_on_heteroatom,
     select_hs_on_element,
     select_dummy,
+    select_atom_name,
+    select_atom_fullname,
 )
 
 
@@ -89,3 +91,40 @@ def test_select_dummy_returns_correct_number_of_atom_matches(
 ):
     selection = select_dummy(protein_chemical_system)
     assert len(selection) == 0
+
+
+def test_select_element_matches_smarts_selection(
+    protein_chemical_system,
+):
+    selection = select_element(protein_chemical_system, "N")
+    assert selection == protein_chemical_system.get_substructure_matches("[#7]")
+
+
+def test_select_hs_on_oxygen_matches_smarts_selection(
+    protein_chemical_system,
+):
+    selection = select_hs_on_element(protein_chemical_system, "O")
+    xh_matches = protein_chemical_system.get_substructure_matches("[#8]~[H]")
+    x_matches = protein_chemical_system.get_substructure_matches("[#8]")
+    assert selection == xh_matches - x_matches
+
+
+def test_select_atom_name_returns_correct_number_of_atom_matches(
+    protein_chemical_system,
+):
+    selection = select_atom_name(protein_chemical_system, "SG")
+    assert len(selection) == 8
+    assert select_atom_name(protein_chemical_system, "SG", check_exists=True)
+    assert not select_atom_name(protein_chemical_system, "XX", check_exists=True)
+
+
+def test_select_atom_fullname_returns_indexes_of_named_atoms(
+    protein_chemical_system,
+):
+    atom = protein_chemical_system.atom_list[10]
+    selection = select_atom_fullname(protein_chemical_system, atom.full_name)
+    assert atom.index in selection
+    assert all(
+        protein_chemical_system.atom_list[idx].full_name == atom.full_name
+        for idx in selection
+    )
@@ -14,14 +14,31 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 import pytest
+import shutil
+import subprocess
+import sys
 import tempfile
 import os
 
+import h5py
 import numpy as np
 
 from MDANSE.Chemistry.ChemicalEntity import Atom, ChemicalSystem
-from MDANSE.MolecularDynamics.Configuration import RealConfiguration
-from MDANSE.MolecularDynamics.Trajectory import Trajectory, TrajectoryWriter
+from MDANSE.MolecularDynamics.Configuration import (
+    PeriodicRealConfiguration,
+    RealConfiguration,
+)
+from MDANSE.MolecularDynamics.Trajectory import (
+    Trajectory,
+    TrajectoryWriter,
+    available_formats,
+    storage_statistics,
+)
+from MDANSE.MolecularDynamics.TrajectorySummary import (
+    TrajectorySummary,
+    index_trajectory,
+)
+from MDANSE.MolecularDynamics.UnitCell import UnitCell
 
 N_ATOMS = 4
 N_TIMESTEPS = 150
@@ -132,3 +149,299 @@ def test_losslessness(sample_trajectory, gzipped_trajectory, lzffed_trajectory):
         assert np.allclose(
             traj.coordinates(step_number), traj_lzf.coordinates(step_number)
         )
+
+
+@pytest.mark.parametrize(
+    "filename, format_name",
+    [
+        ("short_trajectory_after_changes.mdt", "MDANSE"),
+        ("named_molecules.mdt", "MDANSE"),
+        ("Ar_mdmc_h5md.h5", "H5MD"),
+    ],
+)
+def test_format_is_guessed_from_file_layout(filename, format_name):
+    fname = os.path.join(os.path.dirname(__file__), "Data", filename)
+    for name, trajectory_class in available_formats.items():
+        assert trajectory_class.file_is_right(fname) == (name == format_name)
+    traj = Trajectory(fname)
+    assert traj._format == format_name
+    assert traj.chemical_system.number_of_atoms > 0
+    assert traj.file.id.valid
+    traj.close()
+
+
+def test_non_hdf5_file_is_rejected():
+    fname = os.path.join(os.path.dirname(__file__), "Data", "md.pdb")
+    for trajectory_class in available_formats.values():
+        assert not trajectory_class.file_is_right(fname)
+
+
+def test_loading_chemical_system_keeps_file_open(sample_trajectory):
+    with h5py.File(sample_trajectory, "r") as h5_file:
+        chemical_system = ChemicalSystem()
+        chemical_system.load(h5_file)
+        assert h5_file.id.valid
+    assert chemical_system.number_of_atoms == N_ATOMS
+
+
+@pytest.fixture(scope="module")
+def periodic_trajectory(chemical_system, sample_configuration):
+    fdesc, fname = tempfile.mkstemp()
+    os.close(fdesc)
+    writer = TrajectoryWriter(fname, chemical_system, n_steps=N_TIMESTEPS)
+    for ts in range(N_TIMESTEPS):
+        unit_cell = UnitCell((15.0 + 0.01 * ts) * np.eye(3))
+        configuration = PeriodicRealConfiguration(
+            chemical_system,
+            sample_configuration["coordinates"] * (1.0 + 0.001 * ts),
+            unit_cell,
+        )
+        writer.chemical_system.configuration = configuration
+        writer.dump_configuration(0.5 * ts)
+    writer.close()
+    return fname
+
+
+def test_summary_matches_trajectory(periodic_trajectory):
+    traj = Trajectory(periodic_trajectory)
+    summary = traj.summary
+    coords = np.array([traj.coordinates(n) for n in range(len(traj))])
+    spans = coords.max(axis=1) - coords.min(axis=1)
+    volumes = [np.linalg.det(traj.unit_cell(n).direct) for n in range(len(traj))]
+    assert summary["n_frames"] == N_TIMESTEPS
+    assert summary["time_first"] == 0.0
+    assert summary["time_last"] == pytest.approx(0.5 * (N_TIMESTEPS - 1))
+    assert summary["time_step"] == pytest.approx(0.5)
+    assert summary["time_step_is_regular"]
+    assert np.allclose(summary["min_span"], spans.min(axis=0))
+    assert np.allclose(summary["max_span"], spans.max(axis=0))
+    assert summary["volume_min"] == pytest.approx(min(volumes))
+    assert summary["volume_max"] == pytest.approx(max(volumes))
+    assert summary["volume_mean"] == pytest.approx(np.mean(volumes))
+    assert np.allclose(summary["variables"]["coordinates"]["min"], coords.min((0, 1)))
+    assert np.allclose(summary["variables"]["coordinates"]["max"], coords.max((0, 1)))
+    assert np.allclose(traj.max_span, spans.max(axis=0))
+    traj.close()
+
+
+def test_index_trajectory_rebuilds_summary(periodic_trajectory):
+    fdesc, fname = tempfile.mkstemp()
+    os.close(fdesc)
+    shutil.copy(periodic_trajectory, fname)
+    with h5py.File(fname, "r+") as h5_file:
+        expected = TrajectorySummary.read(h5_file)
+        del h5_file["summary"]
+    traj = Trajectory(fname)
+    assert traj.summary is None
+    traj.close()
+
+    index_trajectory(fname, max_block_size=1000)
+
+    traj = Trajectory(fname)
+    summary = traj.summary
+    for key in ["n_frames", "time_first", "time_last", "time_step", "volume_mean"]:
+        assert summary[key] == pytest.approx(expected[key])
+    for key in ["min_span", "max_span"]:
+        assert np.allclose(summary[key], expected[key])
+    traj.close()
+    os.remove(fname)
+
+
+def test_summary_ignores_atoms_not_selected(chemical_system, sample_configuration):
+    fdesc, fname = tempfile.mkstemp()
+    os.close(fdesc)
+    writer = TrajectoryWriter(
+        fname,
+        chemical_system,
+        n_steps=2,
+        selected_atoms=chemical_system.atom_list[:2],
+    )
+    for ts in range(2):
+        writer.chemical_system.configuration = sample_configuration
+        writer.dump_configuration(ts)
+    writer.close()
+    traj = Trajectory(fname)
+    assert np.allclose(traj.summary["max_span"], [0.0, 1.0, 0.0])
+    traj.close()
+    os.remove(fname)
+
+
+@pytest.mark.parametrize(
+    "buffer_frames,background_flush", [(1, False), (7, False), (7, True), (None, True)]
+)
+def test_buffered_writes(
+    chemical_system, sample_configuration, buffer_frames, background_flush
+):
+    fdesc, fname = tempfile.mkstemp()
+    os.close(fdesc)
+    n_frames = 20
+    writer = TrajectoryWriter(
+        fname,
+        chemical_system,
+        n_steps=n_frames + 5,
+        compression="gzip",
+        buffer_frames=buffer_frames,
+        background_flush=background_flush,
+    )
+    for ts in range(n_frames):
+        writer.chemical_system.configuration = PeriodicRealConfiguration(
+            chemical_system,
+            sample_configuration["coordinates"] + ts,
+            UnitCell((15.0 + ts) * np.eye(3)),
+        )
+        writer.dump_configuration(0.5 * ts, units={"time": "ps"})
+    writer.close()
+
+    with h5py.File(fname, "r") as h5_file:
+        assert h5_file["time"].attrs["units"] == "ps"
+        assert np.allclose(h5_file["time"][:], 0.5 * np.arange(n_frames))
+        coords = h5_file["/configuration/coordinates"][:]
+        assert coords.shape == (n_frames, N_ATOMS, 3)
+        for ts in range(n_frames):
+            assert np.allclose(coords[ts], sample_configuration["coordinates"] + ts)
+        assert np.allclose(h5_file["unit_cell"][:, 0, 0], 15.0 + np.arange(n_frames))
+    os.remove(fname)
+
+
+@pytest.mark.parametrize("background_flush", [False, True])
+def test_buffer_is_cleared_after_a_flush(
+    chemical_system, sample_configuration, background_flush
+):
+    fdesc, fname = tempfile.mkstemp()
+    os.close(fdesc)
+    writer = TrajectoryWriter(
+        fname,
+        chemical_system,
+        n_steps=4,
+        buffer_frames=2,
+        background_flush=background_flush,
+    )
+    coords = sample_configuration["coordinates"]
+    # only the first two frames have velocities and a unit cell
+    for ts in range(4):
+        if ts < 2:
+            configuration = PeriodicRealConfiguration(
+                chemical_system,
+                coords,
+                UnitCell(15.0 * np.eye(3)),
+                velocities=np.ones((N_ATOMS, 3)),
+            )
+        else:
+            configuration = RealConfiguration(chemical_system, coords)
+        writer.chemical_system.configuration = configuration
+        writer.dump_configuration(ts)
+    writer.close()
+
+    with h5py.File(fname, "r") as h5_file:
+        velocities = h5_file["/configuration/velocities"][:]
+        assert np.all(velocities[:2] == 1.0)
+        assert np.all(np.isnan(velocities[2:]))
+        assert np.all(h5_file["unit_cell"][2:] == 0.0)
+    os.remove(fname)
+
+
+@pytest.mark.parametrize(
+    "compression,dtype,tolerance",
+    [
+        ("none", np.float64, 0.0),
+        ("shuffle_gzip", np.float64, 0.0),
+        ("none", np.float32, 1e-5),
+        ("scale_offset", np.float64, 1e-3),
+    ],
+)
+def test_storage_profiles(chemical_system, compression, dtype, tolerance):
+    fdesc, fname = tempfile.mkstemp()
+    os.close(fdesc)
+    rng = np.random.default_rng(42)
+    coords = 15.0 * rng.random((40, N_ATOMS, 3))
+    # the velocities are much smaller than the precision of the coordinates
+    velocities = 1e-4 * rng.random((40, N_ATOMS, 3))
+    writer = TrajectoryWriter(
+        fname,
+        chemical_system,
+        n_steps=len(coords),
+        positions_dtype=dtype,
+        compression=compression,
+        precision=1e-3,
+    )
+    for ts, frame in enumerate(coords):
+        writer.chemical_system.configuration = RealConfiguration(
+            chemical_system, frame, velocities=velocities[ts]
+        )
+        writer.dump_configuration(ts)
+    writer.close()
+
+    assert storage_statistics(fname)["velocities"]["scaleoffset"] is None
+    with h5py.File(fname, "r") as h5_file:
+        np.testing.assert_allclose(
+            h5_file["configuration/velocities"][:], velocities, rtol=tolerance
+        )
+    statistics = storage_statistics(fname)["coordinates"]
+    assert statistics["shuffle"] == (compression == "shuffle_gzip")
+    if compression == "scale_offset":
+        assert statistics["scaleoffset"] == 3
+        assert statistics["precision"] == pytest.approx(1e-3)
+        assert statistics["compression_ratio"] > 2.0
+    assert statistics["read_throughput"] > 0.0
+
+    traj = Trajectory(fname)
+    for ts in (0, len(coords) - 1):
+        read = traj.coordinates(ts)
+        assert read.dtype == np.float64
+        assert np.max(np.abs(read - coords[ts])) <= tolerance
+    traj.close()
+    os.remove(fname)
+
+
+SWMR_READER = """
+import sys
+from MDANSE.MolecularDynamics.Trajectory import Trajectory
+
+traj = Trajectory(sys.argv[1])
+print(len(traj), flush=True)
+sys.stdin.readline()
+print(len(traj), traj.refresh(), traj.coordinates(9)[0, 0], flush=True)
+traj.close()
+"""
+
+
+def test_swmr_frames_can_be_read_while_written(chemical_system, sample_configuration):
+    fdesc, fname = tempfile.mkstemp()
+    os.close(fdesc)
+    # n_steps only sizes the buffers, the trajectory grows beyond it
+    writer = TrajectoryWriter(
+        fname, chemical_system, n_steps=4, buffer_frames=4, swmr=True
+    )
+
+    def write_frames(frames):
+        for ts in frames:
+            writer.chemical_system.configuration = PeriodicRealConfiguration(
+                chemical_system,
+                sample_configuration["coordinates"] + ts,
+                UnitCell((15.0 + ts) * np.eye(3)),
+            )
+            writer.write_charges(np.full(N_ATOMS, 0.5), ts)
+            writer.dump_configuration(0.5 * ts, units={"time": "ps"})
+        writer.flush()
+
+    # the reader must be another process, HDF5 shares the file within one
+    write_frames(range(6))
+    reader = subprocess.Popen(
+        [sys.executable, "-c", SWMR_READER, fname],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert reader.stdout.readline().split() == ["6"]
+    write_frames(range(6, 10))
+    output, _ = reader.communicate("\n", timeout=60)
+    assert output.split() == ["6", "10", "10.0"]
+    writer.close()
+
+    traj = Trajectory(fname)
+    assert len(traj) == 10
+    np.testing.assert_allclose(traj.time(), 0.5 * np.arange(10))
+    np.testing.assert_allclose(traj.charges(3), 0.5)
+    assert traj.summary["n_frames"] == 10
+    traj.close()
+    os.remove(fname)
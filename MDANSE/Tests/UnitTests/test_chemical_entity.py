@@ -2382,6 +2382,27 @@ class TestChemicalSystem(unittest.TestCase):
             "ChemicalSystem name consisting of 1 chemical entities", str(self.system)
         )
 
+    def test_substructure_matches_are_cached_until_entity_added(self):
+        self.system.add_chemical_entity(ce.Molecule("WAT", "name"))
+
+        self.assertEqual({0}, self.system.get_substructure_matches("[#8]"))
+        self.assertIn(("matches", "[#8]", 1000000), self.system._substructure_cache)
+        self.assertTrue(self.system.has_substructure_match("[#8]"))
+
+        self.system.add_chemical_entity(ce.Molecule("WAT", "other"))
+        self.assertEqual({}, self.system._substructure_cache)
+        self.assertEqual({0, 3}, self.system.get_substructure_matches("[#8]"))
+
+    def test_selection_arrays(self):
+        self.system.add_chemical_entity(ce.Molecule("WAT", "name"))
+
+        np.testing.assert_array_equal([8, 1, 1], self.system.atomic_numbers)
+        np.testing.assert_array_equal(["OW", "HW2", "HW1"], self.system.atom_names)
+        self.assertEqual(
+            {(0, 1), (0, 2)},
+            set(tuple(sorted(bond)) for bond in self.system.bond_indices.tolist()),
+        )
+
     def test_atom_list(self):
         atom1 = ce.Atom(ghost=False)
         atom2 = ce.Atom(ghost=False)
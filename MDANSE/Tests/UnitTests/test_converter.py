@@ -1,13 +1,19 @@
+import multiprocessing
 import os
 import tempfile
+import threading
+import time
+
+import h5py
+import numpy as np
 import pytest
 from MDANSE.Framework.Converters.Converter import Converter
+from MDANSE.Framework.Converters.DCD import DCDFile, EndOfFile
 from MDANSE.Framework.Jobs.IJob import JobError
 from MDANSE.Framework.Configurators.HDFTrajectoryConfigurator import (
     HDFTrajectoryConfigurator,
 )
 
-
 file_wd = os.path.dirname(os.path.realpath(__file__))
 
 lammps_config = os.path.join(file_wd, "Data", "lammps_test.config")
@@ -125,6 +131,140 @@ def test_lammps_mdt_conversion_trajectory_format(trajectory_file, trajectory_for
     os.remove(temp_name + ".log")
 
 
+def test_lammps_custom_conversion_does_not_depend_on_atom_order(tmp_path):
+    # the atoms of every frame after the first one are written in reverse order
+    shuffled = str(tmp_path / "shuffled.txt")
+    with open(lammps_custom) as source, open(shuffled, "w") as target:
+        frames = source.read().split("ITEM: TIMESTEP\n")[1:]
+        for n, frame in enumerate(frames):
+            header, atoms = frame.split("ITEM: ATOMS id type x y z\n")
+            lines = atoms.splitlines(keepends=True)
+            if n > 0:
+                lines = lines[::-1]
+            target.write("ITEM: TIMESTEP\n" + header)
+            target.write("ITEM: ATOMS id type x y z\n" + "".join(lines))
+
+    coordinates = []
+    for trajectory_file in (lammps_custom, shuffled):
+        temp_name = str(tmp_path / os.path.basename(trajectory_file))
+        parameters = {
+            "config_file": lammps_moly,
+            "mass_tolerance": 0.05,
+            "n_steps": 0,
+            "output_files": (temp_name, 64, "none", "INFO"),
+            "smart_mass_association": True,
+            "time_step": 1.0,
+            "trajectory_file": trajectory_file,
+            "trajectory_format": "custom",
+            "lammps_units": "electron",
+        }
+        Converter.create("LAMMPS").run(parameters, status=True)
+        with h5py.File(temp_name + ".mdt") as output:
+            coordinates.append(output["configuration/coordinates"][:])
+
+    np.testing.assert_array_equal(coordinates[0], coordinates[1])
+
+
+@pytest.mark.parametrize(
+    "trajectory_file,trajectory_format",
+    [(lammps_custom, "custom"), (lammps_xyz, "xyz"), (lammps_h5md, "h5md")],
+)
+def test_lammps_multicore_conversion_matches_single_core(
+    tmp_path, monkeypatch, trajectory_file, trajectory_format
+):
+    # several workers are needed for the frames to arrive out of order
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 4)
+    outputs = []
+    for running_mode in ("single-core", ("multicore", 3)):
+        temp_name = str(tmp_path / f"output{len(outputs)}")
+        parameters = {
+            "config_file": lammps_moly,
+            "mass_tolerance": 0.05,
+            "n_steps": 0,
+            "output_files": (temp_name, 64, "none", "INFO"),
+            "smart_mass_association": True,
+            "time_step": 1.0,
+            "trajectory_file": trajectory_file,
+            "trajectory_format": trajectory_format,
+            "lammps_units": "electron",
+            "running_mode": running_mode,
+        }
+        Converter.create("LAMMPS").run(parameters, status=True)
+        with h5py.File(temp_name + ".mdt") as output:
+            outputs.append(
+                {
+                    name: output[name][:]
+                    for name in ("configuration/coordinates", "time", "unit_cell")
+                }
+            )
+
+    for name, values in outputs[0].items():
+        np.testing.assert_array_equal(values, outputs[1][name])
+
+
+@pytest.mark.parametrize(
+    "trajectory_file,trajectory_format",
+    [(lammps_custom, "custom"), (lammps_xyz, "xyz")],
+)
+def test_lammps_follow_mode_converts_frames_appended_while_running(
+    tmp_path, monkeypatch, trajectory_file, trajectory_format
+):
+    from MDANSE.Framework.Converters.LAMMPS import LAMMPS
+
+    monkeypatch.setattr(LAMMPS, "follow_poll_interval", 0.05)
+    with open(trajectory_file, "rb") as source:
+        content = source.read()
+    # the simulation has written two frames and a half when the conversion starts
+    growing = str(tmp_path / f"growing_{trajectory_format}.txt")
+    cut = len(content) // 4
+    with open(growing, "wb") as target:
+        target.write(content[:cut])
+
+    def simulation():
+        for start in range(cut, len(content), len(content) // 8):
+            time.sleep(0.2)
+            with open(growing, "ab") as target:
+                target.write(content[start : start + len(content) // 8])
+
+    outputs = []
+    for trajectory, follow_timeout in ((trajectory_file, 0.0), (growing, 2.0)):
+        temp_name = str(tmp_path / f"output{len(outputs)}")
+        parameters = {
+            "config_file": lammps_moly,
+            "mass_tolerance": 0.05,
+            "n_steps": 0,
+            "output_files": (temp_name, 64, "none", "INFO"),
+            "smart_mass_association": True,
+            "time_step": 1.0,
+            "trajectory_file": trajectory,
+            "trajectory_format": trajectory_format,
+            "lammps_units": "electron",
+            "follow_timeout": follow_timeout,
+        }
+        writer = threading.Thread(target=simulation)
+        if follow_timeout:
+            writer.start()
+        converter = Converter.create("LAMMPS")
+        converter.run(parameters, status=True)
+        if follow_timeout:
+            writer.join()
+        # the number of steps grows with the frames appended
+        state = converter._status.state
+        assert state["current_step"] == state["n_steps"] == 11
+        assert state["progress"] == 100
+        with h5py.File(temp_name + ".mdt") as output:
+            outputs.append(
+                {
+                    name: output[name][:]
+                    for name in ("configuration/coordinates", "time", "unit_cell")
+                }
+            )
+
+    assert len(outputs[0]["time"]) == 11
+    for name, values in outputs[0].items():
+        np.testing.assert_array_equal(values, outputs[1][name])
+
+
 def test_lammps_mdt_conversion_raise_exception_with_incorrect_format():
     temp_name = tempfile.mktemp()
 
@@ -238,6 +378,29 @@ def test_charmm_mdt_conversion_file_exists_and_loads_up_successfully(compression
     os.remove(temp_name + ".log")
 
 
+def test_charmm_conversion_with_scale_offset_profile_is_within_precision(tmp_path):
+    coordinates = []
+    for output_files in [
+        (str(tmp_path / "reference"), 64, "none", "INFO"),
+        (str(tmp_path / "rounded"), 64, "scale_offset", "INFO", 1e-3),
+    ]:
+        parameters = {
+            "dcd_file": hem_cam_dcd,
+            "fold": False,
+            "output_files": output_files,
+            "pdb_file": hem_cam_pdb,
+            "time_step": 1.0,
+        }
+        Converter.create("charmm").run(parameters, status=True)
+        with h5py.File(output_files[0] + ".mdt") as output:
+            dset = output["configuration/coordinates"]
+            coordinates.append(dset[:])
+            stored_bytes = dset.id.get_storage_size()
+
+    assert stored_bytes < coordinates[1].nbytes / 2
+    assert np.max(np.abs(coordinates[1] - coordinates[0])) <= 1e-3
+
+
 @pytest.mark.parametrize("compression", ["none", "gzip", "lzf"])
 def test_ase_mdt_conversion_file_exists_and_loads_up_successfully(compression):
     temp_name = tempfile.mktemp()
@@ -395,6 +558,61 @@ def test_dlp_mdt_conversion_file_exists_and_loads_up_successfully_with_dlp_versi
     os.remove(temp_name + ".log")
 
 
+def read_dcd_records(dcd):
+    """Reads the frames of a DCD file record by record with struct, as
+    DCDFile did before its frames were memory-mapped."""
+    ang_to_nm = 0.1
+    unit_cells, configs = [], []
+    for _ in range(dcd["n_frames"]):
+        unit_cell = np.array(dcd.get_record("6d"))[[0, 2, 5, 1, 3, 4]]
+        unit_cell[0:3] *= ang_to_nm
+        if np.all(abs(unit_cell[3:]) <= 1):
+            unit_cell[3:] = 0.5 * np.pi - np.arcsin(unit_cell[3:])
+        else:
+            unit_cell[3:] = np.deg2rad(unit_cell[3:])
+        fmt = "%df" % dcd["natoms"]
+        config = np.array([dcd.get_record(fmt) for _ in range(3)]).T * ang_to_nm
+        unit_cells.append(unit_cell)
+        configs.append(config)
+    with pytest.raises(EndOfFile):
+        dcd.get_record("6d")
+    return np.array(unit_cells), np.array(configs)
+
+
+@pytest.mark.parametrize("dcd_file", [hem_cam_dcd, apoferritin_dcd])
+def test_dcd_frames_are_read_in_blocks(dcd_file):
+    dcd = DCDFile(dcd_file)
+    assert dcd["has_pbc_data"] and not dcd["has_4d"]
+    expected_cells, expected_configs = read_dcd_records(DCDFile(dcd_file))
+
+    unit_cells, configs = dcd.read_frames(0, dcd["n_frames"])
+    assert configs.shape == (dcd["n_frames"], dcd["natoms"], 3)
+    np.testing.assert_allclose(configs, expected_configs, rtol=1e-12)
+    np.testing.assert_allclose(unit_cells, expected_cells, rtol=1e-12)
+    for n in range(dcd["n_frames"]):
+        unit_cell, config = dcd.read_step()
+        np.testing.assert_allclose(config, expected_configs[n], rtol=1e-12)
+        np.testing.assert_allclose(unit_cell, expected_cells[n], rtol=1e-12)
+    with pytest.raises(EndOfFile):
+        dcd.read_step()
+
+
+def test_dcd_frames_match_the_reference_values():
+    dcd = DCDFile(hem_cam_dcd)
+    unit_cells, configs = dcd.read_frames(0, dcd["n_frames"])
+    assert configs.shape == (3, 6467, 3)
+    np.testing.assert_allclose(
+        unit_cells[[0, -1]],
+        [
+            [8.2134544, 8.3906044, 6.5041908, 0.5 * np.pi, 0.5 * np.pi, 0.5 * np.pi],
+            [8.2090744, 8.3861298, 6.5007217, 0.5 * np.pi, 0.5 * np.pi, 0.5 * np.pi],
+        ],
+        rtol=1e-7,
+    )
+    np.testing.assert_allclose(configs[0, 0], [3.9831463, 3.4817005, 3.0030348])
+    np.testing.assert_allclose(configs[-1, -1], [4.3853909, 4.3054733, 1.0256540])
+
+
 @pytest.mark.parametrize("compression", ["none", "gzip", "lzf"])
 def test_namd_mdt_conversion_file_exists_and_loads_up_successfully_and_chemical_system_has_correct_number_of_atoms(
     compression,
@@ -517,3 +735,61 @@ def test_gromacs_conversion_file_exists_and_loads_up_successfully(compression):
     assert os.path.exists(temp_name + ".log")
     assert os.path.isfile(temp_name + ".log")
     os.remove(temp_name + ".log")
+
+
+def test_gromacs_multicore_conversion_matches_block_reads(tmp_path, monkeypatch):
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 4)
+    outputs = []
+    for running_mode, block_size in [
+        ("single-core", 2**25),
+        ("single-core", 2**20),
+        (("multicore", 3), 2**25),
+    ]:
+        temp_name = str(tmp_path / f"output{len(outputs)}")
+        parameters = {
+            "fold": True,
+            "output_files": (temp_name, 64, "none", "INFO"),
+            "pdb_file": md_pdb,
+            "xtc_file": md_xtc,
+            "running_mode": running_mode,
+        }
+        gromacs = Converter.create("Gromacs")
+        # a small block size makes the frames be decoded in several blocks
+        monkeypatch.setattr(gromacs, "block_size", block_size)
+        gromacs.run(parameters, status=True)
+        with h5py.File(temp_name + ".mdt") as output:
+            outputs.append(
+                {
+                    name: output[name][:]
+                    for name in ("configuration/coordinates", "time", "unit_cell")
+                }
+            )
+
+    assert len(outputs[0]["time"]) == 21
+    for other in outputs[1:]:
+        for name, values in outputs[0].items():
+            np.testing.assert_array_equal(values, other[name])
+
+
+def test_converter_without_parallel_reads_runs_on_a_single_core(tmp_path, monkeypatch):
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 4)
+    gromacs = Converter.create("Gromacs")
+    monkeypatch.setattr(gromacs, "supports_parallel_read", False)
+
+    def fail(index):
+        raise RuntimeError("the frames should not be read by workers")
+
+    monkeypatch.setattr(gromacs, "read_step", fail)
+    temp_name = str(tmp_path / "output")
+    gromacs.run(
+        {
+            "fold": True,
+            "output_files": (temp_name, 64, "none", "INFO"),
+            "pdb_file": md_pdb,
+            "xtc_file": md_xtc,
+            "running_mode": ("multicore", 3),
+        },
+        status=True,
+    )
+    with h5py.File(temp_name + ".mdt") as output:
+        assert len(output["time"]) == 21
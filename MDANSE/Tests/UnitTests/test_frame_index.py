@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pytest
+
+from MDANSE.IO.FrameIndex import FrameIndex, scan_line_offsets, scan_marker_offsets
+
+data_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), "Data")
+lammps_custom = os.path.join(data_dir, "lammps_moly_custom.txt")
+lammps_xyz = os.path.join(data_dir, "lammps_moly_xyz.txt")
+
+
+@pytest.fixture
+def dump_file(tmp_path):
+    filename = str(tmp_path / "dump.txt")
+    with open(filename, "w") as dump:
+        for step in range(5):
+            dump.write(f"ITEM: TIMESTEP\n{step}\nITEM: ATOMS\n1 0.0\n2 1.0\n")
+    return filename
+
+
+@pytest.fixture
+def not_persistent():
+    FrameIndex.persistent = False
+    yield
+    FrameIndex.persistent = True
+
+
+@pytest.mark.parametrize("block_size", [3, 7, 64, 2**24])
+def test_marker_offsets_do_not_depend_on_block_size(block_size):
+    with open(lammps_custom, "rb") as source:
+        text = source.read()
+    offsets = scan_marker_offsets(
+        lammps_custom, b"ITEM: TIMESTEP", block_size=block_size
+    )
+    assert len(offsets) == text.count(b"ITEM: TIMESTEP")
+    for offset in offsets:
+        assert text[offset : offset + 14] == b"ITEM: TIMESTEP"
+
+
+@pytest.mark.parametrize("block_size", [5, 64, 2**24])
+def test_line_offsets_do_not_depend_on_block_size(block_size):
+    with open(lammps_xyz, "rb") as source:
+        lines = source.read().splitlines(keepends=True)
+    lines_per_frame = int(lines[0]) + 2
+    offsets = scan_line_offsets(lammps_xyz, lines_per_frame, block_size=block_size)
+    line_starts = np.cumsum([0] + [len(line) for line in lines])
+    expected = line_starts[
+        : len(lines) - len(lines) % lines_per_frame : lines_per_frame
+    ]
+    np.testing.assert_array_equal(offsets, expected)
+
+
+def test_incomplete_frame_is_not_indexed(tmp_path):
+    filename = str(tmp_path / "frames.xyz")
+    with open(filename, "w") as xyz:
+        xyz.write("1\nstep 0\n1 0 0 0\n1\nstep 1\n1 0 0 0\n1\nstep 2")
+    np.testing.assert_array_equal(scan_line_offsets(filename, 3), [0, 17])
+
+
+def test_read_frame(dump_file, not_persistent):
+    index = FrameIndex(dump_file, marker=b"ITEM: TIMESTEP")
+    assert len(index) == 5
+    assert index.read_frame(3).decode().splitlines()[1] == "3"
+    assert index.read_frame(4).endswith(b"2 1.0\n")
+    with pytest.raises(IndexError):
+        index.read_frame(5)
+    index.close()
+
+
+def test_index_needs_marker_or_lines():
+    with pytest.raises(ValueError):
+        FrameIndex(lammps_custom)
+    with pytest.raises(ValueError):
+        FrameIndex(lammps_custom, marker=b"ITEM", lines_per_frame=3)
+
+
+def test_appended_frames_are_indexed(dump_file, not_persistent):
+    index = FrameIndex(dump_file, marker=b"ITEM: TIMESTEP")
+    with open(dump_file, "a") as dump:
+        dump.write("ITEM: TIMESTEP\n5\nITEM: ATOMS\n1 0.0\n2 1.0\n")
+    assert index.update() == 6
+    np.testing.assert_array_equal(
+        index.offsets, scan_marker_offsets(dump_file, b"ITEM: TIMESTEP")
+    )
+    assert index.read_frame(5).decode().splitlines()[1] == "5"
+    index.close()
+
+
+def test_stored_index_is_reused(dump_file, monkeypatch):
+    index = FrameIndex(dump_file, marker=b"ITEM: TIMESTEP")
+    assert os.path.exists(index.index_filename)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The file should not be scanned")
+
+    monkeypatch.setattr(FrameIndex, "_scan", fail)
+    stored = FrameIndex(dump_file, marker=b"ITEM: TIMESTEP")
+    np.testing.assert_array_equal(stored.offsets, index.offsets)
+    os.remove(index.index_filename)
+
+
+@pytest.mark.parametrize("persistent", [True, False])
+def test_overwritten_file_is_indexed_again(tmp_path, persistent, monkeypatch):
+    monkeypatch.setattr(FrameIndex, "persistent", persistent)
+    filename = str(tmp_path / "dump.txt")
+    with open(filename, "w") as dump:
+        for step in range(3):
+            dump.write(f"ITEM: TIMESTEP\n{step}\nITEM: ATOMS\n1 0.0\n2 1.0\n")
+    index = FrameIndex(filename, marker=b"ITEM: TIMESTEP")
+    # a longer dump written under the same name, e.g. by a new run
+    with open(filename, "w") as dump:
+        for step in range(4):
+            dump.write(f"ITEM: TIMESTEP\n{step}\nITEM: ATOMS\n1 0.000\n2 1.000\n")
+    if persistent:
+        index = FrameIndex(filename, marker=b"ITEM: TIMESTEP")
+    else:
+        index.update()
+    np.testing.assert_array_equal(
+        index.offsets, scan_marker_offsets(filename, b"ITEM: TIMESTEP")
+    )
+    assert index.read_frame(1).decode().splitlines()[1] == "1"
+    index.close()
+    if persistent:
+        os.remove(index.index_filename)
@@ -1,9 +1,10 @@
 import os
+import subprocess
+import sys
 import pytest
 import tempfile
 from MDANSE.Framework.Jobs.IJob import IJob
 
-
 ALL_JOBS = [
     "AngularCorrelation",
     "AreaPerMolecule",
@@ -86,3 +87,101 @@ def test_create_template_with_correct_jobname(jobname):
     assert os.path.exists(temp_name)
     assert os.path.isfile(temp_name)
     os.remove(temp_name)
+
+
+def test_importing_the_registry_does_not_import_the_jobs():
+    code = (
+        "import sys\n"
+        "from MDANSE.Framework.Jobs.IJob import IJob\n"
+        "IJob.indirect_subclasses()\n"
+        "print(sorted(m for m in sys.modules if m.startswith('MDANSE.Framework.Jobs.')"
+        " or m.startswith('MDANSE.Framework.Converters.')))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.split("\n")[-2] == str(
+        ["MDANSE.Framework.Jobs.IJob", "MDANSE.Framework.Jobs.JobStatus"]
+    )
+
+
+def test_subclass_attributes_are_read_without_importing_the_jobs():
+    code = (
+        "import sys\n"
+        "from MDANSE.Framework.Jobs.IJob import IJob\n"
+        "lazy = {name: [IJob.subclass_attribute(name, attribute)"
+        " for attribute in ('enabled', 'category', 'label')]"
+        " for name in IJob.indirect_subclasses()}\n"
+        "print(sorted(m for m in sys.modules if m.startswith('MDANSE.Framework.Jobs.')"
+        " or m.startswith('MDANSE.Framework.Converters.')))\n"
+        "classes = IJob.indirect_subclass_dictionary()\n"
+        "print(all(lazy[name][0] == job_class.enabled"
+        " and list(lazy[name][1] or []) == list(getattr(job_class, 'category', []))"
+        " and lazy[name][2] == getattr(job_class, 'label', None)"
+        " for name, job_class in classes.items()))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.split("\n")[-3:-1] == [
+        str(["MDANSE.Framework.Jobs.IJob", "MDANSE.Framework.Jobs.JobStatus"]),
+        "True",
+    ]
+
+
+@pytest.mark.parametrize("jobname", ALL_JOBS)
+def test_lazy_entries_match_the_job_classes(jobname):
+    entry = IJob.lazy_entries()[jobname]
+    job_class = IJob.indirect_subclass_dictionary()[jobname]
+    assert job_class.__module__ == entry["module"]
+    assert job_class.__mro__[1].__name__ == entry["parent"]
+    for attribute in ["label", "enabled"]:
+        if attribute in entry:
+            assert getattr(job_class, attribute) == entry[attribute]
+    if "category" in entry:
+        assert list(job_class.category) == entry["category"]
+    assert (
+        list(entry.get("settings", {}))
+        == list(job_class.settings)[: len(entry.get("settings", {}))]
+    )
+
+
+def test_job_and_converter_classes_are_package_attributes():
+    code = (
+        "from MDANSE.Framework.Jobs import DynamicCoherentStructureFactor\n"
+        "from MDANSE.Framework.Converters import LAMMPS\n"
+        "from MDANSE.Framework.Jobs.IJob import IJob\n"
+        "import MDANSE.Framework.Jobs as jobs\n"
+        "IJob.create('MeanSquareDisplacement')\n"
+        "print(DynamicCoherentStructureFactor.__name__, LAMMPS.__name__,"
+        " jobs.MeanSquareDisplacement.__name__)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.split("\n")[-2] == (
+        "DynamicCoherentStructureFactor LAMMPS MeanSquareDisplacement"
+    )
+    with pytest.raises(ImportError):
+        exec("from MDANSE.Framework.Jobs import NotAJob")
+
+
+def test_registry_is_loaded_from_a_read_only_cache(tmp_path, monkeypatch):
+    from MDANSE import PLATFORM
+    from MDANSE.Core.ClassManifest import load_manifest
+    from MDANSE.Core.Platform import PlatformError
+
+    def read_only():
+        raise PlatformError("read-only file system")
+
+    monkeypatch.setattr(PLATFORM, "cache_directory", read_only)
+    manifest = load_manifest("IJob", ["MDANSE.Framework.Jobs"])
+    assert "MeanSquareDisplacement" in manifest
+    for name, entry in manifest.items():
+        assert IJob.lazy_entries()[name] == entry
+
+    # a path which cannot be written, even by root
+    not_a_directory = tmp_path / "cache"
+    not_a_directory.write_text("")
+    monkeypatch.setattr(PLATFORM, "cache_directory", lambda: str(not_a_directory))
+    assert load_manifest("IJob", ["MDANSE.Framework.Jobs"]) == manifest
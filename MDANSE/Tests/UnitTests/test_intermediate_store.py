@@ -0,0 +1,119 @@
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from MDANSE import PLATFORM
+from MDANSE.Framework.IntermediateStore import IntermediateStore
+from MDANSE.Framework.Jobs.IJob import IJob
+
+short_traj = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "Data",
+    "short_trajectory_after_changes.mdt",
+)
+
+
+def parameters(root, weights):
+    return {
+        "atom_selection": None,
+        "atom_transmutation": None,
+        "frames": (0, 10, 1, 5),
+        "instrument_resolution": ("Ideal", {}),
+        "output_files": (root, ("MDAFormat",), "no logs"),
+        "q_vectors": (
+            "SphericalLatticeQVectors",
+            {"seed": 1, "shells": (5.0, 36, 10.0), "n_vectors": 10, "width": 9.0},
+        ),
+        "running_mode": ("single-core",),
+        "trajectory": short_traj,
+        "weights": weights,
+    }
+
+
+def read_results(filename):
+    with h5py.File(filename, "r") as h5_file:
+        return {name: h5_file[name][:] for name in h5_file if name != "metadata"}
+
+
+@pytest.fixture
+def intermediate_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(PLATFORM, "cache_directory", lambda: str(tmp_path / "cache"))
+    monkeypatch.setattr(IntermediateStore, "enabled", True)
+    return str(tmp_path / "cache" / "intermediate")
+
+
+def test_entries_are_keyed_by_trajectory_frames_and_parts(intermediate_store):
+    store = IntermediateStore(short_traj, range(0, 10))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"H": np.arange(3.0)}
+
+    for _ in range(2):
+        data = store.get("rho", [np.ones((3, 2))], compute)
+        np.testing.assert_array_equal(data["H"], np.arange(3.0))
+    assert len(calls) == 1
+
+    store.get("rho", [np.ones((3, 3))], compute)
+    IntermediateStore(short_traj, range(0, 10, 2)).get(
+        "rho", [np.ones((3, 2))], compute
+    )
+    assert len(calls) == 3
+    assert len(os.listdir(intermediate_store)) == 3
+
+
+def test_rerun_with_other_weights_reuses_the_stored_rho(
+    tmp_path, intermediate_store, monkeypatch
+):
+    job_name = "DynamicCoherentStructureFactor"
+    first = str(tmp_path / "first")
+    IJob.create(job_name).run(parameters(first, "b_coherent"))
+    assert os.listdir(intermediate_store)
+
+    def fail(self, *args):
+        raise RuntimeError("rho should have been read from the store")
+
+    job = IJob.create(job_name)
+    monkeypatch.setattr(job.__class__, "_compute_rho", fail)
+    second = str(tmp_path / "second")
+    job.run(parameters(second, "b_coherent"))
+    expected = read_results(first + ".mda")
+    for name, values in read_results(second + ".mda").items():
+        np.testing.assert_allclose(values, expected[name], err_msg=name)
+
+    job.run(parameters(str(tmp_path / "third"), "equal"))
+
+
+def test_store_is_evicted_once_per_job(tmp_path, intermediate_store, monkeypatch):
+    scans = []
+    monkeypatch.setattr(
+        "MDANSE.Framework.IntermediateStore.evict_least_recently_used",
+        lambda *args: scans.append(args),
+    )
+    IJob.create("DynamicCoherentStructureFactor").run(
+        parameters(str(tmp_path / "dcsf"), "b_coherent")
+    )
+    # one entry per q shell, but a single scan of the store
+    assert len(os.listdir(intermediate_store)) > 1
+    assert len(scans) == 1
+
+
+def test_incoherent_phases_are_not_stored(tmp_path, intermediate_store):
+    IJob.create("DynamicIncoherentStructureFactor").run(
+        parameters(str(tmp_path / "disf"), "b_incoherent2")
+    )
+    assert not os.path.exists(intermediate_store) or not os.listdir(intermediate_store)
+
+
+def test_run_option_enables_the_store_for_one_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(PLATFORM, "cache_directory", lambda: str(tmp_path / "cache"))
+    job_name = "DynamicCoherentStructureFactor"
+    IJob.create(job_name).run(parameters(str(tmp_path / "first"), "b_coherent"))
+    assert not os.path.exists(tmp_path / "cache" / "intermediate")
+    IJob.create(job_name).run(
+        parameters(str(tmp_path / "second"), "b_coherent"), intermediate_store=True
+    )
+    assert os.listdir(tmp_path / "cache" / "intermediate")
@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from MDANSE.Framework.Jobs.IJob import IJob, JobError
+from MDANSE.Framework.JobCheckpoint import JobCheckpoint, JobCheckpointError
+
+short_traj = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "Data",
+    "short_trajectory_after_changes.mdt",
+)
+
+
+def vhfd_parameters(root, running_mode=("single-core",)):
+    return {
+        "trajectory": short_traj,
+        "frames": (0, 10, 1, 5),
+        "r_values": (0.0, 1.0, 0.05),
+        "output_files": (root, ("MDAFormat",), "no logs"),
+        "running_mode": running_mode,
+    }
+
+
+def read_results(filename):
+    with h5py.File(filename, "r") as h5_file:
+        return {name: h5_file[name][:] for name in h5_file if name != "metadata"}
+
+
+class StepFailure(Exception):
+    pass
+
+
+def test_checkpoint_round_trip(tmp_path):
+    filename = str(tmp_path / "job.checkpoint.h5")
+    checkpoint = JobCheckpoint(filename, "Job", 5, "{}")
+    for index in (0, 2):
+        checkpoint.mark_done(index)
+    checkpoint.save(
+        {"f": np.arange(4.0)}, {"total": 1.5, "counts": {"H": 2.0, "O": np.ones(2)}}
+    )
+    assert checkpoint.pending_steps() == [1, 3, 4]
+
+    resumed = JobCheckpoint(filename, "Job", 5, "{}")
+    output_data, attributes = resumed.load()
+    assert resumed.pending_steps() == [1, 3, 4]
+    np.testing.assert_array_equal(output_data["f"], np.arange(4.0))
+    assert attributes["total"] == 1.5
+    assert attributes["counts"]["H"] == 2.0
+    np.testing.assert_array_equal(attributes["counts"]["O"], np.ones(2))
+
+    for other in (
+        JobCheckpoint(filename, "OtherJob", 5, "{}"),
+        JobCheckpoint(filename, "Job", 5, '{"frames": 1}'),
+        JobCheckpoint(filename, "Job", 6, "{}"),
+    ):
+        with pytest.raises(JobCheckpointError):
+            other.load()
+    resumed.remove()
+    assert not os.path.exists(filename)
+
+
+@pytest.mark.parametrize("running_mode", [("single-core",), ("multicore", 2)])
+def test_resumed_job_skips_completed_steps(tmp_path, monkeypatch, running_mode):
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 4)
+    reference = str(tmp_path / "reference")
+    IJob.create("VanHoveFunctionDistinct").run(vhfd_parameters(reference))
+
+    job_class = IJob.indirect_subclass_dictionary()["VanHoveFunctionDistinct"]
+    monkeypatch.setattr(job_class, "checkpoint_interval", 0.0)
+    run_step = job_class.run_step
+
+    def failing_run_step(self, index):
+        if index == 3:
+            raise StepFailure()
+        return run_step(self, index)
+
+    root = str(tmp_path / "resumed")
+    monkeypatch.setattr(job_class, "run_step", failing_run_step)
+    with pytest.raises(JobError):
+        IJob.create("VanHoveFunctionDistinct").run(vhfd_parameters(root))
+    assert os.path.exists(root + ".checkpoint.h5")
+    assert not os.path.exists(root + ".mda")
+
+    steps_run = multiprocessing.Manager().list()
+
+    def recording_run_step(self, index):
+        steps_run.append(index)
+        return run_step(self, index)
+
+    monkeypatch.setattr(job_class, "run_step", recording_run_step)
+    job = IJob.create("VanHoveFunctionDistinct")
+    job.run(vhfd_parameters(root, running_mode), status=True, resume=True)
+    assert sorted(steps_run) == list(range(3, job.numberOfSteps))
+    # the steps of the first run count in the progress of the resumed one
+    state = job._status.state
+    assert state["current_step"] == job.numberOfSteps
+    assert state["progress"] == 100
+    assert state["eta"] == 0
+    assert not os.path.exists(root + ".checkpoint.h5")
+
+    expected = read_results(reference + ".mda")
+    results = read_results(root + ".mda")
+    assert expected.keys() == results.keys()
+    for name, values in expected.items():
+        np.testing.assert_allclose(results[name], values, err_msg=name)
+
+
+def test_checkpoint_of_other_parameters_is_rejected(tmp_path, monkeypatch):
+    job_class = IJob.indirect_subclass_dictionary()["VanHoveFunctionDistinct"]
+    monkeypatch.setattr(job_class, "checkpoint_interval", 0.0)
+    root = str(tmp_path / "resumed")
+    JobCheckpoint(root + ".checkpoint.h5", "VanHoveFunctionDistinct", 5, "{}").save(
+        {}, {}
+    )
+    with pytest.raises(JobError):
+        IJob.create("VanHoveFunctionDistinct").run(vhfd_parameters(root), resume=True)
+
+
+def test_saved_job_script_can_be_resumed(tmp_path):
+    script = str(tmp_path / "job.py")
+    IJob.create("VanHoveFunctionDistinct").save(script)
+    with open(script) as source:
+        assert 'resume="--resume" in sys.argv' in source.read()
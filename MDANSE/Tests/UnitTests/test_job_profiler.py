@@ -0,0 +1,58 @@
+import multiprocessing
+import os
+import pstats
+
+import pytest
+
+from MDANSE.Framework.Jobs.IJob import IJob
+
+short_traj = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "Data",
+    "short_trajectory_after_changes.mdt",
+)
+
+
+def vhfd_parameters(root, running_mode):
+    return {
+        "trajectory": short_traj,
+        "frames": (0, 10, 1, 5),
+        "r_values": (0.0, 1.0, 0.05),
+        "output_files": (root, ("MDAFormat",), "no logs"),
+        "running_mode": running_mode,
+    }
+
+
+@pytest.mark.parametrize(
+    "running_mode, n_processes",
+    [(("single-core", 1, True), 1), (("multicore", -4, True), 4)],
+)
+def test_profiled_job_writes_the_merged_statistics(
+    tmp_path, monkeypatch, running_mode, n_processes
+):
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 4)
+    root = str(tmp_path / "vhfd")
+    job = IJob.create("VanHoveFunctionDistinct")
+    job.run(vhfd_parameters(root, running_mode))
+
+    stats_files = [
+        name for name in os.listdir(root + ".profile") if name.endswith(".pstats")
+    ]
+    # a worker may have run no step
+    assert 1 <= len(stats_files) <= n_processes
+    stats = pstats.Stats(root + ".pstats")
+    assert any(function[2] == "run_step" for function in stats.stats)
+    with open(root + ".profile.txt") as summary:
+        text = summary.read()
+    assert f"Profile of {job.numberOfSteps} steps" in text
+    assert "Duration of the steps" in text
+
+
+def test_job_is_not_profiled_by_default(tmp_path):
+    root = str(tmp_path / "vhfd")
+    IJob.create("VanHoveFunctionDistinct").run(vhfd_parameters(root, ("single-core",)))
+    assert not os.path.exists(root + ".pstats")
+    IJob.create("VanHoveFunctionDistinct").run(
+        vhfd_parameters(root, ("single-core",)), profile=True
+    )
+    assert os.path.exists(root + ".pstats")
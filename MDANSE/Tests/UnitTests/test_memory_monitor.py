@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import sys
+
+import h5py
+import numpy as np
+import pytest
+
+from MDANSE.Framework.Jobs.IJob import IJob
+from MDANSE.Framework.MemoryMonitor import MemoryMonitor, process_rss
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="the memory is read from /proc"
+)
+
+short_traj = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "Data",
+    "short_trajectory_after_changes.mdt",
+)
+
+
+def run_vhfd(root, running_mode, **options):
+    job = IJob.create("VanHoveFunctionDistinct")
+    job.run(
+        {
+            "trajectory": short_traj,
+            "frames": (0, 10, 1, 5),
+            "r_values": (0.0, 1.0, 0.05),
+            "output_files": (root, ("MDAFormat",), "no logs"),
+            "running_mode": running_mode,
+        },
+        status=True,
+        **options,
+    )
+    return job
+
+
+def test_monitor_samples_at_most_once_per_interval():
+    monitor = MemoryMonitor()
+    assert process_rss(os.getpid()) > 0
+    assert monitor.sample({"main": os.getpid()})
+    assert not monitor.sample({"main": os.getpid()})
+    assert monitor.sample({"main": os.getpid()}, force=True)
+    assert monitor.peak_total >= monitor.total > 0
+    assert set(monitor.state()["memory"]) == {"main"}
+
+
+def test_monitor_reduces_the_workers_over_the_budget(monkeypatch):
+    monitor = MemoryMonitor()
+    monitor.sample({"main": os.getpid()})
+    assert monitor.reduce_workers(4, 4) == 4
+    monkeypatch.setattr(MemoryMonitor, "memory_budget", monitor.total)
+    assert monitor.reduce_workers(4, 4) == 3
+    # the stopped worker has not exited yet
+    assert monitor.reduce_workers(3, 4) == 3
+    assert monitor.reduce_workers(3, 3) == 2
+    assert monitor.reduce_workers(1, 1) == 1
+    assert monitor.workers_stopped == 2
+
+
+def test_peak_memory_is_written_in_the_output(tmp_path):
+    root = str(tmp_path / "vhfd")
+    job = run_vhfd(root, ("single-core",))
+    assert job._status.state["peak_memory_total"] > 0
+    with h5py.File(root + ".mda", "r") as h5_file:
+        memory = h5_file["metadata/memory"]
+        assert memory.attrs["peak_total"] == job._status.state["peak_memory_total"]
+        assert memory.attrs["main"] > 0
+
+
+def test_workers_are_stopped_over_the_memory_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 4)
+    reference = run_vhfd(str(tmp_path / "reference"), ("single-core",))
+
+    monkeypatch.setattr(MemoryMonitor, "interval", 0.0)
+    monkeypatch.setattr(MemoryMonitor, "memory_budget", 2**20)
+    root = str(tmp_path / "vhfd")
+    job = run_vhfd(root, ("multicore", -4))
+    # a worker is stopped once the one stopped before has exited
+    workers_stopped = job._status.state["workers_stopped"]
+    assert 1 <= workers_stopped <= 3
+    # the remaining worker runs all the steps
+    n_steps = sum(
+        record["phases"]["run_step"]["calls"]
+        for record in job.performance.values()
+        if "run_step" in record["phases"]
+    )
+    assert n_steps == job.numberOfSteps
+
+    with h5py.File(str(tmp_path / "reference.mda"), "r") as expected, h5py.File(
+        root + ".mda", "r"
+    ) as result:
+        assert result["metadata/memory"].attrs["workers_stopped"] == workers_stopped
+        np.testing.assert_allclose(
+            result["g(r,t)_total"][:], expected["g(r,t)_total"][:]
+        )
+
+
+def test_run_option_sets_the_memory_budget_of_one_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 4)
+    monkeypatch.setattr(MemoryMonitor, "interval", 0.0)
+    job = run_vhfd(str(tmp_path / "vhfd"), ("multicore", -4), memory_budget=2**20)
+    assert job._status.state["workers_stopped"] >= 1
+    assert MemoryMonitor.memory_budget is None
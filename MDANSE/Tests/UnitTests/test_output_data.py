@@ -0,0 +1,85 @@
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from MDANSE.Framework.Jobs.IJob import IJob
+from MDANSE.Framework.OutputVariables.IOutputVariable import (
+    OutputData,
+    OutputVariableDataset,
+    row_blocks,
+)
+
+short_traj = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "Data",
+    "short_trajectory_after_changes.mdt",
+)
+
+
+def dcsf_parameters(root):
+    return {
+        "atom_selection": None,
+        "atom_transmutation": None,
+        "frames": (0, 10, 1, 5),
+        "instrument_resolution": ("Ideal", {}),
+        "output_files": (root, ("MDAFormat",), "no logs"),
+        "q_vectors": (
+            "SphericalLatticeQVectors",
+            {"seed": 1, "shells": (5.0, 36, 10.0), "n_vectors": 10, "width": 9.0},
+        ),
+        "running_mode": ("single-core",),
+        "trajectory": short_traj,
+        "weights": "b_coherent",
+    }
+
+
+def read_results(filename):
+    with h5py.File(filename, "r") as h5_file:
+        return {name: h5_file[name][:] for name in h5_file if name != "metadata"}
+
+
+def test_out_of_core_variable_behaves_like_an_array(tmp_path, monkeypatch):
+    monkeypatch.setattr(OutputData, "out_of_core_threshold", 0)
+    data = OutputData()
+    data.set_store(str(tmp_path / "job.store.h5"))
+    data.add("f", "SurfaceOutputVariable", (7, 3), units="au", out_of_core=True)
+    data.add("g", "SurfaceOutputVariable", (7, 3), units="au")
+    assert isinstance(data["f"], OutputVariableDataset)
+    assert not isinstance(data["g"], OutputVariableDataset)
+
+    expected = np.arange(21.0).reshape(7, 3)
+    for index in range(7):
+        data["f"][index, :] += expected[index]
+    data["f"] *= 2.0
+    np.testing.assert_array_equal(np.asarray(data["f"]), 2.0 * expected)
+    assert data["f"].units == "au"
+    assert data["f"].shape == (7, 3)
+
+    rows = list(row_blocks(data["f"], max_block_size=48))
+    assert rows == [slice(0, 2), slice(2, 4), slice(4, 6), slice(6, 7)]
+
+    data.close_store()
+    assert not os.path.exists(tmp_path / "job.store.h5")
+
+
+def test_dcsf_gives_the_same_results_out_of_core(tmp_path, monkeypatch):
+    in_memory = str(tmp_path / "in_memory")
+    IJob.create("DynamicCoherentStructureFactor").run(dcsf_parameters(in_memory))
+
+    monkeypatch.setattr(OutputData, "out_of_core_threshold", 0)
+    monkeypatch.setattr(OutputData, "out_of_core_compression", "gzip")
+    out_of_core = str(tmp_path / "out_of_core")
+    job = IJob.create("DynamicCoherentStructureFactor")
+    job.run(dcsf_parameters(out_of_core))
+    assert isinstance(job._outputData["s(q,f)_total"], OutputVariableDataset)
+    assert not os.path.exists(out_of_core + ".store.h5")
+
+    expected = read_results(in_memory + ".mda")
+    results = read_results(out_of_core + ".mda")
+    assert results.keys() == expected.keys()
+    for name, values in expected.items():
+        np.testing.assert_allclose(results[name], values, err_msg=name)
+    with h5py.File(out_of_core + ".mda", "r") as h5_file:
+        assert h5_file["s(q,f)_total"].attrs["units"] == "nm2/ps"
@@ -0,0 +1,82 @@
+import multiprocessing
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from MDANSE.Framework.Jobs.IJob import IJob
+from MDANSE.Framework.Performance import (
+    PHASE_COLUMNS,
+    PerformanceRecord,
+    recorded_read,
+    set_current_record,
+)
+
+short_traj = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "Data",
+    "short_trajectory_after_changes.mdt",
+)
+
+
+class Reader:
+    @recorded_read(single_frame=False)
+    def read_atomic_trajectory(self, index):
+        return np.zeros((10, 3))
+
+    @recorded_read(single_frame=False)
+    def read_com_trajectory(self, indexes):
+        return sum(self.read_atomic_trajectory(index) for index in indexes)
+
+
+def test_nested_reads_are_counted_once():
+    record = PerformanceRecord()
+    set_current_record(record)
+    try:
+        with record.phase("run_step"):
+            Reader().read_com_trajectory([0, 1, 2])
+    finally:
+        set_current_record(None)
+    assert record.frames_read == 10
+    assert record.bytes_read == 240
+    phase = record.to_dict()["phases"]["run_step"]
+    assert phase["calls"] == 1
+    assert 0 < phase["read_time"] <= phase["wall_time"]
+
+
+@pytest.mark.parametrize("running_mode", [("single-core",), ("multicore", -4)])
+def test_job_performance_is_written_in_the_output(tmp_path, monkeypatch, running_mode):
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 4)
+    root = str(tmp_path / "vhfd")
+    job = IJob.create("VanHoveFunctionDistinct")
+    job.run(
+        {
+            "trajectory": short_traj,
+            "frames": (0, 10, 1, 5),
+            "r_values": (0.0, 1.0, 0.05),
+            "output_files": (root, ("MDAFormat",), "no logs"),
+            "running_mode": running_mode,
+        }
+    )
+    records = job.performance
+    for name in ("initialize", "combine", "finalize", "write"):
+        assert records["main"]["phases"][name]["calls"] >= 1
+    n_steps = sum(
+        record["phases"]["run_step"]["calls"]
+        for record in records.values()
+        if "run_step" in record["phases"]
+    )
+    assert n_steps == job.numberOfSteps
+    assert sum(record["frames_read"] for record in records.values()) > 0
+    if running_mode[0] == "multicore":
+        assert len(records) == 5
+
+    with h5py.File(root + ".mda", "r") as h5_file:
+        performance = h5_file["metadata/performance"]
+        assert list(performance.attrs["columns"]) == list(PHASE_COLUMNS)
+        assert set(performance) == set(records)
+        np.testing.assert_allclose(
+            performance["main/finalize"][:],
+            [records["main"]["phases"]["finalize"][c] for c in PHASE_COLUMNS],
+        )
@@ -0,0 +1,131 @@
+import multiprocessing
+import os
+
+import pytest
+
+from MDANSE.Framework.Jobs.IJob import (
+    IJob,
+    JobError,
+    RunOptionError,
+    parse_run_options,
+)
+from MDANSE.Framework.ResourceEstimate import (
+    ResourceEstimate,
+    ResourceLimitError,
+    format_bytes,
+    format_duration,
+    parse_bytes,
+    parse_duration,
+)
+
+short_traj = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "Data",
+    "short_trajectory_after_changes.mdt",
+)
+
+
+def estimate(job_name, root, **parameters):
+    job = IJob.create(job_name)
+    job.setup(
+        {
+            "trajectory": short_traj,
+            "output_files": (root, ("MDAFormat",), "no logs"),
+            **parameters,
+        }
+    )
+    return job.estimate_resources()
+
+
+def test_estimate_is_formatted():
+    assert format_bytes(3 * 2**20) == "3.0 MiB"
+    assert format_duration(90) == "1.5 min"
+
+
+def test_limits_are_parsed():
+    assert parse_bytes("4GiB") == 4 * 2**30
+    assert parse_bytes("512 MiB") == 2**29
+    assert parse_bytes("1000") == 1000
+    assert parse_duration("2h") == 7200
+    assert parse_duration("1.5 min") == 90
+    assert parse_duration("30") == 30
+    for text in ("4GB", "-1", "MiB"):
+        with pytest.raises(ValueError):
+            parse_bytes(text)
+    assert parse_run_options(["--max-memory=1KiB", "--max-wall-time=1d"]) == {
+        "max_memory": 1024,
+        "max_wall_time": 86400,
+    }
+    for argument in ("--max-memory", "--max-wall-time=soon"):
+        with pytest.raises(RunOptionError):
+            parse_run_options([argument])
+    text = str(ResourceEstimate(memory=2**30, flops=1e9))
+    assert "GiB" in text and "FLOP" in text
+
+
+@pytest.mark.parametrize(
+    "job_name, parameters",
+    [
+        ("VanHoveFunctionDistinct", {"r_values": (0.0, 1.0, 0.05)}),
+        ("DynamicIncoherentStructureFactor", {}),
+        ("MeanSquareDisplacement", {}),
+    ],
+)
+def test_estimate_grows_with_the_frames(tmp_path, job_name, parameters):
+    root = str(tmp_path / "job")
+    short = estimate(job_name, root, frames=(0, 10, 1, 5), **parameters)
+    long = estimate(job_name, root, frames=(0, 20, 1, 10), **parameters)
+    assert 0 < short.flops < long.flops
+    assert 0 < short.bytes_read < long.bytes_read
+    assert 0 < short.wall_time < long.wall_time
+
+
+def test_multicore_estimate_needs_more_memory(tmp_path, monkeypatch):
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 4)
+    root = str(tmp_path / "vhfd")
+    parameters = {"frames": (0, 10, 1, 5), "r_values": (0.0, 1.0, 0.05)}
+    single = estimate(
+        "VanHoveFunctionDistinct", root, running_mode=("single-core",), **parameters
+    )
+    multi = estimate(
+        "VanHoveFunctionDistinct", root, running_mode=("multicore", -4), **parameters
+    )
+    assert multi.slots == 4
+    assert multi.peak_memory > single.peak_memory
+    assert multi.wall_time < single.wall_time
+
+
+def test_job_over_the_limits_is_refused(tmp_path, monkeypatch):
+    with pytest.raises(ResourceLimitError):
+        monkeypatch.setattr(ResourceEstimate, "max_memory", 2**20)
+        ResourceEstimate().check()
+
+    root = str(tmp_path / "vhfd")
+    job = IJob.create("VanHoveFunctionDistinct")
+    with pytest.raises(JobError, match="more than the limit"):
+        job.run(
+            {
+                "trajectory": short_traj,
+                "frames": (0, 10, 1, 5),
+                "r_values": (0.0, 1.0, 0.05),
+                "output_files": (root, ("MDAFormat",), "no logs"),
+            }
+        )
+    assert not os.path.exists(root + ".mda")
+
+
+def test_run_option_limits_one_job(tmp_path):
+    root = str(tmp_path / "vhfd")
+    parameters = {
+        "trajectory": short_traj,
+        "frames": (0, 10, 1, 5),
+        "r_values": (0.0, 1.0, 0.05),
+        "output_files": (root, ("MDAFormat",), "no logs"),
+    }
+    with pytest.raises(JobError, match="more than the limit"):
+        IJob.create("VanHoveFunctionDistinct").run(parameters, max_memory=2**20)
+    with pytest.raises(JobError, match="more than the limit"):
+        IJob.create("VanHoveFunctionDistinct").run(parameters, max_wall_time=1e-9)
+    assert not os.path.exists(root + ".mda")
+    IJob.create("VanHoveFunctionDistinct").run(parameters)
+    assert os.path.exists(root + ".mda")
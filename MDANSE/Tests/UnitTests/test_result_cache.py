@@ -0,0 +1,121 @@
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from MDANSE import PLATFORM
+from MDANSE.Framework.Jobs.IJob import IJob, RunOptionError, parse_run_options
+from MDANSE.Framework.ResultCache import ResultCache
+
+short_traj = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "Data",
+    "short_trajectory_after_changes.mdt",
+)
+
+
+def vhfd_parameters(root, r_values=(0.0, 1.0, 0.05)):
+    return {
+        "trajectory": short_traj,
+        "frames": (0, 10, 1, 5),
+        "r_values": r_values,
+        "output_files": (root, ("MDAFormat",), "no logs"),
+        "running_mode": ("single-core",),
+    }
+
+
+def read_results(filename):
+    with h5py.File(filename, "r") as h5_file:
+        return {name: h5_file[name][:] for name in h5_file if name != "metadata"}
+
+
+@pytest.fixture
+def result_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(PLATFORM, "cache_directory", lambda: str(tmp_path / "cache"))
+    monkeypatch.setattr(ResultCache, "enabled", True)
+    return ResultCache()
+
+
+def test_identical_job_copies_the_cached_results(tmp_path, result_cache):
+    first = str(tmp_path / "first")
+    IJob.create("VanHoveFunctionDistinct").run(vhfd_parameters(first))
+    assert len(os.listdir(result_cache.directory)) == 1
+
+    job = IJob.create("VanHoveFunctionDistinct")
+
+    def fail(index):
+        raise RuntimeError("the results should have been read from the cache")
+
+    job.run_step = fail
+    second = str(tmp_path / "second")
+    job.run(vhfd_parameters(second))
+    expected = read_results(first + ".mda")
+    results = read_results(second + ".mda")
+    assert results.keys() == expected.keys()
+    for name, values in expected.items():
+        np.testing.assert_array_equal(results[name], values)
+    with h5py.File(second + ".mda", "r") as h5_file:
+        meta = h5_file["metadata"]
+        assert second in meta["inputs/output_files"][0].decode()
+        assert first not in meta["inputs/output_files"][0].decode()
+        assert "performance" not in meta and "memory" not in meta
+        assert meta.attrs["result_cache"].startswith(result_cache.directory)
+
+    third = str(tmp_path / "third")
+    IJob.create("VanHoveFunctionDistinct").run(
+        vhfd_parameters(third, r_values=(0.0, 1.0, 0.1))
+    )
+    assert len(os.listdir(result_cache.directory)) == 2
+
+
+def test_least_recently_used_results_are_evicted(tmp_path, result_cache, monkeypatch):
+    monkeypatch.setattr(ResultCache, "max_size", 2500)
+    for index, key in enumerate(("a", "b", "c")):
+        filename = str(tmp_path / f"{key}.mda")
+        with open(filename, "wb") as output:
+            output.write(b"\0" * 1000)
+        result_cache.store(key, filename)
+        os.utime(result_cache.filename(key), ns=(index * 10**9, index * 10**9))
+    result_cache.store("a", str(tmp_path / "a.mda"))
+    assert sorted(os.listdir(result_cache.directory)) == ["a.mda", "c.mda"]
+
+
+def test_run_option_enables_the_cache_for_one_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(PLATFORM, "cache_directory", lambda: str(tmp_path / "cache"))
+    first = str(tmp_path / "first")
+    IJob.create("VanHoveFunctionDistinct").run(vhfd_parameters(first))
+    assert not os.path.exists(tmp_path / "cache" / "results")
+    IJob.create("VanHoveFunctionDistinct").run(
+        vhfd_parameters(first), result_cache=True
+    )
+
+    job = IJob.create("VanHoveFunctionDistinct")
+
+    def fail(index):
+        raise RuntimeError("the results should have been read from the cache")
+
+    job.run_step = fail
+    job.run(vhfd_parameters(str(tmp_path / "second")), result_cache=True)
+
+
+def test_command_line_of_a_job_script_sets_the_cache():
+    options = {"result_cache": False}
+    assert parse_run_options(["--resume", "--result-cache"], options) == {
+        "result_cache": True
+    }
+    assert parse_run_options(["--no-result-cache"], {"result_cache": True}) == {
+        "result_cache": False
+    }
+    assert parse_run_options([], options) == options
+    with pytest.raises(RunOptionError):
+        parse_run_options(["--resume"], strict=True)
+
+
+def test_job_script_keeps_the_cache_option(tmp_path):
+    script = str(tmp_path / "script.py")
+    IJob.create("VanHoveFunctionDistinct").save(script, options={"result_cache": True})
+    with open(script) as source:
+        text = source.read()
+    assert "'result_cache': True," in text
+    assert "**parse_run_options(sys.argv[1:], options)" in text
@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+
+import pytest
+
+from MDANSE.Framework.Jobs.IJob import IJob
+from MDANSE.Framework.Status import Status
+
+short_traj = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "Data",
+    "short_trajectory_after_changes.mdt",
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingStatus(Status):
+    def __init__(self):
+        super().__init__()
+        self.reports = []
+
+    def finish_status(self):
+        pass
+
+    def start_status(self):
+        pass
+
+    def stop_status(self):
+        pass
+
+    def update_status(self):
+        self.reports.append((self.currentStep, self.eta))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("MDANSE.Framework.Status.time.time", clock)
+    return clock
+
+
+def test_progress_is_reported_once_per_interval(clock):
+    status = CountingStatus()
+    status.start(1000)
+    for _ in range(128):
+        clock.now += 1 / 64
+        status.update()
+    # 64 steps per second, reported every 0.5 s
+    assert [step for step, _ in status.reports] == [32, 64, 96, 128]
+    assert status.throughput == pytest.approx(64)
+    assert status.eta == pytest.approx((1000 - 128) / 64)
+
+    status.update(force=True)
+    assert status.reports[-1][0] == 129
+
+
+def test_throughput_is_smoothed(clock):
+    status = CountingStatus()
+    status.start(1000)
+    for rate in (64, 64, 128):
+        for _ in range(int(rate * status.update_interval)):
+            clock.now += 1 / rate
+            status.update()
+    assert status.throughput == pytest.approx(64 + status.throughput_smoothing * 64)
+
+
+def test_last_step_is_always_reported(clock):
+    status = CountingStatus()
+    status.start(3)
+    for _ in range(3):
+        status.update()
+    assert status.reports == [(3, None)]
+    assert "3/3 steps (100.0%)" in status.progress_text()
+
+
+@pytest.mark.parametrize("running_mode", [("single-core",), ("multicore", -2)])
+def test_job_status_has_an_eta(tmp_path, monkeypatch, running_mode):
+    monkeypatch.setattr(multiprocessing, "cpu_count", lambda: 2)
+    job = IJob.create("VanHoveFunctionDistinct")
+    job.run(
+        {
+            "trajectory": short_traj,
+            "frames": (0, 10, 1, 5),
+            "r_values": (0.0, 1.0, 0.05),
+            "output_files": (str(tmp_path / "vhfd"), ("MDAFormat",), "no logs"),
+            "running_mode": running_mode,
+        },
+        status=True,
+    )
+    state = job._status.state
+    assert state["current_step"] == job.numberOfSteps
+    assert state["progress"] == 100
+    assert state["throughput"] > 0
+    assert state["eta"] == 0
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import pytest
+
+from MDANSE.Chemistry.ChemicalEntity import ChemicalSystem, Molecule
+from MDANSE.MolecularDynamics.TopologyCache import TopologyCache, cache_key
+from MDANSE.MolecularDynamics.Trajectory import Trajectory
+from MDANSE.MolecularDynamics.TrajectoryUtils import atom_index_to_molecule_index
+
+short_traj = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    "Data",
+    "short_trajectory_after_changes.mdt",
+)
+
+
+@pytest.fixture
+def water_system():
+    chemical_system = ChemicalSystem()
+    for n in range(3):
+        chemical_system.add_chemical_entity(Molecule("WAT", f"water{n}"))
+    return chemical_system
+
+
+def test_cache_key_depends_on_contents():
+    assert cache_key("selection") == "selection"
+    assert cache_key("selection", '{"all": true}') == cache_key(
+        "selection", '{"all": true}'
+    )
+    assert cache_key("selection", '{"all": true}') != cache_key(
+        "selection", '{"all": false}'
+    )
+
+
+def test_entries_persist_between_instances(tmp_path):
+    cache = TopologyCache("abc", directory=str(tmp_path))
+    cache.put("array", np.arange(5))
+    cache.put("ragged", [[1, 2], [], [3]])
+
+    new_cache = TopologyCache("abc", directory=str(tmp_path))
+    np.testing.assert_array_equal(new_cache.get("array"), np.arange(5))
+    assert [list(entry) for entry in new_cache.get("ragged")] == [[1, 2], [], [3]]
+    assert new_cache.get("missing") is None
+
+
+def test_get_computes_missing_entry_only_once(tmp_path):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.ones(3)
+
+    cache = TopologyCache("abc", directory=str(tmp_path))
+    cache.get("ones", compute)
+    TopologyCache("abc", directory=str(tmp_path)).get("ones", compute)
+    assert len(calls) == 1
+
+
+def test_memory_only_cache_writes_no_file(tmp_path):
+    cache = TopologyCache(None, directory=str(tmp_path))
+    cache.get("ones", lambda: np.ones(3))
+    cache.put("twos", np.ones(3) * 2)
+    cache.put("ragged", [[1, 2], [], [3]])
+    assert os.listdir(tmp_path) == []
+    np.testing.assert_array_equal(cache.get("twos"), np.ones(3) * 2)
+    assert [list(entry) for entry in cache.get("ragged")] == [[1, 2], [], [3]]
+
+
+def test_molecule_indexes_match_lookup_table(tmp_path, water_system):
+    cache = TopologyCache("water", directory=str(tmp_path))
+    lut = atom_index_to_molecule_index(water_system)
+    molecule_indexes = cache.molecule_indexes(water_system)
+    assert [lut[i] for i in range(9)] == molecule_indexes.tolist()
+
+
+def test_com_topology(tmp_path, water_system):
+    cache = TopologyCache("water", directory=str(tmp_path))
+    entity_indexes, bonds = cache.com_topology(water_system, [3, 4])
+    assert [sorted(entity) for entity in entity_indexes] == [[3, 4, 5]]
+    assert sorted(bonds[3].tolist()) == [4, 5]
+
+
+def test_trajectory_hash_is_stable():
+    traj1 = Trajectory(short_traj)
+    traj2 = Trajectory(short_traj)
+    assert traj1.topology_cache.filename == traj2.topology_cache.filename
+    traj1.close()
+    traj2.close()
@@ -0,0 +1,99 @@
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from MDANSE.Chemistry.ChemicalEntity import Atom, ChemicalSystem
+from MDANSE.MolecularDynamics.Configuration import PeriodicRealConfiguration
+from MDANSE.MolecularDynamics.Trajectory import Trajectory, TrajectoryWriter
+from MDANSE.MolecularDynamics.UnitCell import UnitCell
+from MDANSE.MolecularDynamics.VirtualTrajectory import (
+    VirtualTrajectoryError,
+    build_virtual_trajectory,
+    shifted_times,
+)
+
+N_ATOMS = 5
+
+
+def chemical_system(symbol="H"):
+    system = ChemicalSystem("segment")
+    for _ in range(N_ATOMS):
+        system.add_chemical_entity(Atom(symbol=symbol))
+    return system
+
+
+def write_segment(filename, first_frame, n_frames, symbol="H"):
+    system = chemical_system(symbol)
+    writer = TrajectoryWriter(filename, system, n_frames)
+    for frame in range(first_frame, first_frame + n_frames):
+        system.configuration = PeriodicRealConfiguration(
+            system,
+            np.full((N_ATOMS, 3), float(frame)),
+            UnitCell((10.0 + frame) * np.eye(3)),
+        )
+        # every segment restarts the simulation clock
+        writer.dump_configuration(0.5 * (frame - first_frame), units={"time": "ps"})
+    writer.close()
+    return filename
+
+
+def test_shifted_times_follow_the_previous_segments():
+    times = shifted_times([[0.0, 1.0, 2.0], [0.0, 1.0], [10.0, 11.0]])
+    np.testing.assert_allclose(times, [0.0, 1.0, 2.0, 3.0, 4.0, 10.0, 11.0])
+
+
+def test_virtual_trajectory_concatenates_the_segments(tmp_path):
+    segments = [
+        write_segment(str(tmp_path / "part1.mdt"), 0, 4),
+        write_segment(str(tmp_path / "part2.mdt"), 4, 3),
+        write_segment(str(tmp_path / "part3.mdt"), 7, 5),
+    ]
+    traj = Trajectory.from_segments(segments, str(tmp_path / "run.mdt"))
+    assert len(traj) == 12
+    for frame in range(12):
+        np.testing.assert_array_equal(traj.coordinates(frame), float(frame))
+        np.testing.assert_allclose(
+            traj.unit_cell(frame).direct, (10.0 + frame) * np.eye(3)
+        )
+    np.testing.assert_allclose(traj.time(), 0.5 * np.arange(12))
+    assert traj.chemical_system.number_of_atoms == N_ATOMS
+    traj.close()
+
+    with h5py.File(tmp_path / "run.mdt") as h5_file:
+        assert h5_file["/configuration/coordinates"].is_virtual
+        assert h5_file["/unit_cell"].is_virtual
+        assert h5_file["/time"].attrs["units"] == "ps"
+    assert os.path.getsize(tmp_path / "run.mdt") < os.path.getsize(segments[0])
+
+
+def test_virtual_trajectory_rejects_different_chemical_systems(tmp_path):
+    segments = [
+        write_segment(str(tmp_path / "part1.mdt"), 0, 2),
+        write_segment(str(tmp_path / "part2.mdt"), 2, 2, symbol="O"),
+    ]
+    with pytest.raises(VirtualTrajectoryError):
+        build_virtual_trajectory(segments, str(tmp_path / "run.mdt"))
+    with pytest.raises(VirtualTrajectoryError):
+        build_virtual_trajectory(segments[:1], segments[0])
+
+
+def test_view_reads_a_window_of_frames_and_atoms(tmp_path):
+    segments = [
+        write_segment(str(tmp_path / "part1.mdt"), 0, 6),
+        write_segment(str(tmp_path / "part2.mdt"), 6, 6),
+    ]
+    run = Trajectory.from_segments(segments, str(tmp_path / "run.mdt"))
+    view = run.view(str(tmp_path / "view.mdt"), slice(3, 11, 2), [0, 1, 3])
+    assert len(view) == 4
+    for frame, source_frame in enumerate(range(3, 11, 2)):
+        coords = view.coordinates(frame)
+        np.testing.assert_array_equal(coords[[0, 1, 3]], float(source_frame))
+        assert np.isnan(coords[[2, 4]]).all()
+        np.testing.assert_allclose(
+            view.unit_cell(frame).direct, (10.0 + source_frame) * np.eye(3)
+        )
+    np.testing.assert_allclose(view.time(), run.time()[3:11:2])
+    view.close()
+    run.close()
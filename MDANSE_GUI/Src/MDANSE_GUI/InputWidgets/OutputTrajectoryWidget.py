@@ -62,7 +62,7 @@ class OutputTrajectoryWidget(WidgetBase):
         self.dtype_box.addItems(["float16", "float32", "float64"])
         self.dtype_box.setCurrentText("float64")
         self.compression_box = QComboBox(self._base)
-        self.compression_box.addItems(["none", "gzip"])
+        self.compression_box.addItems(["none", "gzip", "shuffle_gzip", "scale_offset"])
         self.compression_box.setCurrentText("gzip")
         # self.type_box.setCurrentText(default_value[1])
         browse_button = QPushButton("Browse", self._base)
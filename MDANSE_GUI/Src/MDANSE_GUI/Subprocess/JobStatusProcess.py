@@ -30,6 +30,9 @@ class JobCommunicator(QObject):
     progress = Signal(int)
     finished = Signal(bool)
     oscillate = Signal()
+    memory = Signal(object)
+    eta = Signal(object)
+    steps = Signal(int)
 
     def status_update(self, input: Tuple):
         key, value = input
@@ -38,6 +41,12 @@ class JobCommunicator(QObject):
             self.terminate_the_process()
         elif key == "STEP":
             self.progress.emit(value)
+        elif key == "MEMORY":
+            self.memory.emit(value)
+        elif key == "ETA":
+            self.eta.emit(value)
+        elif key == "STEPS":
+            self.steps.emit(value)
         elif key == "STARTED":
             if value is not None:
                 self.target.emit(value)
@@ -76,7 +85,6 @@ class JobStatusProcess(Status):
         self._queue_0 = queue_0
         self._queue_1 = queue_1
         self._state = {}  # for compatibility with JobStatus
-        self._progress_meter = 0
         self._pause_event = pause_event
         self._pause_event.set()
 
@@ -101,10 +109,20 @@ class JobStatusProcess(Status):
         self._pipe.send(("FINISHED", False))
 
     def update_status(self):
-        self._progress_meter += 1
-        temp = int(self._progress_meter) * self._updateStep
+        # called at most once every update_interval, with all the steps
+        # completed since the previous call
+        temp = int(self.currentStep) * self._updateStep
         self._pipe.send(("STEP", temp))
+        self._pipe.send(("ETA", self.eta))
 
-    def fixed_status(self, current_progress: int):
-        temp = int(current_progress) * self._updateStep
-        self._pipe.send(("STEP", temp))
+    def memory_status(self):
+        self._state.update(self.memory)
+        self._pipe.send(
+            (
+                "MEMORY",
+                (self.memory["memory_total"], self.memory["peak_memory_total"]),
+            )
+        )
+
+    def steps_status(self):
+        self._pipe.send(("STEPS", int(self.nSteps)))
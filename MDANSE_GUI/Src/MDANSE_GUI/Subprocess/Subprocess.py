@@ -31,6 +31,7 @@ class Subprocess(Process):
         super().__init__()
         job_name = kwargs.get("job_name")
         self._job_parameters = kwargs.get("job_parameters")
+        self._run_options = kwargs.get("run_options", {})
         sending_pipe = kwargs.get("pipe")
         self.queue_0 = Queue()
         self.queue_1 = Queue()
@@ -58,7 +59,7 @@ class Subprocess(Process):
         queue_handler = QueueHandler(self.log_queue)
         LOG.addHandler(queue_handler)
         LOG.info("Running job")
-        self._job_instance.run(self._job_parameters)
+        self._job_instance.run(self._job_parameters, **self._run_options)
         LOG.removeHandler(queue_handler)
 
     def terminate(self):
@@ -60,9 +60,17 @@ class ConverterTab(GeneralTab):
         results += [
             [
                 "Execution",
-                {"auto-load": "True"},
                 {
-                    "auto-load": "Unless manually switched off, the GUI will try to load the job results when the job is finished."
+                    "auto-load": "True",
+                    "max-memory": "",
+                    "max-wall-time": "",
+                    "memory-budget": "",
+                },
+                {
+                    "auto-load": "Unless manually switched off, the GUI will try to load the job results when the job is finished.",
+                    "max-memory": "If not empty, e.g. 4GiB, the jobs expected to need more memory are refused.",
+                    "max-wall-time": "If not empty, e.g. 2h, the jobs expected to run longer are refused.",
+                    "memory-budget": "If not empty, e.g. 8GiB, a multicore job stops some of its workers when its memory gets close to it.",
                 },
             ]
         ]
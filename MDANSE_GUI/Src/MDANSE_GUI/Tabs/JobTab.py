@@ -75,9 +75,21 @@ class JobTab(GeneralTab):
         results += [
             [
                 "Execution",
-                {"auto-load": "True"},
                 {
-                    "auto-load": "Unless manually switched off, the GUI will try to load the job results when the job is finished."
+                    "auto-load": "True",
+                    "result-cache": "False",
+                    "intermediate-store": "False",
+                    "max-memory": "",
+                    "max-wall-time": "",
+                    "memory-budget": "",
+                },
+                {
+                    "auto-load": "Unless manually switched off, the GUI will try to load the job results when the job is finished.",
+                    "result-cache": "If True, a job identical to an earlier job copies its results from the MDANSE result cache instead of running again.",
+                    "intermediate-store": "If True, the quantities computed from a trajectory which several jobs need, e.g. rho(q,t), are kept in the MDANSE cache for the next jobs.",
+                    "max-memory": "If not empty, e.g. 4GiB, the jobs expected to need more memory are refused.",
+                    "max-wall-time": "If not empty, e.g. 2h, the jobs expected to run longer are refused.",
+                    "memory-budget": "If not empty, e.g. 8GiB, a multicore job stops some of its workers when its memory gets close to it.",
                 },
             ]
         ]
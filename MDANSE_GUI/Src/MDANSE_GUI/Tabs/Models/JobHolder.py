@@ -17,12 +17,14 @@ from logging import Handler
 from logging.handlers import QueueListener
 from multiprocessing import Pipe, Queue, Event
 import traceback
+from typing import Optional
 
 from qtpy.QtGui import QStandardItemModel, QStandardItem
 from qtpy.QtCore import QObject, Slot, Signal, QTimer, QThread, QMutex, Qt
 
 from MDANSE.MLogging import FMT, LOG
-from MDANSE.Framework.Converters import Converter
+from MDANSE.Framework.ResourceEstimate import format_duration
+from MDANSE.Framework.Converters.Converter import Converter
 
 from MDANSE_GUI.Subprocess.Subprocess import Subprocess, Connection
 from MDANSE_GUI.Subprocess.JobState import (
@@ -122,8 +124,12 @@ class JobEntry(Handler, QObject):
         self.steps_complete = 0
         self._entry_number = entry_number
         self.total_steps = 99
+        self.memory = 0
+        self.peak_memory = 0
+        self.eta = None
         self._prog_item = QStandardItem()
         self._stat_item = QStandardItem()
+        self._mem_item = QStandardItem()
         for item in [self._stat_item]:
             item.setData(entry_number)
         self._prog_item.setData(0, role=Qt.ItemDataRole.UserRole)
@@ -141,6 +147,10 @@ class JobEntry(Handler, QObject):
         result += "Status:\n"
         result += f"Current state: {self._current_state._label}\n"
         result += f"Percent complete: {self.percent_complete}\n"
+        if self.eta is not None:
+            result += f"Time remaining: {format_duration(self.eta)}\n"
+        result += f"Memory: {self.memory / 2**20:.1f} MiB\n"
+        result += f"Peak memory: {self.peak_memory / 2**20:.1f} MiB\n"
         return result
 
     @property
@@ -152,12 +162,20 @@ class JobEntry(Handler, QObject):
         self._parameters = input
 
     def update_fields(self):
-        self._prog_item.setText(f"{self.percent_complete} percent complete")
+        text = f"{self.percent_complete} percent complete"
+        if self.eta is not None and self._current_state is self._Running:
+            text += f", {format_duration(self.eta)} remaining"
+        self._prog_item.setText(text)
         self._prog_item.setData(self.percent_complete, role=Qt.ItemDataRole.UserRole)
         self._prog_item.setData(
             int(self.steps_complete), role=ProgressDelegate.progress_role
         )
         self._stat_item.setText(self._current_state._label)
+        if self.peak_memory:
+            self._mem_item.setText(
+                f"{self.memory / 2**20:.0f} MiB "
+                f"(peak {self.peak_memory / 2**20:.0f} MiB)"
+            )
 
     @Slot(bool)
     def on_finished(self, success: bool):
@@ -189,6 +207,14 @@ class JobEntry(Handler, QObject):
         self._current_state.start()
         self.update_fields()
 
+    @Slot(int)
+    def on_steps(self, target_steps: int):
+        """Changes the number of steps of a running job, e.g. of a
+        converter following a trajectory which is still being written."""
+        self.total_steps = target_steps
+        self._prog_item.setData(target_steps, role=ProgressDelegate.progress_role + 1)
+        self.on_update(self.steps_complete)
+
     @Slot(int)
     def on_update(self, completed_steps: int):
         # print(f"completed {completed_steps} out of {self.total_steps} steps")
@@ -200,6 +226,19 @@ class JobEntry(Handler, QObject):
         self.update_fields()
         self._prog_item.emitDataChanged()
 
+    @Slot(object)
+    def on_eta(self, eta: Optional[float]):
+        """Shows the estimated time remaining, in seconds."""
+        self.eta = eta
+        self.update_fields()
+
+    @Slot(object)
+    def on_memory(self, memory: tuple):
+        """Shows the current and the peak resident memory of the job, in
+        bytes, summed over its processes."""
+        self.memory, self.peak_memory = memory
+        self.update_fields()
+
     @Slot()
     def on_oscillate(self):
         """For jobs with unknown duration, the progress bar will bounce."""
@@ -247,7 +286,7 @@ class JobHolder(QStandardItemModel):
         self.existing_jobs = {}
         self.existing_listeners = {}
         self._next_number = 0
-        self.setHorizontalHeaderLabels(["Job", "Progress", "Status"])
+        self.setHorizontalHeaderLabels(["Job", "Progress", "Status", "Memory"])
 
     @Slot(str)
     def reportError(self, err: str):
@@ -280,6 +319,7 @@ class JobHolder(QStandardItemModel):
             subprocess_ref = Subprocess(
                 job_name=job_vars[0],
                 job_parameters=job_vars[1],
+                run_options=job_vars[2],
                 pipe=child_pipe,
                 pause_event=pause_event,
                 log_queue=log_queue,
@@ -315,6 +355,9 @@ class JobHolder(QStandardItemModel):
         communicator.progress.connect(item_th.on_update)  # int
         communicator.finished.connect(item_th.on_finished)  # bool
         communicator.oscillate.connect(item_th.on_oscillate)  # nothing
+        communicator.memory.connect(item_th.on_memory)  # (int, int)
+        communicator.eta.connect(item_th.on_eta)  # float or None
+        communicator.steps.connect(item_th.on_steps)  # int
         LOG.info("Watcher thread ready to start!")
         watcher_thread.start()
         try:
@@ -328,6 +371,7 @@ class JobHolder(QStandardItemModel):
                 name_item,
                 item_th._prog_item,
                 item_th._stat_item,
+                item_th._mem_item,
             ]
         )
         # nrows = self.rowCount()
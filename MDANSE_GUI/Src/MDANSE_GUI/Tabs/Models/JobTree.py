@@ -13,6 +13,7 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
+from MDANSE.Core.SubclassFactory import recursive_search
 from MDANSE.Framework.Jobs.IJob import IJob
 
 from qtpy.QtGui import QStandardItemModel, QStandardItem
@@ -26,6 +27,10 @@ class JobTree(QStandardItemModel):
     about the names and docstrings of different
     classes contained in the IJob object.
 
+    The tree is built from the entries of the job registry, so
+    that the module of a job is only imported when the job
+    is selected.
+
     It inherits the QStandardItemModel, so it can be
     used in the Qt data/view/proxy model.
     """
@@ -38,9 +43,10 @@ class JobTree(QStandardItemModel):
         filter = kwargs.pop("filter", None)
         super().__init__(*args, **kwargs)
 
+        self._parent_class = IJob
         self._nodes = {}  # dict of {number: QStandardItem}
         self._docstrings = {}  # dict of {number: str}
-        self._values = {}  # dict of {number: str}
+        self._values = {}  # dict of {number: str}, the class names
 
         self._categories = {}
         self._jobs = {}
@@ -57,20 +63,21 @@ class JobTree(QStandardItemModel):
         """
         if parent_class is None:
             parent_class = IJob
-        full_dict = parent_class.indirect_subclass_dictionary()
-        for class_name, class_object in full_dict.items():
-            if class_object.enabled:
-                self.createNode(class_name, class_object, filter)
+        self._parent_class = parent_class
+        for class_name in parent_class.indirect_subclasses():
+            if parent_class.subclass_attribute(class_name, "enabled", True):
+                category = parent_class.subclass_attribute(class_name, "category")
+                self.createNode(class_name, category, filter)
 
-    def createNode(self, name: str, thing, filter: str = ""):
+    def createNode(self, name: str, category=None, filter: str = ""):
         """Creates a new QStandardItem. It will store
-        the node number as user data. The 'thing' passed to this method
+        the node number as user data. The class name
         will be stored by the model in an internal dictionary, where
         the node number is the key
 
         Arguments:
-            name -- the name of the new node
-            thing -- any Python object to be stored and attached to the node
+            name -- the name of the new node, which is the class name
+            category -- category names (str) of the class, or None
             filter -- a string which must appear in the category tuple
         """
         new_node = QStandardItem(name)
@@ -78,26 +85,44 @@ class JobTree(QStandardItemModel):
         self.nodecounter += 1
         new_node.setData(new_number, role=Qt.ItemDataRole.UserRole)
         self._nodes[new_number] = new_node
-        self._values[new_number] = thing
-        self._docstrings[new_number] = thing.__doc__
-        try:
-            self._docstrings[new_number] += "\n" + thing.build_doc(use_html_table=True)
-        except AttributeError:
-            pass
-        except TypeError:
-            pass
-        if hasattr(thing, "category"):
+        self._values[new_number] = name
+        if category is not None:
             if filter:
-                if filter in thing.category:
-                    parent = self.parentsFromCategories(thing.category)
+                if filter in category:
+                    parent = self.parentsFromCategories(category)
                 else:
                     return
             else:
-                parent = self.parentsFromCategories(thing.category)
+                parent = self.parentsFromCategories(category)
         else:
             parent = self.invisibleRootItem()
         parent.appendRow(new_node)
 
+    def docstring(self, node_number: int) -> str:
+        """Returns the docstring of the class of a node. The module
+        of the class is imported the first time it is needed.
+
+        Arguments:
+            node_number -- the number of the node
+
+        Returns:
+            str - the docstring and the table of settings of the class
+        """
+        if node_number not in self._docstrings:
+            name = self._values[node_number]
+            thing = recursive_search(self._parent_class, name)
+            if thing is None:
+                thing = self._parent_class.load_subclass(name)
+            docstring = thing.__doc__
+            try:
+                docstring += "\n" + thing.build_doc(use_html_table=True)
+            except AttributeError:
+                pass
+            except TypeError:
+                pass
+            self._docstrings[node_number] = docstring
+        return self._docstrings[node_number]
+
     def parentsFromCategories(self, category_tuple):
         """Returns the parent node for a node that belongs to the
         category specified by categore_tuple. Also makes sure that
@@ -81,8 +81,8 @@ class ActionsTree(QTreeView):
         model = self.model()
         node_number = model.itemFromIndex(index).data(Qt.ItemDataRole.UserRole)
         try:
-            job_description = model._docstrings[node_number]
-        except KeyError:
+            job_description = model.docstring(node_number)
+        except (AttributeError, KeyError):
             job_description = "No further information"
         self.item_details.emit(job_description)  # this should emit the job name
 
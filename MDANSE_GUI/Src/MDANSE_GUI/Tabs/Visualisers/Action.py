@@ -29,7 +29,12 @@ from qtpy.QtWidgets import (
 from qtpy.QtCore import Signal, Slot
 
 from MDANSE.MLogging import LOG
-from MDANSE.Framework.Jobs.IJob import IJob
+from MDANSE.Framework.Jobs.IJob import (
+    IJob,
+    RUN_OPTIONS,
+    RunOptionError,
+    parse_run_options,
+)
 
 from MDANSE_GUI.InputWidgets import *
 from MDANSE_GUI.Tabs.Visualisers.InstrumentInfo import SimpleInstrument
@@ -305,6 +310,17 @@ class Action(QWidget):
                     text += f"<p>{array} ({new_unit})</p>"
                 else:
                     text += f"<p>[{array[0]}, {array[1]}, {array[2]}, ..., {array[-1]}] ({new_unit})</p>"
+            try:
+                estimate = self._job_instance.estimate_resources()
+            except Exception:
+                LOG.debug(f"Could not estimate the resources: {traceback.format_exc()}")
+            else:
+                text += "<p><b>The job is expected to need:</b></p>"
+                text += f"<p>{estimate}</p>"
+                try:
+                    estimate.check()
+                except Exception as e:
+                    text += f"<p><b>{e}</b></p>"
             self._preview_box.setHtml(text)
 
     @Slot(dict)
@@ -354,7 +370,7 @@ class Action(QWidget):
             self.last_paths[cname] = path
             self._parent_tab.set_path(self._job_name + "_script", path)
         pardict = self.set_parameters(labels=True)
-        self._job_instance.save(result, pardict)
+        self._job_instance.save(result, pardict, self.run_options())
 
     def set_parameters(self, labels=False):
         results = {}
@@ -366,6 +382,32 @@ class Action(QWidget):
                 results[key] = self._widgets[widnum].get_widget_value()
         return results
 
+    def run_options(self):
+        """Returns the options of IJob.run, e.g. result_cache, given in the
+        Execution settings of the tab."""
+        options = {}
+        try:
+            group = self._parent_tab._settings.group("Execution")
+        except AttributeError:
+            return options
+        for name, conversion in RUN_OPTIONS.items():
+            key = name.replace("_", "-")
+            try:
+                value = str(group.get(key)).strip()
+            except KeyError:
+                continue
+            if conversion is bool:
+                argument = f"--{key}" if value == "True" else f"--no-{key}"
+            elif value:
+                argument = f"--{key}={value}"
+            else:
+                continue
+            try:
+                options.update(parse_run_options([argument]))
+            except RunOptionError as e:
+                LOG.error(f"The {key} setting is ignored: {e}")
+        return options
+
     @Slot()
     def execute_converter(self):
         pardict = self.set_parameters()
@@ -379,6 +421,6 @@ class Action(QWidget):
             self.post_execute_checkbox.isChecked()
             and self._job_name != "AverageStructure"
         ):
-            self.run_and_load.emit([self._job_name, pardict])
+            self.run_and_load.emit([self._job_name, pardict, self.run_options()])
         else:
-            self.new_thread_objects.emit([self._job_name, pardict])
+            self.new_thread_objects.emit([self._job_name, pardict, self.run_options()])